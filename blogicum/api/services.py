@@ -0,0 +1,174 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from blog.constants import PAGINATION_COUNT_POST_PER_PAGE
+
+API_MAX_PAGE_SIZE = 100
+
+
+class ApiError(Exception):
+    """Ошибка запроса, которая отдаётся клиенту как JSON."""
+
+    def __init__(self, detail, status=400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status = status
+
+
+def json_response(request, data, status=200):
+    """JSON-ответ с ETag; на совпадающий If-None-Match отвечает 304."""
+    body = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+    etag = quote_etag(hashlib.md5(body.encode()).hexdigest())
+    if status == 200:
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return response
+    response = HttpResponse(
+        body, status=status, content_type='application/json'
+    )
+    response['ETag'] = etag
+    return response
+
+
+def get_fields(request, fields, required=()):
+    """Разбирает ?fields= и возвращает выбранные поля в порядке схемы.
+
+    `fields` — имена полей ответа (например, ключи словаря «поле ответа:
+    выражение для values_list»). Возвращает поля для запроса к базе
+    и поля для ответа: поля из `required` нужны для курсора
+    и запрашиваются всегда.
+    """
+    requested = request.GET.get('fields')
+    if not requested:
+        selected = set(fields)
+    else:
+        selected = {name.strip() for name in requested.split(',')}
+        unknown = selected - set(fields)
+        if unknown:
+            raise ApiError(
+                'Неизвестные поля: {}.'.format(', '.join(sorted(unknown)))
+            )
+    return [
+        name for name in fields if name in selected or name in required
+    ], [name for name in fields if name in selected]
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', PAGINATION_COUNT_POST_PER_PAGE))
+    except ValueError:
+        raise ApiError('Параметр limit должен быть числом.')
+    return max(1, min(limit, API_MAX_PAGE_SIZE))
+
+
+def encode_cursor(values):
+    # DjangoJSONEncoder обрезает время до миллисекунд, а курсору нужна
+    # точная граница, иначе строки на стыке страниц теряются.
+    raw = json.dumps([
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(request):
+    cursor = request.GET.get('cursor')
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ApiError('Некорректный курсор.')
+
+
+def serialize_rows(rows, names, visible, transforms=None):
+    """Превращает кортежи values_list в словари только с видимыми полями."""
+    transforms = transforms or {}
+    result = []
+    for row in rows:
+        item = {}
+        for name, value in zip(names, row):
+            if name not in visible:
+                continue
+            if value is not None and name in transforms:
+                value = transforms[name](value)
+            item[name] = value
+        result.append(item)
+    return result
+
+
+def media_url(path):
+    return settings.MEDIA_URL + path if path else None
+
+
+def parse_cursor_values(model, keys, cursor):
+    """Приводит значения курсора к типам полей `keys` модели.
+
+    Значение, которое поле не принимает, — ошибка клиента, а не сервера,
+    поэтому проверяем их до построения запроса.
+    """
+    if not isinstance(cursor, list) or len(cursor) != len(keys):
+        raise ApiError('Некорректный курсор.')
+    values = []
+    for key, value in zip(keys, cursor):
+        if value is None or isinstance(value, (dict, list, bool)):
+            raise ApiError('Некорректный курсор.')
+        try:
+            values.append(model._meta.get_field(key).to_python(value))
+        except (ValueError, TypeError, ValidationError):
+            raise ApiError('Некорректный курсор.')
+    return values
+
+
+def keyset_page(request, queryset, lookups, keys, descending=True):
+    """Страница по курсору для выборки, упорядоченной по полям `keys`.
+
+    В отличие от OFFSET цена страницы не растёт с её номером: следующая
+    страница начинается сразу после последней строки предыдущей.
+    Возвращает строки values_list(*lookups) и курсор следующей страницы;
+    поля `keys` должны входить в `lookups`.
+    """
+    direction = 'lt' if descending else 'gt'
+    cursor = decode_cursor(request)
+    if cursor is not None:
+        cursor = parse_cursor_values(queryset.model, keys, cursor)
+        condition = Q()
+        for position, key in enumerate(keys):
+            step = Q(**{f'{key}__{direction}': cursor[position]})
+            for previous, value in zip(keys[:position], cursor):
+                step &= Q(**{previous: value})
+            condition |= step
+        queryset = queryset.filter(condition)
+    prefix = '-' if descending else ''
+    queryset = queryset.order_by(*(prefix + key for key in keys))
+    limit = get_limit(request)
+    rows = list(queryset.values_list(*lookups)[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            [last[lookups.index(key)] for key in keys]
+        )
+    return rows, next_cursor
+
+
+def page_data(request, results, next_cursor):
+    next_url = None
+    if next_cursor is not None:
+        params = request.GET.copy()
+        params['cursor'] = next_cursor
+        next_url = request.build_absolute_uri(
+            f'{request.path}?{params.urlencode()}'
+        )
+    return {'results': results, 'next': next_url}
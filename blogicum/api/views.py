@@ -0,0 +1,151 @@
+from django.db.models import Case, F, When
+from django.views.decorators.http import require_safe
+
+from blog.models import Category, Comment, Post, User
+from blog.services import annotate_posts, posts_filter_by_publish
+
+from .services import (
+    ApiError,
+    get_fields,
+    json_response,
+    keyset_page,
+    media_url,
+    page_data,
+    serialize_rows,
+)
+
+POST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': 'location_name',
+    'image': 'image',
+    'comment_count': 'comment_count',
+}
+POST_TRANSFORMS = {'image': media_url}
+COMMENT_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'created_at': 'created_at',
+    'author': 'author__username',
+}
+CATEGORY_FIELDS = {
+    'id': 'id',
+    'slug': 'slug',
+    'title': 'title',
+    'description': 'description',
+}
+PROFILE_FIELDS = (
+    'username',
+    'first_name',
+    'last_name',
+    'date_joined',
+    'post_count',
+)
+
+
+def api_view(view):
+    """GET/HEAD-only view, отдающая ApiError как JSON."""
+    @require_safe
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return json_response(
+                request, {'detail': error.detail}, status=error.status
+            )
+    return wrapper
+
+
+def get_posts(names):
+    """Опубликованные посты с аннотациями только для запрошенных полей."""
+    posts = posts_filter_by_publish(Post.objects.all())
+    if 'comment_count' in names:
+        posts = annotate_posts(posts)
+    if 'location' in names:
+        posts = posts.annotate(location_name=Case(
+            When(location__is_published=True, then=F('location__name')),
+        ))
+    return posts
+
+
+@api_view
+def post_list(request):
+    names, visible = get_fields(request, POST_FIELDS, ('id', 'pub_date'))
+    posts = get_posts(names)
+    if 'category' in request.GET:
+        posts = posts.filter(category__slug=request.GET['category'])
+    if 'author' in request.GET:
+        posts = posts.filter(author__username=request.GET['author'])
+    rows, next_cursor = keyset_page(
+        request, posts, [POST_FIELDS[name] for name in names],
+        keys=['pub_date', 'id'],
+    )
+    results = serialize_rows(rows, names, visible, POST_TRANSFORMS)
+    return json_response(request, page_data(request, results, next_cursor))
+
+
+@api_view
+def post_detail(request, post_id):
+    names, visible = get_fields(request, POST_FIELDS)
+    row = get_posts(names).filter(id=post_id).values_list(
+        *(POST_FIELDS[name] for name in names)
+    ).first()
+    if row is None:
+        raise ApiError('Публикация не найдена.', status=404)
+    return json_response(
+        request, serialize_rows([row], names, visible, POST_TRANSFORMS)[0]
+    )
+
+
+@api_view
+def comment_list(request, post_id):
+    if not posts_filter_by_publish(Post.objects.filter(id=post_id)).exists():
+        raise ApiError('Публикация не найдена.', status=404)
+    names, visible = get_fields(
+        request, COMMENT_FIELDS, ('id', 'created_at')
+    )
+    rows, next_cursor = keyset_page(
+        request,
+        Comment.objects.filter(post_id=post_id),
+        [COMMENT_FIELDS[name] for name in names],
+        keys=['created_at', 'id'],
+        descending=False,
+    )
+    results = serialize_rows(rows, names, visible)
+    return json_response(request, page_data(request, results, next_cursor))
+
+
+@api_view
+def category_list(request):
+    names, visible = get_fields(request, CATEGORY_FIELDS, ('id',))
+    rows, next_cursor = keyset_page(
+        request,
+        Category.objects.filter(is_published=True),
+        [CATEGORY_FIELDS[name] for name in names],
+        keys=['id'],
+        descending=False,
+    )
+    results = serialize_rows(rows, names, visible)
+    return json_response(request, page_data(request, results, next_cursor))
+
+
+@api_view
+def profile_detail(request, username):
+    names, visible = get_fields(request, PROFILE_FIELDS)
+    columns = [name for name in names if name != 'post_count']
+    profile = User.objects.filter(
+        username=username, is_active=True
+    ).values(*columns).first()
+    if profile is None:
+        raise ApiError('Пользователь не найден.', status=404)
+    if 'post_count' in names:
+        profile['post_count'] = posts_filter_by_publish(
+            Post.objects.filter(author__username=username)
+        ).count()
+    return json_response(
+        request, {name: profile[name] for name in visible}
+    )
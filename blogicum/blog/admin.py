@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
 from django.utils.safestring import mark_safe
 
-from .models import Category, Location, Post, Comment
+from .deletion import schedule_post_deletion, schedule_user_deletion
+from .models import Category, Location, Post, Comment, DeletionTask, User
 
 
 @admin.action(description='Опубликовать выбранные посты')
@@ -62,6 +64,13 @@ class PostAdmin(admin.ModelAdmin):
                 f'<img src="{obj.image.url}" width="80" height="60" />'
             )
 
+    def delete_model(self, request, obj):
+        schedule_post_deletion(obj)
+
+    def delete_queryset(self, request, queryset):
+        for post in queryset:
+            schedule_post_deletion(post)
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -76,3 +85,43 @@ class CommentAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     fields = ('text', 'post', 'author', 'created_at')
     readonly_fields = ('created_at',)
+
+
+@admin.register(DeletionTask)
+class DeletionTaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'object_repr',
+        'kind',
+        'progress',
+        'created_at',
+        'finished_at'
+    )
+    list_filter = ('kind', 'finished_at')
+    ordering = ('-created_at',)
+
+    @admin.display(description='Прогресс')
+    def progress(self, obj):
+        if not obj.total:
+            return '—'
+        percent = min(100, obj.deleted * 100 // obj.total)
+        return f'{obj.deleted} из {obj.total} ({percent}%)'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+class BlogUserAdmin(UserAdmin):
+
+    def delete_model(self, request, obj):
+        schedule_user_deletion(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            schedule_user_deletion(user)
+
+
+admin.site.unregister(User)
+admin.site.register(User, BlogUserAdmin)
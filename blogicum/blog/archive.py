@@ -0,0 +1,177 @@
+"""Архив старых публикаций в отдельном файле SQLite.
+
+Архивная база подключается к каждому соединению через
+`ATTACH DATABASE ... AS archive`, а модели ArchivedPost и ArchivedComment
+смотрят в её таблицы. Таблицы создаются и дополняются новыми полями после
+migrate, а не при каждом подключении. Ленты и поиск работают только с
+основной базой, страница поста и профиль автора дочитывают архив, если
+поста нет в ней.
+"""
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db import transaction
+
+from .constants import ARCHIVE_BATCH_SIZE
+from .feeds import bump_feeds_version
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+from .stats import invalidate_author_stats
+
+ARCHIVE_SCHEMA = 'archive'
+ARCHIVE_INDEXES = (
+    (ArchivedPost, 'author_id'),
+    (ArchivedPost, 'category_id'),
+    (ArchivedPost, 'pub_date'),
+    (ArchivedComment, 'post_id'),
+    (ArchivedComment, 'author_id'),
+)
+
+
+def get_archive_name(connection):
+    """Путь к архиву; для базы в памяти архив тоже в памяти (тесты)."""
+    if connection.is_in_memory_db():
+        return (
+            f'file:{connection.alias}_archive?mode=memory&cache=shared'
+        )
+    return str(settings.ARCHIVE_DATABASE)
+
+
+def archive_table(model):
+    """Имя таблицы модели внутри архивной базы, без схемы."""
+    return model._meta.db_table.split('.')[-1].strip('"')
+
+
+def table_sql(connection, model):
+    """CREATE TABLE для архивной копии таблицы модели.
+
+    Внешних ключей нет: SQLite не проверяет ссылки между базами.
+    """
+    quote_name = connection.ops.quote_name
+    columns = []
+    for field in model._meta.local_concrete_fields:
+        column = '{} {}'.format(
+            quote_name(field.column),
+            field.db_parameters(connection)['type'],
+        )
+        if field.primary_key:
+            column += ' NOT NULL PRIMARY KEY'
+        elif not field.null:
+            column += ' NOT NULL'
+        columns.append(column)
+    return 'CREATE TABLE IF NOT EXISTS {} ({})'.format(
+        model._meta.db_table, ', '.join(columns)
+    )
+
+
+def index_sql(connection, model, column):
+    table = archive_table(model)
+    return 'CREATE INDEX IF NOT EXISTS {}.{} ON {} ({})'.format(
+        ARCHIVE_SCHEMA,
+        connection.ops.quote_name(f'{table}_{column}_idx'),
+        connection.ops.quote_name(table),
+        connection.ops.quote_name(column),
+    )
+
+
+def add_missing_columns(cursor, connection, model):
+    """Добавляет в архивную таблицу столбцы полей, появившихся в модели.
+
+    Столбцы допускают NULL: SQLite не добавит столбец NOT NULL без
+    значения по умолчанию, а строки в архив всё равно приходят из основной
+    базы, где поле заполнено.
+    """
+    quote_name = connection.ops.quote_name
+    cursor.execute('PRAGMA {}.table_info({})'.format(
+        ARCHIVE_SCHEMA, quote_name(archive_table(model))
+    ))
+    existing = {row[1] for row in cursor.fetchall()}
+    for field in model._meta.local_concrete_fields:
+        if field.column not in existing:
+            cursor.execute('ALTER TABLE {} ADD COLUMN {} {}'.format(
+                model._meta.db_table,
+                quote_name(field.column),
+                field.db_parameters(connection)['type'],
+            ))
+
+
+def create_archive_schema(connection):
+    """Создаёт таблицы и индексы архива и добавляет в них новые поля."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for model in (ArchivedPost, ArchivedComment):
+            cursor.execute(table_sql(connection, model))
+            add_missing_columns(cursor, connection, model)
+        for model, column in ARCHIVE_INDEXES:
+            cursor.execute(index_sql(connection, model, column))
+
+
+def attach_archive(connection):
+    """Подключает архивную базу к новому соединению."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'ATTACH DATABASE %s AS {ARCHIVE_SCHEMA}',
+            [get_archive_name(connection)],
+        )
+
+
+def move_rows(source, target, column, ids):
+    """Копирует строки в архив и удаляет их из основной базы."""
+    quote_name = default_connection.ops.quote_name
+    columns = ', '.join(
+        quote_name(field.column)
+        for field in target._meta.local_concrete_fields
+    )
+    where = '{} IN ({})'.format(
+        quote_name(column), ', '.join(['%s'] * len(ids))
+    )
+    source_table = 'main.' + quote_name(source._meta.db_table)
+    with default_connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {target._meta.db_table} ({columns}) '
+            f'SELECT {columns} FROM {source_table} WHERE {where}',
+            ids,
+        )
+        cursor.execute(f'DELETE FROM {source_table} WHERE {where}', ids)
+        return cursor.rowcount
+
+
+def drop_dependents(ids):
+    """Удаляет производные строки постов: рейтинги, похожие посты и т.п.
+
+    Комментарии переносятся в архив отдельно.
+    """
+    for relation in Post._meta.related_objects:
+        if relation.related_model is Comment:
+            continue
+        relation.related_model._base_manager.filter(
+            **{f'{relation.field.name}__in': ids}
+        ).delete()
+
+
+def archive_posts(before, batch_size=ARCHIVE_BATCH_SIZE):
+    """Переносит в архив посты с pub_date раньше before и их комментарии.
+
+    Каждая пачка переносится в своей транзакции, чтобы не держать
+    блокировку записи надолго. Возвращает число постов и комментариев.
+    """
+    posts = comments = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Post.objects.filter(pub_date__lt=before)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            invalidate_author_stats(
+                Post.objects.filter(pk__in=ids).values('author_id')
+            )
+            drop_dependents(ids)
+            comments += move_rows(Comment, ArchivedComment, 'post_id', ids)
+            posts += move_rows(Post, ArchivedPost, 'id', ids)
+    if posts:
+        bump_feeds_version()
+    return posts, comments
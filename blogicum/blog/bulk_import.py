@@ -0,0 +1,273 @@
+"""Пакетный импорт постов и комментариев из JSONL.
+
+Каждая строка — объект с полем `type` (`post` или `comment`; без него
+тип определяется по наличию `post_id`). Формат полей совпадает с выгрузкой
+`export_blog`: пост ссылается на автора по username, на категорию по slug
+и на местоположение по названию, комментарий — на `id` поста из того же
+файла. Недостающие пользователи, категории и местоположения создаются
+пачками через bulk_create, посты и комментарии вставляются executemany.
+"""
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .forms import reset_category_choices
+from .models import Category, Comment, Location, Post, User
+from .related import queue_related
+from .stats import invalidate_author_stats
+from .trending import rebuild_scores
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_TRANSACTION_SIZE = 10000
+
+
+def read_records(lines):
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            raise ValueError(f'Строка {number}: {error}.')
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_dt(value):
+    if not value:
+        return timezone.now()
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f'Некорректная дата: {value}.')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def reserve_ids(model, count):
+    """Резервирует count id в счётчике AUTOINCREMENT таблицы модели.
+
+    bulk_create в SQLite не возвращает id, а Max('id') + 1 гонится с
+    параллельными вставками и не видит id постов, перенесённых в архив.
+    UPDATE счётчика сразу берёт блокировку записи до конца транзакции, и
+    выданные номера база больше никому не отдаст. Возвращает первый id.
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE sqlite_sequence SET seq = seq + %s WHERE name = %s',
+            [count, table],
+        )
+        if not cursor.rowcount:
+            # В таблицу ещё ни разу не вставляли строк.
+            cursor.execute(
+                'INSERT INTO sqlite_sequence (name, seq) '
+                f'SELECT %s, COALESCE(MAX(id), 0) + %s FROM {table}',
+                [table, count],
+            )
+        cursor.execute(
+            'SELECT seq FROM sqlite_sequence WHERE name = %s', [table]
+        )
+        return cursor.fetchone()[0] - count + 1
+
+
+def insert_objects(model, objects, batch_size):
+    """Вставляет объекты пачками executemany с их собственным created_at.
+
+    bulk_create прогоняет поля через pre_save, и auto_now_add заменяет дату
+    из исходных данных на now(); исправлять её отдельным UPDATE — вторая
+    запись каждой строки. Здесь значения полей берутся с объектов как есть.
+    """
+    meta = model._meta
+    fields = meta.concrete_fields
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        connection.ops.quote_name(meta.db_table),
+        ', '.join(connection.ops.quote_name(f.column) for f in fields),
+        ', '.join(['%s'] * len(fields)),
+    )
+    with connection.cursor() as cursor:
+        for batch in chunked(objects, batch_size):
+            cursor.executemany(sql, [
+                [
+                    field.get_db_prep_save(
+                        getattr(obj, field.attname), connection
+                    )
+                    for field in fields
+                ]
+                for obj in batch
+            ])
+
+
+class BlogImporter:
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.post_ids = {}
+        self.created_post_ids = []
+        self.users = {}
+        self.categories = {}
+        self.locations = {}
+        self.image_tasks = []
+        self.counts = {'posts': 0, 'comments': 0, 'skipped': 0}
+
+    def run(self, lines, transaction_size=IMPORT_TRANSACTION_SIZE):
+        for chunk in chunked(read_records(lines), transaction_size):
+            with transaction.atomic():
+                self.import_chunk(chunk)
+            self.flush_image_tasks()
+        # Вставка в обход ORM не шлёт сигналы: статистику, рейтинги и список
+        # категорий формы обновляем сами.
+        invalidate_author_stats()
+        reset_category_choices()
+        rebuild_scores(self.created_post_ids)
+        queue_related(self.created_post_ids)
+        return self.counts
+
+    def import_chunk(self, records):
+        posts = []
+        comments = []
+        for record in records:
+            kind = record.get('type') or (
+                'comment' if 'post_id' in record else 'post'
+            )
+            (comments if kind == 'comment' else posts).append(record)
+        self.resolve_users(
+            [r.get('author') for r in posts + comments]
+        )
+        self.resolve_categories(posts)
+        self.resolve_locations([r.get('location') for r in posts])
+        self.create_posts(posts)
+        self.create_comments(comments)
+
+    def resolve_users(self, usernames):
+        missing = {name for name in usernames if name} - set(self.users)
+        if not missing:
+            return
+        self.users.update(User.objects.filter(
+            username__in=missing
+        ).values_list('username', 'id'))
+        new = missing - set(self.users)
+        User.objects.bulk_create(
+            [User(username=name, password=make_password(None))
+             for name in new],
+            batch_size=self.batch_size,
+        )
+        self.users.update(User.objects.filter(
+            username__in=new
+        ).values_list('username', 'id'))
+
+    def resolve_categories(self, posts):
+        titles = {
+            r['category']: r.get('category_title') or r['category']
+            for r in posts if r.get('category')
+        }
+        missing = set(titles) - set(self.categories)
+        if not missing:
+            return
+        self.categories.update(Category.objects.filter(
+            slug__in=missing
+        ).values_list('slug', 'id'))
+        new = missing - set(self.categories)
+        now = timezone.now()
+        Category.objects.bulk_create(
+            [Category(slug=slug, title=titles[slug], description='',
+                      created_at=now)
+             for slug in new],
+            batch_size=self.batch_size,
+        )
+        self.categories.update(Category.objects.filter(
+            slug__in=new
+        ).values_list('slug', 'id'))
+
+    def resolve_locations(self, names):
+        missing = {name for name in names if name} - set(self.locations)
+        if not missing:
+            return
+        self.locations.update(Location.objects.filter(
+            name__in=missing
+        ).values_list('name', 'id'))
+        new = missing - set(self.locations)
+        now = timezone.now()
+        Location.objects.bulk_create(
+            [Location(name=name, created_at=now) for name in new],
+            batch_size=self.batch_size,
+        )
+        self.locations.update(Location.objects.filter(
+            name__in=new
+        ).values_list('name', 'id'))
+
+    def create_posts(self, records):
+        if not records:
+            return
+        # Id нужны заранее: по ним комментарии ссылаются на посты.
+        next_id = reserve_ids(Post, len(records)) - 1
+        posts = []
+        for record in records:
+            next_id += 1
+            if 'id' in record:
+                self.post_ids[record['id']] = next_id
+            posts.append(Post(
+                id=next_id,
+                title=record['title'],
+                text=record.get('text', ''),
+                pub_date=parse_dt(record.get('pub_date')),
+                is_published=record.get('is_published', True),
+                author_id=self.users[record['author']],
+                category_id=self.categories.get(record.get('category')),
+                location_id=self.locations.get(record.get('location')),
+                image=record.get('image') or None,
+                created_at=parse_dt(record.get('created_at')),
+            ))
+            if record.get('image'):
+                self.image_tasks.append(
+                    {'post_id': next_id, 'image': record['image']}
+                )
+        insert_objects(Post, posts, self.batch_size)
+        self.created_post_ids.extend(post.id for post in posts)
+        self.counts['posts'] += len(posts)
+
+    def create_comments(self, records):
+        known = [
+            record for record in records
+            if record['post_id'] in self.post_ids
+        ]
+        self.counts['skipped'] += len(records) - len(known)
+        records = known
+        if not records:
+            return
+        next_id = reserve_ids(Comment, len(records))
+        comments = [
+            Comment(
+                id=next_id + number,
+                post_id=self.post_ids[record['post_id']],
+                author_id=self.users[record['author']],
+                text=record['text'],
+                created_at=parse_dt(record.get('created_at')),
+            )
+            for number, record in enumerate(records)
+        ]
+        insert_objects(Comment, comments, self.batch_size)
+        self.counts['comments'] += len(comments)
+
+    def flush_image_tasks(self):
+        """Ставит изображения в очередь вместо обработки во время импорта."""
+        if not self.image_tasks:
+            return
+        settings.IMAGE_TASK_QUEUE.parent.mkdir(parents=True, exist_ok=True)
+        with open(settings.IMAGE_TASK_QUEUE, 'a', encoding='utf-8') as queue:
+            for task in self.image_tasks:
+                queue.write(json.dumps(task) + '\n')
+        self.image_tasks = []
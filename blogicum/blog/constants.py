@@ -2,3 +2,26 @@ MAX_LENGTH_CHAR_FIELD = 256
 ABBREVIATED_TITLE = 20
 PAGINATION_COUNT_POST_PER_PAGE = 10
 SHORTENED_TEXT = 50
+FEED_ITEMS_COUNT = 20
+FEED_DESCRIPTION_WORDS = 50
+SITEMAP_CHUNK_SIZE = 50000
+ARCHIVE_AFTER_DAYS = 365
+ARCHIVE_BATCH_SIZE = 500
+DELETION_BATCH_SIZE = 500
+DELETION_BATCH_PAUSE = 0.05
+POPULAR_POSTS_COUNT = 20
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_POST_WEIGHT = 1
+TRENDING_COMMENT_WEIGHT = 3
+TRENDING_VIEW_WEIGHT = 0.1
+RELATED_POSTS_COUNT = 5
+RELATED_POSTS_STORED = 10
+RELATED_MAX_DF = 0.5
+RELATED_TITLE_WEIGHT = 2
+RELATED_CATEGORY_WEIGHT = 1.5
+RELATED_LOCATION_WEIGHT = 1
+WARM_INDEX_PAGES = 3
+WARM_CATEGORY_PAGES = 2
+WARM_TOP_POSTS = 50
+LOCATION_AUTOCOMPLETE_LIMIT = 20
+IMAGE_UPLOAD_FIELDS = ('image',)
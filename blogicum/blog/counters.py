@@ -0,0 +1,162 @@
+"""Буферизованный счётчик просмотров постов.
+
+UPDATE на каждый просмотр выстроил бы все чтения в очередь к писателю
+SQLite. Поэтому каждый процесс копит просмотры в памяти и записывает их
+одним `UPDATE ... SET views = views + CASE id WHEN ... END`. Прибавка
+идёт в самом запросе, поэтому сбросы из разных процессов не мешают друг
+другу. Несохранённые просмотры ограничены VIEW_COUNTER_MAX_PENDING.
+Фоновый поток сбрасывает буфер раз в VIEW_COUNTER_FLUSH_INTERVAL, даже
+если новых просмотров нет и add() не вызывается.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+
+from .constants import TRENDING_VIEW_WEIGHT
+from .models import Post
+from .trending import bump_scores
+
+logger = logging.getLogger(__name__)
+
+
+def write_views(pending):
+    """Прибавляет просмотры {post_id: n} одним запросом."""
+    Post.all_objects.filter(pk__in=list(pending)).update(
+        views=F('views') + Case(
+            *(When(pk=pk, then=Value(count))
+              for pk, count in pending.items()),
+            default=Value(0),
+            output_field=PositiveIntegerField(),
+        )
+    )
+
+
+class ViewCounter:
+    """Копит просмотры в памяти процесса и сбрасывает их пачкой."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._count = 0
+        self._last_flush = time.monotonic()
+        self._timer_pid = None
+        # Служебные запросы (прогрев кеша) просмотрами не считаются.
+        self.enabled = True
+
+    def add(self, post_id):
+        if not self.enabled:
+            return
+        self.start_timer()
+        with self._lock:
+            self._pending[post_id] += 1
+            self._count += 1
+            due = (
+                self._count >= settings.VIEW_COUNTER_MAX_PENDING
+                or time.monotonic() - self._last_flush
+                >= settings.VIEW_COUNTER_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush()
+
+    def start_timer(self):
+        """Запускает поток периодического сброса в текущем процессе.
+
+        Поток создаётся при первом просмотре, а не при импорте: потоки
+        мастера не переживают fork воркеров.
+        """
+        pid = os.getpid()
+        if self._timer_pid == pid:
+            return
+        with self._lock:
+            if self._timer_pid == pid:
+                return
+            self._timer_pid = pid
+        threading.Thread(
+            target=self.flush_periodically, name='view-counter', daemon=True
+        ).start()
+
+    def flush_periodically(self):
+        while True:
+            time.sleep(settings.VIEW_COUNTER_FLUSH_INTERVAL)
+            if time.monotonic() - self._last_flush < (
+                settings.VIEW_COUNTER_FLUSH_INTERVAL
+            ):
+                continue
+            try:
+                self.flush()
+            except Exception:
+                logger.warning('Не удалось сбросить просмотры', exc_info=True)
+            finally:
+                # Соединение потока не должно висеть открытым между сбросами.
+                connection.close()
+
+    def requeue(self, pending):
+        with self._lock:
+            room = max(settings.VIEW_COUNTER_MAX_PENDING - self._count, 0)
+            kept = 0
+            for post_id, views in pending.items():
+                views = min(views, room - kept)
+                if not views:
+                    break
+                self._pending[post_id] += views
+                kept += views
+            self._count += kept
+        dropped = sum(pending.values()) - kept
+        if dropped:
+            logger.warning(
+                'Буфер просмотров переполнен, потеряно просмотров: %d',
+                dropped,
+            )
+
+    def pending(self):
+        with self._lock:
+            return self._count
+
+    def flush(self):
+        """Записывает накопленное; возвращает число записанных просмотров.
+
+        Если база занята, просмотры возвращаются в буфер до следующей
+        попытки, но не больше VIEW_COUNTER_MAX_PENDING вместе с новыми;
+        остальные теряются.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._count = 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        count = sum(pending.values())
+        try:
+            write_views(pending)
+        except DatabaseError:
+            logger.warning('Не удалось записать просмотры', exc_info=True)
+            self.requeue(pending)
+            return 0
+        try:
+            bump_scores({
+                post_id: views * TRENDING_VIEW_WEIGHT
+                for post_id, views in pending.items()
+            })
+        except DatabaseError:
+            logger.warning('Не удалось обновить рейтинги', exc_info=True)
+        return count
+
+
+view_counter = ViewCounter()
+
+
+@atexit.register
+def flush_on_exit():
+    try:
+        view_counter.flush()
+    except Exception as error:
+        # При выходе база может быть уже недоступна; теряем не больше
+        # VIEW_COUNTER_MAX_PENDING просмотров.
+        logger.warning('Просмотры не сохранены при выходе: %s', error)
@@ -0,0 +1,132 @@
+"""Фоновое удаление постов и пользователей небольшими пачками.
+
+Каскадное `delete()` популярного поста или активного автора удаляет все
+зависимые строки в одной транзакции и надолго держит блокировку записи
+SQLite. Здесь объект сразу скрывается, а зависимые строки удаляет
+команда `process_deletions` пачками по DELETION_BATCH_SIZE, сохраняя
+прогресс в DeletionTask.
+"""
+import time
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from .constants import DELETION_BATCH_PAUSE, DELETION_BATCH_SIZE
+from .feeds import bump_feeds_version
+from .models import (
+    ArchivedComment,
+    ArchivedPost,
+    Comment,
+    DeletionTask,
+    Post,
+    User,
+)
+from .stats import invalidate_author_stats
+
+
+def post_querysets(post_id):
+    return (
+        Comment.objects.filter(post_id=post_id),
+        Post.all_objects.filter(pk=post_id),
+    )
+
+
+def user_querysets(user_id):
+    return (
+        Comment.objects.filter(
+            Q(author_id=user_id) | Q(post__author_id=user_id)
+        ),
+        Post.all_objects.filter(author_id=user_id),
+        ArchivedComment.objects.filter(
+            Q(author_id=user_id) | Q(post__author_id=user_id)
+        ),
+        ArchivedPost.objects.filter(author_id=user_id),
+        User.objects.filter(pk=user_id),
+    )
+
+
+QUERYSETS = {
+    DeletionTask.POST: post_querysets,
+    DeletionTask.USER: user_querysets,
+}
+
+
+def count_rows(kind, object_id):
+    return sum(
+        queryset.count() for queryset in QUERYSETS[kind](object_id)
+    )
+
+
+def schedule_post_deletion(post):
+    """Скрывает пост и ставит удаление его комментариев в очередь."""
+    with transaction.atomic():
+        post.is_deleted = True
+        post.save(update_fields=['is_deleted'])
+        return DeletionTask.objects.create(
+            kind=DeletionTask.POST,
+            object_id=post.pk,
+            object_repr=str(post),
+            total=count_rows(DeletionTask.POST, post.pk),
+        )
+
+
+def schedule_user_deletion(user):
+    """Блокирует пользователя, скрывает его посты и ставит удаление в очередь.
+
+    Посты скрываются одним UPDATE без удаления строк, поэтому это быстро
+    даже для авторов с большим числом публикаций.
+    """
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        Post.objects.filter(author=user).update(is_deleted=True)
+        invalidate_author_stats([user.pk])
+        task = DeletionTask.objects.create(
+            kind=DeletionTask.USER,
+            object_id=user.pk,
+            object_repr=user.get_username(),
+            total=count_rows(DeletionTask.USER, user.pk),
+        )
+    bump_feeds_version()
+    return task
+
+
+def delete_batch(task, batch_size=DELETION_BATCH_SIZE):
+    """Удаляет одну пачку строк задачи в отдельной транзакции.
+
+    Возвращает False, когда удалять больше нечего.
+    """
+    with transaction.atomic():
+        for queryset in QUERYSETS[task.kind](task.object_id):
+            ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if ids:
+                _, deleted = queryset.model._base_manager.filter(
+                    pk__in=ids
+                ).delete()
+                # Строки, удалённые каскадом, в прогресс не входят.
+                task.deleted += deleted.get(queryset.model._meta.label, 0)
+                task.save(update_fields=['deleted'])
+                return True
+        task.deleted = max(task.deleted, task.total)
+        task.finished_at = now()
+        task.save(update_fields=['deleted', 'finished_at'])
+        return False
+
+
+def process_deletions(batch_size=DELETION_BATCH_SIZE,
+                      pause=DELETION_BATCH_PAUSE):
+    """Выполняет все незавершённые задачи; возвращает их число.
+
+    Пауза между пачками даёт другим процессам захватить блокировку записи.
+    """
+    tasks = DeletionTask.objects.filter(
+        finished_at__isnull=True
+    ).order_by('created_at')
+    processed = 0
+    for task in tasks:
+        while delete_batch(task, batch_size):
+            if pause:
+                time.sleep(pause)
+        processed += 1
+    return processed
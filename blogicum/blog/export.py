@@ -0,0 +1,106 @@
+"""Потоковая выгрузка постов и комментариев в JSONL и CSV.
+
+Строки читаются через values_list(...).iterator(), поэтому расход памяти
+не зависит от размера таблиц. Посты и комментарии из архива (см.
+blog.archive) выгружаются вместе с основными: сначала архивные, затем
+основные, каждые по возрастанию id.
+"""
+import csv
+import json
+from itertools import chain
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_date
+
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('jsonl', 'csv')
+EXPORT_FIELDS = {
+    'posts': {
+        'id': 'id',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'created_at': 'created_at',
+        'is_published': 'is_published',
+        'author': 'author__username',
+        'category': 'category__slug',
+        'category_title': 'category__title',
+        'location': 'location__name',
+        'image': 'image',
+    },
+    'comments': {
+        'id': 'id',
+        'post_id': 'post_id',
+        'post_title': 'post__title',
+        'author': 'author__username',
+        'text': 'text',
+        'created_at': 'created_at',
+    },
+}
+
+
+class Echo:
+    """Псевдофайл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def get_export_querysets(model, since=None, until=None, category=None):
+    """Выборки для выгрузки с фильтрами по датам (YYYY-MM-DD) и категории.
+
+    Возвращает выборки архива и основной базы. Для постов даты относятся
+    к pub_date, для комментариев — к created_at.
+    """
+    if model == 'posts':
+        querysets, date_field, category_field = (
+            [ArchivedPost.objects.all(), Post.objects.all()],
+            'pub_date', 'category__slug'
+        )
+    elif model == 'comments':
+        querysets, date_field, category_field = (
+            [ArchivedComment.objects.all(), Comment.objects.all()],
+            'created_at', 'post__category__slug'
+        )
+    else:
+        raise ValueError(f'Неизвестная модель: {model}.')
+    filters = {}
+    for lookup, value in (('gte', since), ('lte', until)):
+        if value:
+            date = parse_date(value)
+            if date is None:
+                raise ValueError(f'Некорректная дата: {value}.')
+            filters[f'{date_field}__date__{lookup}'] = date
+    if category:
+        filters[category_field] = category
+    return [
+        queryset.filter(**filters).order_by('id') for queryset in querysets
+    ]
+
+
+def iter_export(model, export_format, chunk_size=EXPORT_CHUNK_SIZE,
+                **filters):
+    """Генератор строк выгрузки в выбранном формате."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f'Неизвестный формат: {export_format}.')
+    querysets = get_export_querysets(model, **filters)
+    fields = EXPORT_FIELDS[model]
+    rows = chain.from_iterable(
+        queryset.values_list(*fields.values()).iterator(
+            chunk_size=chunk_size
+        )
+        for queryset in querysets
+    )
+    if export_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow(row)
+        return
+    names = list(fields)
+    for row in rows:
+        yield json.dumps(
+            dict(zip(names, row)), cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + '\n'
@@ -0,0 +1,174 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import Min
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import parse_http_date_safe, quote_etag
+from django.utils.text import Truncator
+from django.utils.timezone import now
+
+from .constants import FEED_DESCRIPTION_WORDS, FEED_ITEMS_COUNT
+from .models import Category, Post, User
+from .services import annotate_posts, posts_filter_by_publish
+
+FEEDS_VERSION_KEY = 'feeds-version'
+
+
+def get_feeds_version():
+    return cache.get_or_set(FEEDS_VERSION_KEY, 1, None)
+
+
+def bump_feeds_version():
+    """Сбрасывает кеш всех лент после изменения постов или комментариев."""
+    try:
+        cache.incr(FEEDS_VERSION_KEY)
+    except ValueError:
+        cache.set(FEEDS_VERSION_KEY, 1, None)
+
+
+def get_feed_cache_timeout():
+    """Кеш живёт не дольше, чем до ближайшей отложенной публикации."""
+    next_pub_date = Post.objects.filter(
+        is_published=True, pub_date__gt=now()
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    timeout = settings.FEED_CACHE_TIMEOUT
+    if next_pub_date is not None:
+        seconds = (next_pub_date - now()).total_seconds()
+        timeout = max(1, min(timeout, int(seconds) + 1))
+    return timeout
+
+
+class PostsFeed(Feed):
+    """Базовая RSS-лента опубликованных постов с кешем и условным GET."""
+
+    def __call__(self, request, *args, **kwargs):
+        key = 'feed:{}:{}:{}'.format(
+            get_feeds_version(), type(self).__name__, request.path
+        )
+        entry = cache.get(key)
+        if entry is None:
+            response = super().__call__(request, *args, **kwargs)
+            entry = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'last_modified': response.get('Last-Modified'),
+                'etag': quote_etag(
+                    hashlib.md5(response.content).hexdigest()
+                ),
+            }
+            cache.set(key, entry, get_feed_cache_timeout())
+        last_modified = entry['last_modified']
+        response = get_conditional_response(
+            request,
+            etag=entry['etag'],
+            last_modified=(
+                parse_http_date_safe(last_modified) if last_modified else None
+            ),
+        )
+        if response is None:
+            response = HttpResponse(
+                entry['content'], content_type=entry['content_type']
+            )
+        response['ETag'] = entry['etag']
+        if last_modified:
+            response['Last-Modified'] = last_modified
+        return response
+
+    def get_posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj):
+        posts = annotate_posts(posts_filter_by_publish(self.get_posts(obj)))
+        return posts[:FEED_ITEMS_COUNT]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.text).words(FEED_DESCRIPTION_WORDS)
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=[item.id])
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_author_link(self, item):
+        return reverse('blog:profile', args=[item.author.username])
+
+    def item_categories(self, item):
+        return [item.category.title] if item.category else []
+
+
+class LatestPostsFeed(PostsFeed):
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума.'
+
+    def link(self):
+        return reverse('blog:index')
+
+
+class CategoryPostsFeed(PostsFeed):
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def get_posts(self, obj):
+        return obj.posts.all()
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=[obj.slug])
+
+
+class AuthorPostsFeed(PostsFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_posts(self, obj):
+        return obj.posts.all()
+
+    def title(self, obj):
+        return f'Блогикум: публикации @{obj.username}'
+
+    def description(self, obj):
+        return f'Публикации пользователя @{obj.username}.'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=[obj.username])
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
@@ -1,7 +1,30 @@
 from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
 from django.utils import timezone
 
-from .models import Comment, Post, User
+from .models import Category, Comment, Location, Post, User
+from .widgets import AutocompleteSelect
+
+CATEGORY_CHOICES_KEY = 'post-form-categories'
+
+
+def get_category_choices():
+    """Опубликованные категории [(id, название)] для PostForm из кеша."""
+    return cache.get_or_set(
+        CATEGORY_CHOICES_KEY,
+        lambda: list(
+            Category.objects.filter(is_published=True).values_list(
+                'pk', 'title'
+            )
+        ),
+        settings.POST_FORM_CHOICES_CACHE_TIMEOUT,
+    )
+
+
+def reset_category_choices():
+    cache.delete(CATEGORY_CHOICES_KEY)
 
 
 class CommentForm(forms.ModelForm):
@@ -13,13 +36,14 @@ class CommentForm(forms.ModelForm):
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
-        exclude = ('author', 'is_published', 'created_date',)
+        exclude = ('author', 'is_published', 'created_date', 'is_deleted')
         widgets = {
             'pub_date': forms.DateTimeInput(
                 format='%Y-%m-%dT%H:%M',
                 attrs={'type': 'datetime-local'}),
             'title': forms.TextInput(attrs={'class': 'form-control'}),
             'text': forms.Textarea(attrs={'class': 'form-control'}),
+            'location': AutocompleteSelect('blog:location_autocomplete'),
         }
         labels = {
             'title': 'Заголовок',
@@ -35,6 +59,25 @@ class PostForm(forms.ModelForm):
         now = timezone.now().astimezone()
         formatted_date = now.isoformat()[:16]
         self.initial['pub_date'] = formatted_date
+        # Доступны только опубликованные категории и места, но уже
+        # выбранное у поста значение не теряется при редактировании.
+        category = self.fields['category']
+        category.queryset = Category.objects.filter(
+            Q(is_published=True) | Q(pk=self.instance.category_id)
+        )
+        choices = get_category_choices()
+        if self.instance.category_id is not None and (
+            self.instance.category_id not in dict(choices)
+        ):
+            choices = choices + [
+                (self.instance.category_id, self.instance.category.title)
+            ]
+        if category.empty_label is not None:
+            choices = [('', category.empty_label)] + choices
+        category.choices = choices
+        self.fields['location'].queryset = Location.objects.filter(
+            Q(is_published=True) | Q(pk=self.instance.location_id)
+        )
 
 
 class ProfileEditForm(forms.ModelForm):
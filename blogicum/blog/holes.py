@@ -0,0 +1,134 @@
+"""Общий кеш страниц с «дырками» под персональные фрагменты.
+
+Лента, категория и страница поста одинаковы для всех посетителей, кроме
+шапки, формы комментария и кнопок автора. Эти фрагменты выводятся тегом
+`{% hole %}`: при обычном рендере — сразу, а при рендере страницы в кеш —
+HTML-комментарием `<!--hole:движок:имя?параметры-->`. На каждый запрос
+из кеша достаётся общая страница, и в ней дорисовываются только
+фрагменты — из текущего пользователя и параметров метки, без запросов
+за постами.
+"""
+import re
+from functools import wraps
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from .counters import view_counter
+from .feeds import get_feed_cache_timeout, get_feeds_version
+from .forms import CommentForm
+from .services import get_template_engine
+
+HOLE_RE = re.compile(r'<!--hole:(\w+):(\w+)\?([^>]*)-->')
+
+
+def comment_form_context():
+    return {'form': CommentForm()}
+
+
+# Имя фрагмента: шаблон и функция, добавляющая к контексту общие данные.
+HOLES = {
+    'header': ('includes/header.html', None),
+    'post_actions': ('includes/post_actions.html', None),
+    'comment_form': ('includes/comment_form.html', comment_form_context),
+    'comment_actions': ('includes/comment_actions.html', None),
+}
+
+
+def render_hole(request, name, params, using='django'):
+    template_name, extra_context = HOLES[name]
+    context = dict(params)
+    if extra_context is not None:
+        context.update(extra_context())
+    return mark_safe(
+        get_template(template_name, using=using).render(context, request)
+    )
+
+
+def punch_hole(request, name, params, using='django'):
+    """Фрагмент или метка на его месте, если страница рендерится в кеш.
+
+    Параметры приводятся к строкам в обоих случаях, чтобы фрагмент
+    выглядел одинаково при прямом рендере и при заполнении метки. Метка
+    помнит движок страницы: фрагмент заполняется шаблоном того же движка.
+    """
+    if name not in HOLES:
+        raise ValueError(f'Неизвестный фрагмент: {name}')
+    params = {key: str(value) for key, value in params.items()}
+    if getattr(request, 'punch_holes', False):
+        return mark_safe(
+            f'<!--hole:{using}:{name}?{urlencode(params)}-->'
+        )
+    return render_hole(request, name, params, using)
+
+
+def fill_holes(request, content):
+    """Подставляет в закешированную страницу фрагменты для request."""
+    return HOLE_RE.sub(
+        lambda match: render_hole(
+            request, match[2], dict(parse_qsl(match[3])), using=match[1]
+        ),
+        content.decode(),
+    )
+
+
+def get_page_number(request):
+    """Номер страницы для ключа кеша.
+
+    `?page=` — единственный параметр общих страниц. Остальная строка
+    запроса в ключ не входит, чтобы произвольные параметры не плодили
+    записи в кеше.
+    """
+    page = request.GET.get('page', '')
+    return str(int(page)) if page.isdigit() else '1'
+
+
+def shared_page(view):
+    """Кеширует страницу view с «дырками», общую для всех посетителей.
+
+    View может пометить ответ `response.private = True`, если его нельзя
+    показывать другим, и `response.counted_post_id`, если просмотр
+    страницы из кеша тоже нужно засчитать посту.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        timeout = settings.SHARED_PAGE_CACHE_TIMEOUT
+        if request.method not in ('GET', 'HEAD') or not timeout:
+            return view(request, *args, **kwargs)
+        match = request.resolver_match
+        key = 'page:{}:{}:{}:{}'.format(
+            get_feeds_version(),
+            get_template_engine(match.view_name if match else None),
+            request.path,
+            get_page_number(request),
+        )
+        entry = cache.get(key)
+        if entry is not None:
+            if entry['counted_post_id'] is not None:
+                view_counter.add(entry['counted_post_id'])
+            return HttpResponse(
+                fill_holes(request, entry['content']),
+                content_type=entry['content_type'],
+            )
+        request.punch_holes = True
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        finally:
+            request.punch_holes = False
+        if response.status_code == 200 and not getattr(
+            response, 'private', False
+        ):
+            cache.set(key, {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'counted_post_id': getattr(response, 'counted_post_id', None),
+            }, min(timeout, get_feed_cache_timeout()))
+        response.content = fill_holes(request, response.content)
+        return response
+    return wrapper
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils.timezone import now
+
+from blog.archive import archive_posts, create_archive_schema
+from blog.constants import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые посты и их комментарии в архивную базу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=ARCHIVE_AFTER_DAYS,
+            help='Архивировать посты старше этого числа дней.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=ARCHIVE_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        # Архивная база могла появиться после последнего migrate.
+        create_archive_schema(connection)
+        posts, comments = archive_posts(
+            now() - timedelta(days=options['days']),
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(
+            f'В архив перенесено постов: {posts}, комментариев: {comments}.'
+        )
@@ -0,0 +1,51 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет число проверок пароля (логинов) в секунду на ядро '
+        'при хешировании в потоке запроса и в пуле процессов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--logins', type=int, default=40)
+
+    def handle(self, *args, **options):
+        password = 'benchmark-password'
+        encoded = make_password(password)
+        modes = (
+            ('в потоке', 0),
+            ('в пуле', settings.PASSWORD_HASHING_WORKERS or 2),
+        )
+        for title, workers in modes:
+            with override_settings(PASSWORD_HASHING_WORKERS=workers):
+                # Первый вызов поднимает пул, в замер он не входит.
+                check_password(password, encoded)
+                elapsed = self.measure(
+                    password, encoded,
+                    options['concurrency'], options['logins'],
+                )
+            cores = min(workers or options['concurrency'], os.cpu_count())
+            rate = options['logins'] / elapsed
+            self.stdout.write(
+                f'{title:<9} {rate:7.2f} логинов/с, '
+                f'{rate / cores:7.2f} логинов/с на ядро ({cores} ядер)'
+            )
+
+    @staticmethod
+    def measure(password, encoded, concurrency, logins):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            results = list(executor.map(
+                lambda _: check_password(password, encoded), range(logins)
+            ))
+        assert all(results)
+        return time.perf_counter() - start
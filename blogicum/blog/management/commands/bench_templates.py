@@ -0,0 +1,62 @@
+import time
+from statistics import mean
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog.models import Post, User
+from blog.services import posts_filter_by_publish
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время ответа ленты, профиля и страницы поста '
+        'при рендеринге через Django Templates и Jinja2.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        post = posts_filter_by_publish(Post.objects.all()).annotate(
+            comment_count=Count('comments')
+        ).order_by('-comment_count').first()
+        author = User.objects.annotate(
+            post_count=Count('posts')
+        ).order_by('-post_count').first()
+        if post is None or author is None:
+            raise CommandError('Нет опубликованных постов для замера.')
+        pages = (
+            ('blog:index', reverse('blog:index')),
+            ('blog:profile', reverse('blog:profile', args=[author.username])),
+            ('blog:post_detail', reverse('blog:post_detail', args=[post.id])),
+        )
+        client = Client(HTTP_HOST='localhost')
+        for view_name, url in pages:
+            results = {}
+            for engine, views in (('django', ()), ('jinja2', (view_name,))):
+                with override_settings(JINJA2_VIEWS=views):
+                    results[engine] = self.measure(
+                        client, url, options['repeat']
+                    )
+            self.stdout.write(
+                '{:<18} django {:7.2f} мс  jinja2 {:7.2f} мс  x{:.2f}'.format(
+                    view_name,
+                    results['django'],
+                    results['jinja2'],
+                    results['django'] / results['jinja2'],
+                )
+            )
+
+    def measure(self, client, url, repeat):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f'{url} вернул {response.status_code}.')
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        return mean(timings)
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.export import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FIELDS,
+    EXPORT_FORMATS,
+    iter_export,
+)
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты или комментарии в JSONL или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=EXPORT_FIELDS)
+        parser.add_argument(
+            '--format', choices=EXPORT_FORMATS, default='jsonl'
+        )
+        parser.add_argument('--since', help='Дата начала, YYYY-MM-DD.')
+        parser.add_argument('--until', help='Дата окончания, YYYY-MM-DD.')
+        parser.add_argument('--category', help='Slug категории.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE
+        )
+        parser.add_argument(
+            '--output', help='Файл для выгрузки; по умолчанию stdout.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            lines = iter_export(
+                options['model'],
+                options['format'],
+                chunk_size=options['chunk_size'],
+                since=options['since'],
+                until=options['until'],
+                category=options['category'],
+            )
+            if options['output']:
+                with open(options['output'], 'w', encoding='utf-8',
+                          newline='') as output:
+                    output.writelines(lines)
+            else:
+                for line in lines:
+                    self.stdout.write(line, ending='')
+        except ValueError as error:
+            raise CommandError(error)
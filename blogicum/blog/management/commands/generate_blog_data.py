@@ -0,0 +1,221 @@
+import random
+import time
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.forms import reset_category_choices
+from blog.models import Category, Comment, Location, Post, User
+from blog.related import queue_related
+from blog.stats import invalidate_author_stats
+from blog.trending import rebuild_scores
+
+WORDS = (
+    'город море горы лес река путешествие утро вечер дорога поезд '
+    'кофе книга музей парк мост закат рассвет озеро небо ветер дождь '
+    'снег солнце улица дом друг история фото прогулка поход лагерь '
+    'остров берег тропа карта маршрут вокзал площадь храм рынок сад'
+).split()
+# Доли строк с особыми состояниями, как в рабочей базе.
+UNPUBLISHED_POST_SHARE = 0.05
+FUTURE_POST_SHARE = 0.03
+UNPUBLISHED_CATEGORY_SHARE = 0.1
+UNPUBLISHED_LOCATION_SHARE = 0.1
+POST_WITHOUT_LOCATION_SHARE = 0.3
+# Показатель степенного распределения комментариев по постам.
+COMMENT_SKEW = 1.1
+HISTORY_DAYS = 3 * 365
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует воспроизводимый по seed набор пользователей, категорий, '
+        'местоположений, постов и комментариев для нагрузочных замеров.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=30)
+        parser.add_argument('--locations', type=int, default=500)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=500000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now().replace(microsecond=0)
+        self.batch_size = options['batch_size']
+        start = time.perf_counter()
+        user_ids = self.create_users(options['users'])
+        category_ids = self.create_categories(options['categories'])
+        location_ids = self.create_locations(options['locations'])
+        post_ids = self.create_posts(
+            options['posts'], user_ids, category_ids, location_ids
+        )
+        self.create_comments(options['comments'], user_ids, post_ids)
+        invalidate_author_stats()
+        reset_category_choices()
+        rebuild_scores(post_ids)
+        queue_related(post_ids)
+        self.stdout.write(
+            f'Готово за {time.perf_counter() - start:.1f} с.'
+        )
+
+    def text(self, words):
+        return ' '.join(self.rng.choices(WORDS, k=words))
+
+    def past(self):
+        return self.now - timedelta(
+            seconds=self.rng.randrange(HISTORY_DAYS * 24 * 3600)
+        )
+
+    @staticmethod
+    def next_id(model):
+        max_id = model._base_manager.aggregate(max_id=Max('id'))['max_id']
+        return (max_id or 0) + 1
+
+    def create_users(self, count):
+        first_id = self.next_id(User)
+        User.objects.bulk_create(
+            [
+                User(
+                    id=first_id + i,
+                    username=f'user{first_id + i}',
+                    password=UNUSABLE_PASSWORD_PREFIX + 'generated',
+                    date_joined=self.past(),
+                )
+                for i in range(count)
+            ],
+            batch_size=self.batch_size,
+        )
+        return list(range(first_id, first_id + count))
+
+    def create_categories(self, count):
+        first_id = self.next_id(Category)
+        Category.objects.bulk_create(
+            [
+                Category(
+                    id=first_id + i,
+                    title=self.text(2).capitalize(),
+                    description=self.text(12),
+                    slug=f'category-{first_id + i}',
+                    is_published=(
+                        self.rng.random() >= UNPUBLISHED_CATEGORY_SHARE
+                    ),
+                )
+                for i in range(count)
+            ],
+            batch_size=self.batch_size,
+        )
+        return list(range(first_id, first_id + count))
+
+    def create_locations(self, count):
+        first_id = self.next_id(Location)
+        Location.objects.bulk_create(
+            [
+                Location(
+                    id=first_id + i,
+                    name=self.text(2).capitalize(),
+                    is_published=(
+                        self.rng.random() >= UNPUBLISHED_LOCATION_SHARE
+                    ),
+                )
+                for i in range(count)
+            ],
+            batch_size=self.batch_size,
+        )
+        return list(range(first_id, first_id + count))
+
+    def insert_rows(self, model, fields, rows):
+        """Вставка пачки строк одним executemany в обход ORM."""
+        meta = model._meta
+        columns = [meta.get_field(field).column for field in fields]
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            connection.ops.quote_name(meta.db_table),
+            ', '.join(connection.ops.quote_name(c) for c in columns),
+            ', '.join(['%s'] * len(columns)),
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    def create_posts(self, count, user_ids, category_ids, location_ids):
+        adapt = connection.ops.adapt_datetimefield_value
+        first_id = self.next_id(Post)
+        fields = (
+            'id', 'title', 'text', 'pub_date', 'author', 'location',
+            'category', 'is_published', 'created_at', 'image', 'is_deleted',
+            'views',
+        )
+        # Активность авторов тоже неравномерна.
+        author_weights = list(accumulate(
+            1 / rank ** COMMENT_SKEW for rank in range(1, len(user_ids) + 1)
+        ))
+        for offset in range(0, count, self.batch_size):
+            rows = []
+            for post_id in range(
+                first_id + offset,
+                first_id + min(offset + self.batch_size, count),
+            ):
+                created_at = self.past()
+                pub_date = created_at
+                if self.rng.random() < FUTURE_POST_SHARE:
+                    pub_date = self.now + timedelta(
+                        days=self.rng.randrange(1, 60)
+                    )
+                location = None
+                if location_ids and (
+                    self.rng.random() >= POST_WITHOUT_LOCATION_SHARE
+                ):
+                    location = self.rng.choice(location_ids)
+                rows.append((
+                    post_id,
+                    self.text(self.rng.randint(2, 6)).capitalize(),
+                    self.text(self.rng.randint(20, 200)),
+                    adapt(pub_date),
+                    self.rng.choices(user_ids, cum_weights=author_weights)[0],
+                    location,
+                    self.rng.choice(category_ids) if category_ids else None,
+                    self.rng.random() >= UNPUBLISHED_POST_SHARE,
+                    adapt(created_at),
+                    '',
+                    False,
+                    0,
+                ))
+            self.insert_rows(Post, fields, rows)
+            self.stdout.write(f'Постов: {offset + len(rows)} из {count}')
+        return list(range(first_id, first_id + count))
+
+    def create_comments(self, count, user_ids, post_ids):
+        if not post_ids:
+            return
+        adapt = connection.ops.adapt_datetimefield_value
+        # У немногих постов — большая часть комментариев.
+        ranked = post_ids[:]
+        self.rng.shuffle(ranked)
+        post_weights = list(accumulate(
+            1 / rank ** COMMENT_SKEW for rank in range(1, len(ranked) + 1)
+        ))
+        fields = ('post', 'author', 'text', 'created_at')
+        for offset in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - offset)
+            posts = self.rng.choices(ranked, cum_weights=post_weights, k=size)
+            authors = self.rng.choices(user_ids, k=size)
+            rows = [
+                (
+                    post_id,
+                    author_id,
+                    self.text(self.rng.randint(3, 40)),
+                    adapt(self.past()),
+                )
+                for post_id, author_id in zip(posts, authors)
+            ]
+            self.insert_rows(Comment, fields, rows)
+            self.stdout.write(
+                f'Комментариев: {offset + size} из {count}'
+            )
@@ -0,0 +1,44 @@
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blogicum.warmup import measure_cold_start
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет холодный старт воркера: импорт wsgi.py с прогревом '
+        'и время импорта самых тяжёлых модулей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument(
+            '--sort', choices=('cumulative', 'self'), default='cumulative',
+            help='Сортировать по времени с вложенными импортами или без.',
+        )
+
+    def handle(self, *args, **options):
+        report = measure_cold_start()
+        self.stdout.write(f'Холодный старт: {report["total"] * 1000:.0f} мс')
+        for name, seconds in report['steps'].items():
+            self.stdout.write(f'  прогрев {name}: {seconds * 1000:.0f} мс')
+        self.stdout.write(
+            f'Работа первых запросов: {report["first_use"] * 1000:.0f} мс'
+        )
+        if report['total'] > settings.COLD_START_BUDGET:
+            self.stderr.write(
+                f'Старт дольше бюджета {settings.COLD_START_BUDGET} с.'
+            )
+        column = 2 if options['sort'] == 'cumulative' else 1
+        modules = sorted(
+            report['modules'], key=itemgetter(column), reverse=True
+        )
+        self.stdout.write(
+            '{:>10} {:>10}  {}'.format('своё мс', 'всего мс', 'модуль')
+        )
+        for name, own, cumulative in modules[:options['limit']]:
+            self.stdout.write(
+                f'{own / 1000:>10.1f} {cumulative / 1000:>10.1f}  {name}'
+            )
@@ -0,0 +1,262 @@
+import multiprocessing
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import reverse
+
+from blog.models import Category, Post, User
+from blog.services import posts_filter_by_publish
+from blog.transports import HttpTransport, WsgiTransport, percentile
+
+DEFAULT_MIX = 'index=50,category=15,profile=10,detail=20,comment=3,login=2'
+LOADTEST_PASSWORD = 'loadtest-password'
+SAMPLE_SIZE = 5000
+
+
+class VirtualUser:
+    """Один клиент со своими cookie, выполняющий сценарии смеси."""
+
+    def __init__(self, transport, dataset, username, rng):
+        self.transport = transport
+        self.dataset = dataset
+        self.username = username
+        self.rng = rng
+        self.cookies = SimpleCookie()
+        self.logged_in = False
+
+    def send(self, method, path, data=None):
+        headers = {}
+        body = b''
+        if self.cookies:
+            headers['Cookie'] = '; '.join(
+                f'{key}={morsel.value}' for key, morsel in self.cookies.items()
+            )
+        if data is not None:
+            body = urlencode(data).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            headers['Referer'] = 'http://localhost/'
+        status, response_headers, _ = self.transport.request(
+            method, path, body, headers
+        )
+        for name, value in response_headers:
+            if name.lower() == 'set-cookie':
+                self.cookies.load(value)
+        return status
+
+    def csrf_token(self):
+        morsel = self.cookies.get('csrftoken')
+        return morsel.value if morsel else ''
+
+    def index(self):
+        page = self.rng.randint(1, self.dataset['index_pages'])
+        return self.send('GET', f"{reverse('blog:index')}?page={page}")
+
+    def category(self):
+        slug = self.rng.choice(self.dataset['categories'])
+        return self.send('GET', reverse('blog:category_posts', args=[slug]))
+
+    def profile(self):
+        username = self.rng.choice(self.dataset['authors'])
+        return self.send('GET', reverse('blog:profile', args=[username]))
+
+    def detail(self):
+        post_id = self.rng.choice(self.dataset['posts'])
+        return self.send('GET', reverse('blog:post_detail', args=[post_id]))
+
+    def login(self):
+        url = reverse('login')
+        self.send('GET', url)
+        status = self.send('POST', url, {
+            'username': self.username,
+            'password': LOADTEST_PASSWORD,
+            'csrfmiddlewaretoken': self.csrf_token(),
+        })
+        self.logged_in = status == 302
+        return status
+
+    def comment(self):
+        if not self.logged_in:
+            self.login()
+        post_id = self.rng.choice(self.dataset['posts'])
+        return self.send(
+            'POST',
+            reverse('blog:add_comment', args=[post_id]),
+            {'text': 'Нагрузочный комментарий',
+             'csrfmiddlewaretoken': self.csrf_token()},
+        )
+
+
+# Сценарий и имя URL, под которым он попадает в отчёт.
+SCENARIOS = {
+    'index': 'blog:index',
+    'category': 'blog:category_posts',
+    'profile': 'blog:profile',
+    'detail': 'blog:post_detail',
+    'comment': 'blog:add_comment',
+    'login': 'login',
+}
+# Успешные POST отвечают редиректом.
+EXPECTED_STATUS = {'comment': 302, 'login': 302}
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise CommandError(f'Неизвестный сценарий: {name}.')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def run_worker(args):
+    """Гоняет потоки виртуальных пользователей и возвращает замеры."""
+    (worker, threads, duration, mix, dataset, base_url, usernames,
+     seed) = args
+    deadline = time.perf_counter() + duration
+    names = list(mix)
+    weights = list(mix.values())
+
+    def loop(thread):
+        rng = random.Random(seed * 1000 + worker * 100 + thread)
+        transport = (
+            HttpTransport(base_url) if base_url else WsgiTransport()
+        )
+        user = VirtualUser(
+            transport, dataset,
+            usernames[(worker * threads + thread) % len(usernames)], rng,
+        )
+        samples = defaultdict(list)
+        errors = defaultdict(int)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                status = getattr(user, name)()
+            except Exception:
+                status = None
+            samples[name].append(time.perf_counter() - start)
+            if status != EXPECTED_STATUS.get(name, 200):
+                errors[name] += 1
+        connections.close_all()
+        return samples, errors
+
+    with ThreadPoolExecutor(threads) as executor:
+        return list(executor.map(loop, range(threads)))
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон: смесь запросов к ленте, категориям, профилям, '
+        'постам, комментариям и логину с RPS и перцентилями задержки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--processes', type=int, default=1)
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument('--mix', default=DEFAULT_MIX)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--url',
+            help='Адрес запущенного сервера, например http://127.0.0.1:8000. '
+                 'Без него WSGI-приложение вызывается в процессе.',
+        )
+
+    def handle(self, *args, **options):
+        mix = parse_mix(options['mix'])
+        dataset = self.load_dataset()
+        usernames = self.prepare_users(
+            options['threads'] * options['processes']
+        )
+        jobs = [
+            (worker, options['threads'], options['duration'], mix, dataset,
+             options['url'], usernames, options['seed'])
+            for worker in range(options['processes'])
+        ]
+        start = time.perf_counter()
+        if options['processes'] == 1:
+            results = [run_worker(jobs[0])]
+        else:
+            # Соединения с базой не должны переходить в дочерние процессы.
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with context.Pool(options['processes']) as pool:
+                results = pool.map(run_worker, jobs)
+        elapsed = time.perf_counter() - start
+        self.report(results, elapsed)
+
+    def load_dataset(self):
+        posts = list(posts_filter_by_publish(Post.objects.all()).order_by(
+            '-pub_date'
+        ).values_list('id', flat=True)[:SAMPLE_SIZE])
+        categories = list(Category.objects.filter(
+            is_published=True
+        ).values_list('slug', flat=True)[:SAMPLE_SIZE])
+        authors = list(User.objects.filter(
+            posts__isnull=False
+        ).distinct().values_list('username', flat=True)[:SAMPLE_SIZE])
+        if not posts or not categories or not authors:
+            raise CommandError(
+                'В базе нет опубликованных постов: сначала выполните '
+                'generate_blog_data.'
+            )
+        return {
+            'posts': posts,
+            'categories': categories,
+            'authors': authors,
+            'index_pages': max(1, min(len(posts) // 10, 50)),
+        }
+
+    def prepare_users(self, count):
+        """Создаёт пользователей с известным паролем для сценария логина."""
+        usernames = [f'loadtest-{number}' for number in range(count)]
+        existing = set(User.objects.filter(
+            username__in=usernames
+        ).values_list('username', flat=True))
+        for username in usernames:
+            if username not in existing:
+                User.objects.create_user(username, password=LOADTEST_PASSWORD)
+        return usernames
+
+    def report(self, results, elapsed):
+        samples = defaultdict(list)
+        errors = defaultdict(int)
+        for worker in results:
+            for thread_samples, thread_errors in worker:
+                for name, values in thread_samples.items():
+                    samples[name].extend(values)
+                for name, value in thread_errors.items():
+                    errors[name] += value
+        total = sum(len(values) for values in samples.values())
+        self.stdout.write(
+            f'{total} запросов за {elapsed:.1f} с, '
+            f'{total / elapsed:.1f} RPS'
+        )
+        self.stdout.write(
+            '{:<20} {:>7} {:>8} {:>8} {:>8} {:>8} {:>7}'.format(
+                'URL', 'запр.', 'RPS', 'p50 мс', 'p95 мс', 'p99 мс',
+                'ошибки'
+            )
+        )
+        for name in sorted(samples):
+            values = samples[name]
+            self.stdout.write(
+                '{:<20} {:>7} {:>8.1f} {:>8.1f} {:>8.1f} {:>8.1f} {:>6.1%}'
+                .format(
+                    SCENARIOS[name],
+                    len(values),
+                    len(values) / elapsed,
+                    percentile(values, 0.50) * 1000,
+                    percentile(values, 0.95) * 1000,
+                    percentile(values, 0.99) * 1000,
+                    errors[name] / len(values),
+                )
+            )
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.commands.migrate import Command as MigrateCommand
+from django.db import connections
+
+from blogicum.dbsnapshot import (
+    can_use_snapshot,
+    restore_snapshot,
+    save_snapshot,
+    snapshot_path,
+)
+
+
+class Command(MigrateCommand):
+    help = (
+        'Применяет миграции. Пустая база SQLite заполняется из снимка '
+        'смигрированной базы, если он есть, иначе снимок создаётся.'
+    )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        # Снимок — результат полного migrate, частичный прогон его не даёт.
+        path = None
+        if not any(options[name] for name in (
+            'app_label', 'fake', 'fake_initial', 'plan', 'check_unapplied'
+        )) and can_use_snapshot(connection):
+            path = snapshot_path()
+        restored = path is not None and path.exists()
+        start = time.perf_counter()
+        if restored:
+            restore_snapshot(connection, path)
+        super().handle(*args, **options)
+        if path is not None and not restored:
+            save_snapshot(connection, path)
+        if options['verbosity'] >= 1:
+            self.stdout.write('Схема готова за {:.2f} с{}.'.format(
+                time.perf_counter() - start,
+                ' (из снимка)' if restored else '',
+            ))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.constants import DELETION_BATCH_PAUSE, DELETION_BATCH_SIZE
+from blog.deletion import process_deletions
+
+
+class Command(BaseCommand):
+    help = 'Удаляет скрытые посты и пользователей небольшими пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=DELETION_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--pause', type=float, default=DELETION_BATCH_PAUSE,
+            help='Пауза между пачками в секундах.'
+        )
+        parser.add_argument(
+            '--loop', type=float, metavar='SECONDS',
+            help='Не завершаться, проверяя очередь с этим интервалом.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_deletions(
+                batch_size=options['batch_size'], pause=options['pause']
+            )
+            if processed:
+                self.stdout.write(f'Выполнено задач удаления: {processed}.')
+            if not options['loop']:
+                break
+            time.sleep(options['loop'])
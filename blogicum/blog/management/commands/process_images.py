@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.thumbnails import process_image_tasks
+
+
+class Command(BaseCommand):
+    help = 'Делает миниатюры изображений из очереди импорта.'
+
+    def handle(self, *args, **options):
+        done, failed = process_image_tasks()
+        self.stdout.write(f'Миниатюр создано: {done}, с ошибкой: {failed}.')
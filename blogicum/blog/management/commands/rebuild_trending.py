@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.trending import rebuild_scores
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинги популярности всех постов с нуля.'
+
+    def handle(self, *args, **options):
+        rebuild_scores()
+        self.stdout.write('Рейтинги пересчитаны.')
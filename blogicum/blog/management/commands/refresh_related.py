@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from blog.related import rebuild_related, refresh_related
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает похожие публикации для изменённых постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересчитать похожие публикации для всех постов.'
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            rebuild_related()
+            self.stdout.write('Похожие публикации пересчитаны.')
+            return
+        processed = refresh_related()
+        self.stdout.write(f'Обработано изменённых постов: {processed}.')
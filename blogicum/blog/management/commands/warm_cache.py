@@ -0,0 +1,159 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from threading import local
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Count
+from django.urls import reverse
+
+from blog.constants import (
+    PAGINATION_COUNT_POST_PER_PAGE,
+    WARM_CATEGORY_PAGES,
+    WARM_INDEX_PAGES,
+    WARM_TOP_POSTS,
+)
+from blog.counters import view_counter
+from blog.models import Post
+from blog.services import posts_filter_by_publish
+from blog.transports import WsgiTransport, percentile
+from blog.trending import get_popular_posts
+
+
+# Бэкенды, кеш которых живёт только в памяти одного процесса.
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def page_urls(url, posts_count, pages):
+    """Адреса первых страниц списка; первая — без `?page=`."""
+    pages = min(
+        pages, max(1, -(-posts_count // PAGINATION_COUNT_POST_PER_PAGE))
+    )
+    return [url] + [f'{url}?page={page}' for page in range(2, pages + 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогревает кеш страниц после деплоя: лента, первые страницы '
+        'категорий и самые обсуждаемые посты.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument(
+            '--index-pages', type=int, default=WARM_INDEX_PAGES
+        )
+        parser.add_argument(
+            '--category-pages', type=int, default=WARM_CATEGORY_PAGES
+        )
+        parser.add_argument('--posts', type=int, default=WARM_TOP_POSTS)
+        parser.add_argument(
+            '--allow-local-cache', action='store_true',
+            help='Прогреть кеш, даже если он виден только этому процессу: '
+                 'например, чтобы измерить время рендера страниц.'
+        )
+
+    def handle(self, *args, **options):
+        cache = caches[DEFAULT_CACHE_ALIAS]
+        if isinstance(cache, PROCESS_LOCAL_CACHES) and not (
+            options['allow_local_cache']
+        ):
+            raise CommandError(
+                f'Кеш {type(cache).__name__} живёт в памяти одного процесса: '
+                'прогрев не дойдёт до воркеров сервера. Настройте общий кеш '
+                '(Memcached, Redis) или передайте --allow-local-cache.'
+            )
+        urls = self.hot_urls(
+            options['index_pages'],
+            options['category_pages'],
+            options['posts'],
+        )
+        transports = local()
+
+        def fetch(item):
+            name, url = item
+            if not hasattr(transports, 'transport'):
+                transports.transport = WsgiTransport()
+            start = time.perf_counter()
+            try:
+                status = transports.transport.request('GET', url)[0]
+            except Exception:
+                status = None
+            finally:
+                connections.close_all()
+            return name, url, status, time.perf_counter() - start
+
+        start = time.perf_counter()
+        view_counter.enabled = False
+        try:
+            with ThreadPoolExecutor(options['threads']) as executor:
+                results = list(executor.map(fetch, urls))
+        finally:
+            view_counter.enabled = True
+        self.report(results, time.perf_counter() - start)
+
+    def hot_urls(self, index_pages, category_pages, posts):
+        """Пары (имя URL, адрес) самых посещаемых страниц."""
+        published = posts_filter_by_publish(Post.objects.all())
+        urls = [
+            ('blog:index', url) for url in page_urls(
+                reverse('blog:index'), published.count(), index_pages
+            )
+        ]
+        categories = published.values_list('category__slug').annotate(
+            posts_count=Count('id')
+        ).order_by('category__slug')
+        for slug, posts_count in categories:
+            urls.extend(
+                ('blog:category_posts', url) for url in page_urls(
+                    reverse('blog:category_posts', args=[slug]),
+                    posts_count,
+                    category_pages,
+                )
+            )
+        top_ids = list(published.annotate(
+            comments_count=Count('comments')
+        ).order_by('-comments_count', '-pub_date').values_list(
+            'id', flat=True
+        )[:posts])
+        for post in get_popular_posts(posts):
+            if post.id not in top_ids:
+                top_ids.append(post.id)
+        urls.extend(
+            ('blog:post_detail', reverse('blog:post_detail', args=[pk]))
+            for pk in top_ids
+        )
+        return urls
+
+    def report(self, results, elapsed):
+        samples = defaultdict(list)
+        errors = defaultdict(int)
+        for name, url, status, duration in results:
+            samples[name].append(duration)
+            if status != 200:
+                errors[name] += 1
+                self.stderr.write(f'{url}: ответ {status}')
+        self.stdout.write(
+            f'Прогрето {len(results)} страниц за {elapsed:.1f} с'
+        )
+        self.stdout.write(
+            '{:<20} {:>7} {:>8} {:>8} {:>8} {:>7}'.format(
+                'URL', 'стр.', 'p50 мс', 'max мс', 'всего с', 'ошибки'
+            )
+        )
+        for name in sorted(samples):
+            values = samples[name]
+            self.stdout.write(
+                '{:<20} {:>7} {:>8.1f} {:>8.1f} {:>8.1f} {:>7}'.format(
+                    name,
+                    len(values),
+                    percentile(values, 0.50) * 1000,
+                    max(values) * 1000,
+                    sum(values),
+                    errors[name],
+                )
+            )
@@ -0,0 +1,199 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    replaces = [('blog', '0001_initial'), ('blog', '0002_auto_20250113_2035'), ('blog', '0003_auto_20250115_1436'), ('blog', '0004_auto_20250220_1055'), ('blog', '0005_profile'), ('blog', '0006_auto_20250225_1906'), ('blog', '0007_post_image'), ('blog', '0008_comment_updated_at'), ('blog', '0009_alter_comment_text'), ('blog', '0010_remove_comment_updated_at'), ('blog', '0011_rename_comments_comment_post_id'), ('blog', '0012_rename_post_id_comment_post'), ('blog', '0013_rename_post_comment_post_id'), ('blog', '0014_alter_comment_post_id'), ('blog', '0015_alter_comment_post_id'), ('blog', '0016_profile'), ('blog', '0017_auto_20250313_0945'), ('blog', '0018_auto_20250314_1524'), ('blog', '0019_auto_20250316_1808'), ('blog', '0020_auto_20250316_1814'), ('blog', '0021_alter_location_options'), ('blog', '0022_auto_20250316_1840'), ('blog', '0023_auto_20250316_1842'), ('blog', '0024_auto_20250317_2104'), ('blog', '0025_archive'), ('blog', '0026_deletion_task'), ('blog', '0027_author_stats'), ('blog', '0028_post_score'), ('blog', '0029_post_views'), ('blog', '0030_related_posts')]
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('description', models.TextField(verbose_name='Описание')),
+                ('slug', models.SlugField(help_text='Идентификатор страницы для URL;разрешены символы латиницы, цифры, дефис и подчёркивание.', unique=True, verbose_name='Идентификатор')),
+                ('is_published', models.BooleanField(default=True, help_text='Снимите галочку, чтобы скрыть публикацию.', verbose_name='Опубликовано')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+            ],
+            options={
+                'verbose_name': 'категория',
+                'verbose_name_plural': 'Категории',
+                'ordering': ('created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256, verbose_name='Название места')),
+                ('is_published', models.BooleanField(default=True, help_text='Снимите галочку, чтобы скрыть публикацию.', verbose_name='Опубликовано')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+            ],
+            options={
+                'verbose_name': 'местоположение',
+                'verbose_name_plural': 'Местоположения',
+                'ordering': ('created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='Post',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('pub_date', models.DateTimeField(default=django.utils.timezone.now, help_text='Если установить дату и время в будущем — можно делать отложенные публикации.', verbose_name='Дата и время публикации')),
+                ('is_published', models.BooleanField(default=True, help_text='Снимите галочку, чтобы скрыть публикацию.', verbose_name='Опубликовано')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='posts', to=settings.AUTH_USER_MODEL, verbose_name='Автор публикации')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='blog.category', verbose_name='Категория')),
+                ('location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='blog.location', verbose_name='Местоположение')),
+                ('image', models.ImageField(blank=True, null=True, upload_to='images/', verbose_name='Изображение')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Пост скрыт и будет удалён фоновой задачей.', verbose_name='Удаляется')),
+                ('views', models.PositiveIntegerField(default=0, editable=False, help_text='Обновляется пачками из blog.counters.', verbose_name='Просмотры')),
+            ],
+            options={
+                'verbose_name': 'публикация',
+                'verbose_name_plural': 'Публикации',
+                'default_related_name': 'posts',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(verbose_name='Текст комментария')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to=settings.AUTH_USER_MODEL, verbose_name='Автор публикации')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='blog.post', verbose_name='Комментарии к посту')),
+            ],
+            options={
+                'ordering': ('created_at',),
+                'verbose_name': 'комментарий',
+                'verbose_name_plural': 'Комментарии',
+                'default_related_name': 'comments',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('text', models.TextField(verbose_name='Текст комментария')),
+            ],
+            options={
+                'verbose_name': 'архивный комментарий',
+                'verbose_name_plural': 'Архивные комментарии',
+                'db_table': '"archive"."blog_comment"',
+                'ordering': ('created_at',),
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('is_published', models.BooleanField(default=True, help_text='Снимите галочку, чтобы скрыть публикацию.', verbose_name='Опубликовано')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('pub_date', models.DateTimeField(default=django.utils.timezone.now, help_text='Если установить дату и время в будущем — можно делать отложенные публикации.', verbose_name='Дата и время публикации')),
+                ('image', models.ImageField(blank=True, null=True, upload_to='images/', verbose_name='Изображение')),
+            ],
+            options={
+                'verbose_name': 'архивная публикация',
+                'verbose_name_plural': 'Архивные публикации',
+                'db_table': '"archive"."blog_post"',
+                'ordering': ('-created_at',),
+                'managed': False,
+                'default_related_name': 'archived_posts',
+            },
+        ),
+        migrations.CreateModel(
+            name='DeletionTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('kind', models.CharField(choices=[('post', 'публикация'), ('user', 'пользователь')], max_length=16, verbose_name='Что удаляется')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID объекта')),
+                ('object_repr', models.CharField(max_length=256, verbose_name='Объект')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Всего строк')),
+                ('deleted', models.PositiveIntegerField(default=0, verbose_name='Удалено строк')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершено')),
+            ],
+            options={
+                'verbose_name': 'задача удаления',
+                'verbose_name_plural': 'Задачи удаления',
+                'ordering': ('created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='auth.user', verbose_name='Автор')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Всего публикаций')),
+                ('published_post_count', models.PositiveIntegerField(default=0, verbose_name='Опубликовано')),
+                ('archived_post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций в архиве')),
+                ('published_archived_post_count', models.PositiveIntegerField(default=0, verbose_name='Опубликовано в архиве')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев к публикациям')),
+                ('last_post_date', models.DateTimeField(blank=True, null=True, verbose_name='Последняя публикация')),
+                ('next_pub_date', models.DateTimeField(blank=True, help_text='Когда наступит, счётчики пересчитываются.', null=True, verbose_name='Ближайшая отложенная публикация')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+        migrations.CreateModel(
+            name='PostScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('value', models.FloatField(db_index=True, help_text='Логарифм рейтинга, приведённый к общей эпохе.', verbose_name='Рейтинг')),
+            ],
+            options={
+                'verbose_name': 'рейтинг публикации',
+                'verbose_name_plural': 'Рейтинги публикаций',
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedPostsTask',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='related_task', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+            ],
+            options={
+                'verbose_name': 'пересчёт похожих публикаций',
+                'verbose_name_plural': 'Очередь пересчёта похожих публикаций',
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Сходство')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='blog.post', verbose_name='Публикация')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='linked_from', to='blog.post', verbose_name='Похожая публикация')),
+            ],
+            options={
+                'verbose_name': 'похожая публикация',
+                'verbose_name_plural': 'Похожие публикации',
+                'ordering': ('post', '-score'),
+                'unique_together': {('post', 'related')},
+            },
+        ),
+    ]
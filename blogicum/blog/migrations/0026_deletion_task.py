@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0025_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('kind', models.CharField(choices=[('post', 'публикация'), ('user', 'пользователь')], max_length=16, verbose_name='Что удаляется')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID объекта')),
+                ('object_repr', models.CharField(max_length=256, verbose_name='Объект')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Всего строк')),
+                ('deleted', models.PositiveIntegerField(default=0, verbose_name='Удалено строк')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершено')),
+            ],
+            options={
+                'verbose_name': 'задача удаления',
+                'verbose_name_plural': 'Задачи удаления',
+                'ordering': ('created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_deleted',
+            field=models.BooleanField(default=False, help_text='Пост скрыт и будет удалён фоновой задачей.', verbose_name='Удаляется'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0026_deletion_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='auth.user', verbose_name='Автор')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Всего публикаций')),
+                ('published_post_count', models.PositiveIntegerField(default=0, verbose_name='Опубликовано')),
+                ('archived_post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций в архиве')),
+                ('published_archived_post_count', models.PositiveIntegerField(default=0, verbose_name='Опубликовано в архиве')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев к публикациям')),
+                ('last_post_date', models.DateTimeField(blank=True, null=True, verbose_name='Последняя публикация')),
+                ('next_pub_date', models.DateTimeField(blank=True, help_text='Когда наступит, счётчики пересчитываются.', null=True, verbose_name='Ближайшая отложенная публикация')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0027_author_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('value', models.FloatField(db_index=True, help_text='Логарифм рейтинга, приведённый к общей эпохе.', verbose_name='Рейтинг')),
+            ],
+            options={
+                'verbose_name': 'рейтинг публикации',
+                'verbose_name_plural': 'Рейтинги публикаций',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0028_post_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='views',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Обновляется пачками из blog.counters.', verbose_name='Просмотры'),
+        ),
+    ]
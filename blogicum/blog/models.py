@@ -60,7 +60,7 @@ class Category(CreatedAtIsPublished):
         return self.title[:ABBREVIATED_TITLE]
 
 
-class Post(CreatedAtIsPublished):
+class PostFields(CreatedAtIsPublished):
     title = models.CharField("Заголовок", max_length=MAX_LENGTH_CHAR_FIELD)
     text = models.TextField("Текст")
     pub_date = models.DateTimeField(
@@ -93,14 +93,57 @@ class Post(CreatedAtIsPublished):
         blank=True, null=True
     )
 
+    is_archived = False
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return self.title[:ABBREVIATED_TITLE]
+
+
+class PostManager(models.Manager):
+    """Не показывает посты, ожидающие фонового удаления."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
+class Post(PostFields):
+    is_deleted = models.BooleanField(
+        "Удаляется",
+        default=False,
+        help_text="Пост скрыт и будет удалён фоновой задачей."
+    )
+    views = models.PositiveIntegerField(
+        "Просмотры",
+        default=0,
+        editable=False,
+        help_text="Обновляется пачками из blog.counters."
+    )
+
+    objects = PostManager()
+    all_objects = models.Manager()
+
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         default_related_name = "posts"
         ordering = ("-created_at",)
 
-    def __str__(self):
-        return self.title[:ABBREVIATED_TITLE]
+    def save(self, *args, **kwargs):
+        # Счётчик просмотров меняется только запросом из blog.counters,
+        # иначе сохранение формы затрёт накопленные за это время просмотры.
+        if (
+            self.pk is not None
+            and not self._state.adding
+            and kwargs.get("update_fields") is None
+        ):
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "views"
+            ]
+        super().save(*args, **kwargs)
 
 
 class Comment(CreatedAt):
@@ -124,3 +167,212 @@ class Comment(CreatedAt):
 
     def __str__(self):
         return self.text[:SHORTENED_TEXT]
+
+
+class ArchivedPost(PostFields):
+    """Публикация, перенесённая в архивную базу (см. blog.archive)."""
+
+    is_archived = True
+
+    class Meta:
+        managed = False
+        db_table = '"archive"."blog_post"'
+        verbose_name = "архивная публикация"
+        verbose_name_plural = "Архивные публикации"
+        default_related_name = "archived_posts"
+        ordering = ("-created_at",)
+
+
+class ArchivedComment(CreatedAt):
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name="comments",
+        verbose_name="Комментарии к посту"
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="archived_comments",
+        verbose_name="Автор публикации"
+    )
+    text = models.TextField(
+        verbose_name="Текст комментария",
+    )
+
+    class Meta(CreatedAt.Meta):
+        managed = False
+        db_table = '"archive"."blog_comment"'
+        verbose_name = "архивный комментарий"
+        verbose_name_plural = "Архивные комментарии"
+
+    def __str__(self):
+        return self.text[:SHORTENED_TEXT]
+
+
+class DeletionTask(CreatedAt):
+    POST = "post"
+    USER = "user"
+    KIND_CHOICES = (
+        (POST, "публикация"),
+        (USER, "пользователь"),
+    )
+
+    kind = models.CharField(
+        "Что удаляется", max_length=16, choices=KIND_CHOICES
+    )
+    object_id = models.PositiveBigIntegerField("ID объекта")
+    object_repr = models.CharField(
+        "Объект", max_length=MAX_LENGTH_CHAR_FIELD
+    )
+    total = models.PositiveIntegerField("Всего строк", default=0)
+    deleted = models.PositiveIntegerField("Удалено строк", default=0)
+    finished_at = models.DateTimeField("Завершено", null=True, blank=True)
+
+    class Meta(CreatedAt.Meta):
+        verbose_name = "задача удаления"
+        verbose_name_plural = "Задачи удаления"
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.object_repr}"
+
+
+class AuthorStats(models.Model):
+    """Счётчики для страницы автора; пересчитываются при изменениях."""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name="Автор"
+    )
+    post_count = models.PositiveIntegerField("Всего публикаций", default=0)
+    published_post_count = models.PositiveIntegerField(
+        "Опубликовано", default=0
+    )
+    archived_post_count = models.PositiveIntegerField(
+        "Публикаций в архиве", default=0
+    )
+    published_archived_post_count = models.PositiveIntegerField(
+        "Опубликовано в архиве", default=0
+    )
+    comment_count = models.PositiveIntegerField(
+        "Комментариев к публикациям", default=0
+    )
+    last_post_date = models.DateTimeField(
+        "Последняя публикация", null=True, blank=True
+    )
+    next_pub_date = models.DateTimeField(
+        "Ближайшая отложенная публикация",
+        null=True,
+        blank=True,
+        help_text="Когда наступит, счётчики пересчитываются."
+    )
+
+    class Meta:
+        verbose_name = "статистика автора"
+        verbose_name_plural = "Статистика авторов"
+
+    def __str__(self):
+        return str(self.user)
+
+    @property
+    def published_total(self):
+        return self.published_post_count + self.published_archived_post_count
+
+    @property
+    def total(self):
+        return self.post_count + self.archived_post_count
+
+
+class PostScore(models.Model):
+    """Рейтинг популярности поста с затуханием (см. blog.trending)."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="score",
+        verbose_name="Публикация"
+    )
+    value = models.FloatField(
+        "Рейтинг",
+        db_index=True,
+        help_text="Логарифм рейтинга, приведённый к общей эпохе."
+    )
+
+    class Meta:
+        verbose_name = "рейтинг публикации"
+        verbose_name_plural = "Рейтинги публикаций"
+
+    def __str__(self):
+        return str(self.post)
+
+
+class RelatedPost(models.Model):
+    """Предрасчитанный похожий пост (см. blog.related)."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="related_links",
+        verbose_name="Публикация"
+    )
+    related = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="linked_from",
+        verbose_name="Похожая публикация"
+    )
+    score = models.FloatField("Сходство")
+
+    class Meta:
+        verbose_name = "похожая публикация"
+        verbose_name_plural = "Похожие публикации"
+        ordering = ("post", "-score")
+        unique_together = ("post", "related")
+
+    def __str__(self):
+        return f"{self.post} → {self.related}"
+
+
+class RelatedPostsTask(models.Model):
+    """Пост, для которого нужно пересчитать похожие публикации."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="related_task",
+        verbose_name="Публикация"
+    )
+    created_at = models.DateTimeField("Добавлено", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "пересчёт похожих публикаций"
+        verbose_name_plural = "Очередь пересчёта похожих публикаций"
+
+    def __str__(self):
+        return str(self.post)
+
+
+class RelatedTerm(models.Model):
+    """Признак поста с весом до TF-IDF (см. blog.related)."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="related_terms",
+        verbose_name="Публикация"
+    )
+    term = models.CharField("Признак", max_length=80, db_index=True)
+    weight = models.FloatField("Вес")
+
+    class Meta:
+        verbose_name = "признак публикации"
+        verbose_name_plural = "Признаки публикаций"
+        unique_together = ("post", "term")
+
+    def __str__(self):
+        return self.term
@@ -0,0 +1,327 @@
+"""Предрасчёт похожих публикаций.
+
+Пост описывается разреженным TF-IDF-вектором по словам заголовка и текста
+с добавочными признаками `category:<id>` и `location:<id>`. Сходство —
+косинус векторов. Чтобы не сравнивать все пары постов, скалярные
+произведения копятся по инвертированному индексу: пост сравнивается только
+с постами, у которых есть общие признаки. Слишком частые признаки
+(встречающиеся больше чем в доле RELATED_MAX_DF постов) отбрасываются.
+
+Изменённые посты попадают в очередь RelatedPostsTask; команда
+`refresh_related` пересчитывает списки только для них и их соседей.
+Признаки постов хранятся в RelatedTerm, поэтому для этого читаются только
+посты с общими признаками, а не весь корпус.
+"""
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .constants import (
+    RELATED_CATEGORY_WEIGHT,
+    RELATED_LOCATION_WEIGHT,
+    RELATED_MAX_DF,
+    RELATED_POSTS_COUNT,
+    RELATED_POSTS_STORED,
+    RELATED_TITLE_WEIGHT,
+)
+from .models import Post, RelatedPost, RelatedPostsTask, RelatedTerm
+from .services import posts_filter_by_publish
+
+# Слова длиннее поля RelatedTerm.term в признаки не попадают.
+WORD_RE = re.compile(r'\b\w{3,64}\b')
+# Ограничение SQLite на число параметров запроса.
+WRITE_BATCH_SIZE = 500
+
+
+def post_terms(title, text, category_id, location_id):
+    """Признаки поста с весами до TF-IDF."""
+    terms = Counter(WORD_RE.findall(text.lower()))
+    for word in WORD_RE.findall(title.lower()):
+        terms[word] += RELATED_TITLE_WEIGHT
+    if category_id is not None:
+        terms[f'category:{category_id}'] += RELATED_CATEGORY_WEIGHT
+    if location_id is not None:
+        terms[f'location:{location_id}'] += RELATED_LOCATION_WEIGHT
+    return terms
+
+
+def rows_terms(rows):
+    """Признаки постов по строкам (id, заголовок, текст, категория, место)."""
+    return {
+        pk: post_terms(title, text, category_id, location_id)
+        for pk, title, text, category_id, location_id in rows
+    }
+
+
+def max_frequency(total):
+    """Наибольшая частота признака, при которой он ещё учитывается."""
+    return max(2, int(total * RELATED_MAX_DF))
+
+
+def batches(items):
+    items = list(items)
+    for start in range(0, len(items), WRITE_BATCH_SIZE):
+        yield items[start:start + WRITE_BATCH_SIZE]
+
+
+class RelatedIndex:
+    """Нормированные TF-IDF-векторы постов и инвертированный индекс по ним.
+
+    documents — признаки постов, frequency — число опубликованных постов
+    с каждым признаком, total — число опубликованных постов. Индекс может
+    покрывать только часть постов, если frequency и total посчитаны по всем.
+    """
+
+    def __init__(self, documents, frequency, total):
+        self.documents = documents
+        limit = max_frequency(total)
+        self.vectors = {}
+        self.index = defaultdict(list)
+        for pk, terms in documents.items():
+            vector = {
+                term: (1 + math.log(count)) * math.log(
+                    total / frequency[term]
+                )
+                for term, count in terms.items()
+                # Признак одного поста ни с кем не совпадёт.
+                if 1 < frequency[term] <= limit
+            }
+            norm = math.sqrt(sum(weight ** 2 for weight in vector.values()))
+            if not norm:
+                continue
+            self.vectors[pk] = {
+                term: weight / norm for term, weight in vector.items()
+            }
+            for term, weight in self.vectors[pk].items():
+                self.index[term].append((pk, weight))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Индекс по строкам published_rows."""
+        documents = rows_terms(rows)
+        frequency = Counter(
+            term for terms in documents.values() for term in terms
+        )
+        return cls(documents, frequency, len(documents))
+
+    @classmethod
+    def build(cls):
+        return cls.from_rows(published_rows(Post.objects.all()))
+
+    def scores(self, pk):
+        """Сходство поста с постами индекса, у которых есть общие признаки."""
+        scores = defaultdict(float)
+        for term, weight in self.vectors.get(pk, {}).items():
+            for other, other_weight in self.index[term]:
+                scores[other] += weight * other_weight
+        scores.pop(pk, None)
+        return scores
+
+    def top(self, pk, limit=RELATED_POSTS_STORED):
+        """Самые похожие посты: список пар (id, сходство)."""
+        return heapq.nlargest(
+            limit, self.scores(pk).items(), key=itemgetter(1)
+        )
+
+
+def published_rows(queryset):
+    return posts_filter_by_publish(queryset).values_list(
+        'pk', 'title', 'text', 'category_id', 'location_id'
+    ).iterator()
+
+
+def store_terms(documents, post_ids):
+    """Заменяет сохранённые признаки постов post_ids на documents."""
+    for batch in batches(post_ids):
+        terms = [
+            RelatedTerm(post_id=pk, term=term, weight=weight)
+            for pk in batch if pk in documents
+            for term, weight in documents[pk].items()
+        ]
+        with transaction.atomic():
+            RelatedTerm.objects.filter(post_id__in=batch).delete()
+            RelatedTerm.objects.bulk_create(
+                terms, batch_size=WRITE_BATCH_SIZE
+            )
+
+
+def load_documents(post_ids):
+    """Сохранённые признаки опубликованных постов из post_ids."""
+    documents = defaultdict(Counter)
+    for batch in batches(post_ids):
+        rows = RelatedTerm.objects.filter(
+            post__in=posts_filter_by_publish(
+                Post.objects.filter(pk__in=batch)
+            )
+        ).values_list('post_id', 'term', 'weight')
+        for pk, term, weight in rows.iterator():
+            documents[pk][term] = weight
+    return documents
+
+
+def load_frequency(terms):
+    """Число постов с каждым признаком по сохранённому индексу."""
+    frequency = Counter()
+    for batch in batches(terms):
+        frequency.update(dict(
+            RelatedTerm.objects.filter(term__in=batch).values_list(
+                'term'
+            ).annotate(Count('post')).order_by()
+        ))
+    return frequency
+
+
+def write_related(lists):
+    """Заменяет списки похожих постов: lists — {id: [(id, сходство)]}."""
+    for batch in batches(lists):
+        links = [
+            RelatedPost(post_id=pk, related_id=other, score=score)
+            for pk in batch
+            for other, score in lists[pk]
+        ]
+        with transaction.atomic():
+            RelatedPost.objects.filter(post_id__in=batch).delete()
+            RelatedPost.objects.bulk_create(links)
+
+
+def rebuild_related():
+    """Пересчитывает похожие публикации и признаки для всех постов."""
+    started = timezone.now()
+    index = RelatedIndex.build()
+    with transaction.atomic():
+        RelatedTerm.objects.all().delete()
+        RelatedPost.objects.all().delete()
+        RelatedPostsTask.objects.filter(created_at__lte=started).delete()
+    store_terms(index.documents, index.documents)
+    write_related({pk: index.top(pk) for pk in index.vectors})
+
+
+def changed_index(changed):
+    """Индекс по изменённым постам и постам с общими с ними признаками."""
+    total = posts_filter_by_publish(Post.objects.all()).count()
+    documents = load_documents(changed)
+    frequency = load_frequency(
+        {term for terms in documents.values() for term in terms}
+    )
+    shared = [
+        term for term, count in frequency.items()
+        if 1 < count <= max_frequency(total)
+    ]
+    candidates = set()
+    for batch in batches(shared):
+        candidates.update(RelatedTerm.objects.filter(
+            term__in=batch
+        ).values_list('post_id', flat=True).distinct())
+    documents.update(load_documents(candidates - set(changed)))
+    frequency.update(load_frequency(
+        {term for terms in documents.values() for term in terms}
+        - frequency.keys()
+    ))
+    return RelatedIndex(documents, frequency, total)
+
+
+def neighbour_lists(scores, lists):
+    """Списки соседей изменённых постов с новым сходством с ними.
+
+    scores — сходство каждого изменённого поста с остальными, lists — новые
+    списки изменённых постов.
+    """
+    changed = set(scores)
+    neighbours = {other for pk in changed for other, _ in lists[pk]}
+    for batch in batches(changed):
+        # Списки, в которых изменённый пост уже есть.
+        neighbours.update(RelatedPost.objects.filter(
+            related_id__in=batch
+        ).values_list('post_id', flat=True))
+    neighbours -= changed
+    incoming = defaultdict(dict)
+    for pk in changed:
+        for other, score in scores[pk].items():
+            if other in neighbours:
+                incoming[other][pk] = score
+    result = {}
+    for batch in batches(neighbours):
+        current = {pk: dict(incoming[pk]) for pk in batch}
+        for pk, other, score in RelatedPost.objects.filter(
+            post_id__in=batch
+        ).values_list('post_id', 'related_id', 'score'):
+            if other not in changed:
+                current[pk][other] = score
+        result.update(
+            (pk, heapq.nlargest(
+                RELATED_POSTS_STORED, related.items(), key=itemgetter(1)
+            ))
+            for pk, related in current.items()
+        )
+    return result
+
+
+def refresh_related():
+    """Пересчитывает списки постов из очереди и их соседей.
+
+    Читаются не все посты, а только те, у которых есть общие признаки
+    с изменёнными: их признаки и частоты берутся из RelatedTerm. Списки
+    соседей не строятся заново: из них убираются изменённые посты и
+    добавляются с новым сходством. Веса IDF остальных пар при этом не
+    пересчитываются — это делает `refresh_related --all`.
+
+    Возвращает число обработанных задач.
+    """
+    # Задачи, поставленные во время пересчёта, остаются в очереди.
+    started = timezone.now()
+    changed = list(RelatedPostsTask.objects.filter(
+        created_at__lte=started
+    ).values_list('post_id', flat=True))
+    if not changed:
+        return 0
+    for batch in batches(changed):
+        store_terms(
+            rows_terms(published_rows(Post.objects.filter(pk__in=batch))),
+            batch,
+        )
+    index = changed_index(changed)
+    scores = {pk: index.scores(pk) for pk in changed}
+    lists = {
+        pk: heapq.nlargest(
+            RELATED_POSTS_STORED, scores[pk].items(), key=itemgetter(1)
+        )
+        for pk in changed
+    }
+    lists.update(neighbour_lists(scores, lists))
+    write_related(lists)
+    for batch in batches(changed):
+        RelatedPostsTask.objects.filter(
+            post_id__in=batch, created_at__lte=started
+        ).delete()
+    return len(changed)
+
+
+def queue_related(post_ids):
+    """Ставит посты в очередь на пересчёт похожих публикаций.
+
+    У постов, которые уже в очереди, обновляется время постановки, чтобы
+    идущий пересчёт не снял задачу.
+    """
+    post_ids = list(post_ids)
+    RelatedPostsTask.objects.bulk_create(
+        [RelatedPostsTask(post_id=pk) for pk in post_ids],
+        batch_size=WRITE_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    queued = timezone.now()
+    for batch in batches(post_ids):
+        RelatedPostsTask.objects.filter(
+            post_id__in=batch, created_at__lt=queued
+        ).update(created_at=queued)
+
+
+def get_related_posts(post, limit=RELATED_POSTS_COUNT):
+    return posts_filter_by_publish(
+        Post.objects.filter(linked_from__post=post)
+    ).order_by('-linked_from__score')[:limit]
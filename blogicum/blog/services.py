@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.core.paginator import Paginator
 from django.db.models import Count
 from django.utils.timezone import now
@@ -27,6 +28,43 @@ def annotate_posts(queryset):
     )
 
 
+class QuerySetChain:
+    """Несколько QuerySet подряд как одна последовательность для Paginator.
+
+    Считает и нарезает каждый QuerySet отдельно, поэтому на страницу
+    приходится не больше запросов, чем частей в цепочке. Известные заранее
+    размеры частей можно передать в counts.
+    """
+
+    def __init__(self, *querysets, counts=None):
+        self.querysets = querysets
+        self._counts = counts
+
+    def counts(self):
+        if self._counts is None:
+            self._counts = [queryset.count() for queryset in self.querysets]
+        return self._counts
+
+    def count(self):
+        return sum(self.counts())
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+        items = []
+        for queryset, count in zip(self.querysets, self.counts()):
+            if start < count and stop > 0:
+                items.extend(queryset[max(start, 0):min(stop, count)])
+            start -= count
+            stop -= count
+        return items
+
+
 def paginate_queryset(
     queryset,
     request,
@@ -36,3 +74,12 @@ def paginate_queryset(
     paginator = Paginator(queryset, per_page)
     page = request.GET.get('page')
     return paginator.get_page(page)
+
+
+def get_template_engine(view_name):
+    """Возвращает имя шаблонного движка для view из JINJA2_VIEWS."""
+    if view_name in settings.JINJA2_VIEWS and any(
+        engine.get('NAME') == 'jinja2' for engine in settings.TEMPLATES
+    ):
+        return 'jinja2'
+    return None
@@ -0,0 +1,146 @@
+from django.contrib.auth.signals import user_logged_out
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .archive import attach_archive, create_archive_schema
+from .backends import invalidate_cached_user
+from .constants import TRENDING_COMMENT_WEIGHT
+from .feeds import bump_feeds_version
+from .forms import reset_category_choices
+from .models import Category, Comment, Post, User
+from .related import queue_related
+from .sitemaps import drop_chunk
+from .stats import change_comment_count, invalidate_author_stats
+from .trending import bump_scores, move_publication, rebuild_scores
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def reset_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def reset_user_cache_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_cached_user(user.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reset_feeds(sender, **kwargs):
+    bump_feeds_version()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def reset_post_sitemap(sender, instance, **kwargs):
+    drop_chunk('posts', instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reset_category_sitemap(sender, instance, **kwargs):
+    drop_chunk('categories', instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reset_post_form_categories(sender, **kwargs):
+    reset_category_choices()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def reset_profile_sitemap(sender, instance, **kwargs):
+    drop_chunk('profiles', instance.pk)
+
+
+@receiver(connection_created)
+def attach_archive_database(sender, connection, **kwargs):
+    attach_archive(connection)
+
+
+@receiver(post_migrate)
+def create_archive_tables(sender, using, **kwargs):
+    # post_migrate приходит от каждого приложения, схема нужна одна.
+    if sender.label == 'blog':
+        create_archive_schema(connections[using])
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def reset_author_stats(sender, instance, **kwargs):
+    invalidate_author_stats([instance.author_id])
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def reset_category_authors_stats(sender, instance, **kwargs):
+    invalidate_author_stats(
+        Post.all_objects.filter(category=instance).values('author_id')
+    )
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if created:
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver(pre_save, sender=Post)
+def remember_pub_date(sender, instance, update_fields=None, **kwargs):
+    # Из полей поста рейтинг зависит только от даты публикации.
+    instance._saved_pub_date = None
+    if instance.pk is not None and (
+        update_fields is None or 'pub_date' in update_fields
+    ):
+        instance._saved_pub_date = Post.all_objects.filter(
+            pk=instance.pk
+        ).values_list('pub_date', flat=True).first()
+
+
+@receiver(post_save, sender=Post)
+def reset_post_score(sender, instance, created, **kwargs):
+    saved_pub_date = getattr(instance, '_saved_pub_date', None)
+    if created:
+        rebuild_scores([instance.pk])
+    elif saved_pub_date is not None and saved_pub_date != instance.pub_date:
+        move_publication(instance.pk, saved_pub_date, instance.pub_date)
+
+
+@receiver(post_save, sender=Comment)
+def score_new_comment(sender, instance, created, **kwargs):
+    if created:
+        bump_scores(
+            {instance.post_id: TRENDING_COMMENT_WEIGHT}, instance.created_at
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def unscore_deleted_comment(sender, instance, **kwargs):
+    bump_scores(
+        {instance.post_id: -TRENDING_COMMENT_WEIGHT}, instance.created_at
+    )
+
+
+@receiver(post_save, sender=Post)
+def queue_related_posts(sender, instance, **kwargs):
+    queue_related([instance.pk])
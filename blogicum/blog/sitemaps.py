@@ -0,0 +1,187 @@
+"""Карта сайта: индекс и части до 50 000 адресов.
+
+Части разбиты по диапазонам первичного ключа, поэтому изменение поста
+затрагивает только одну часть. Готовые части хранятся на диске в
+SITEMAP_ROOT; в имени файла — отпечаток диапазона (число строк и последняя
+дата), так что часть пересобирается, только когда её диапазон изменился.
+"""
+import hashlib
+import os
+import re
+from abc import ABC, abstractmethod
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.urls import reverse
+
+from .constants import SITEMAP_CHUNK_SIZE
+from .models import ArchivedPost, Category, Post, User
+from .services import posts_filter_by_publish
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = (
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+URLSET_CLOSE = '</urlset>\n'
+ITERATOR_CHUNK_SIZE = 2000
+
+
+class SitemapSection(ABC):
+    name = None
+    fields = ('id',)
+    lastmod_field = None
+
+    @abstractmethod
+    def get_queryset(self):
+        """Выборка объектов части; фильтруется по диапазонам id."""
+
+    @abstractmethod
+    def location(self, row):
+        """Путь страницы по строке из `fields`."""
+
+    def lastmod(self, row):
+        return None
+
+    def get_chunk_queryset(self, number):
+        return self.get_queryset().filter(
+            id__gt=number * SITEMAP_CHUNK_SIZE,
+            id__lte=(number + 1) * SITEMAP_CHUNK_SIZE,
+        )
+
+    def chunk_count(self):
+        max_id = self.get_queryset().aggregate(max_id=Max('id'))['max_id']
+        return (max_id - 1) // SITEMAP_CHUNK_SIZE + 1 if max_id else 0
+
+    def fingerprint(self, number):
+        state = self.get_chunk_queryset(number).aggregate(
+            count=Count('id'), last=Max(self.lastmod_field or 'id')
+        )
+        return hashlib.md5(repr(state).encode()).hexdigest()[:12]
+
+    def iter_rows(self, number):
+        return self.get_chunk_queryset(number).order_by('id').values_list(
+            *self.fields
+        ).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+
+
+class PostSection(SitemapSection):
+    name = 'posts'
+    fields = ('id', 'pub_date')
+    lastmod_field = 'pub_date'
+
+    def get_queryset(self):
+        return posts_filter_by_publish(Post.objects.all())
+
+    def location(self, row):
+        return reverse('blog:post_detail', args=[row[0]])
+
+    def lastmod(self, row):
+        return row[1]
+
+
+class ArchivedPostSection(PostSection):
+    """Посты из архива: их страницы по-прежнему открываются."""
+
+    name = 'archived_posts'
+
+    def get_queryset(self):
+        return posts_filter_by_publish(ArchivedPost.objects.all())
+
+
+class CategorySection(SitemapSection):
+    name = 'categories'
+    fields = ('id', 'slug')
+
+    def get_queryset(self):
+        return Category.objects.filter(is_published=True)
+
+    def location(self, row):
+        return reverse('blog:category_posts', args=[row[1]])
+
+
+class ProfileSection(SitemapSection):
+    name = 'profiles'
+    fields = ('id', 'username')
+
+    def get_queryset(self):
+        return User.objects.filter(is_active=True)
+
+    def location(self, row):
+        return reverse('blog:profile', args=[row[1]])
+
+
+SECTIONS = {
+    section.name: section
+    for section in (
+        PostSection(), ArchivedPostSection(), CategorySection(),
+        ProfileSection(),
+    )
+}
+
+
+def get_host_dir(request):
+    """Каталог кеша для схемы и хоста: в файлах абсолютные адреса."""
+    host = re.sub(r'[^\w.-]', '_', request.get_host())
+    return Path(settings.SITEMAP_ROOT) / f'{request.scheme}_{host}'
+
+
+def write_chunk(path, section, number, base_url):
+    """Пишет часть карты на диск построчно, не загружая выборку целиком."""
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.write(XML_HEADER)
+        file.write(URLSET_OPEN)
+        for row in section.iter_rows(number):
+            lastmod = section.lastmod(row)
+            file.write('<url><loc>{}</loc>{}</url>\n'.format(
+                escape(base_url + section.location(row)),
+                f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+                if lastmod else '',
+            ))
+        file.write(URLSET_CLOSE)
+    os.replace(tmp_path, path)
+
+
+def get_chunk_path(request, section, number):
+    """Возвращает путь к актуальной части карты, собирая её при надобности."""
+    host_dir = get_host_dir(request)
+    host_dir.mkdir(parents=True, exist_ok=True)
+    fingerprint = section.fingerprint(number)
+    path = host_dir / f'{section.name}-{number}-{fingerprint}.xml'
+    if not path.exists():
+        for stale in host_dir.glob(f'{section.name}-{number}-*.xml'):
+            stale.unlink(missing_ok=True)
+        write_chunk(
+            path, section, number, f'{request.scheme}://{request.get_host()}'
+        )
+    return path
+
+
+def render_index(request):
+    lines = [
+        XML_HEADER,
+        '<sitemapindex '
+        'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+    ]
+    for name, section in SECTIONS.items():
+        for number in range(section.chunk_count()):
+            url = request.build_absolute_uri(
+                reverse('blog:sitemap_chunk', args=[name, number])
+            )
+            lines.append(f'<sitemap><loc>{escape(url)}</loc></sitemap>\n')
+    lines.append('</sitemapindex>\n')
+    return ''.join(lines)
+
+
+def drop_chunk(section_name, object_id):
+    """Удаляет закешированную часть с объектом.
+
+    Нужна для изменений, не попадающих в отпечаток: смены slug, username
+    или даты публикации не последнего поста.
+    """
+    number = (object_id - 1) // SITEMAP_CHUNK_SIZE
+    pattern = f'*/{section_name}-{number}-*.xml'
+    for path in Path(settings.SITEMAP_ROOT).glob(pattern):
+        path.unlink(missing_ok=True)
@@ -0,0 +1,85 @@
+"""Предрасчитанная статистика авторов для страницы профиля.
+
+Строка AuthorStats удаляется при изменении постов автора и пересчитывается
+при следующем чтении; счётчик комментариев меняется на месте, чтобы
+каждый новый комментарий не вызывал пересчёт.
+"""
+from django.db.models import Count, F, Max, Min, Q
+from django.utils.timezone import now
+
+from .models import ArchivedComment, ArchivedPost, AuthorStats, Comment, Post
+
+
+def aggregate_posts(queryset, moment):
+    published = Q(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=moment,
+    )
+    return queryset.aggregate(
+        total=Count('id'),
+        published=Count('id', filter=published),
+        last_post_date=Max('pub_date', filter=published),
+        next_pub_date=Min(
+            'pub_date', filter=Q(is_published=True, pub_date__gt=moment)
+        ),
+    )
+
+
+def compute_author_stats(user):
+    """Пересчитывает и сохраняет статистику автора."""
+    moment = now()
+    live = aggregate_posts(Post.objects.filter(author=user), moment)
+    archived = aggregate_posts(
+        ArchivedPost.objects.filter(author=user), moment
+    )
+    last_dates = [
+        date for date in (live['last_post_date'], archived['last_post_date'])
+        if date is not None
+    ]
+    stats, _ = AuthorStats.objects.update_or_create(
+        user=user,
+        defaults={
+            'post_count': live['total'],
+            'published_post_count': live['published'],
+            'archived_post_count': archived['total'],
+            'published_archived_post_count': archived['published'],
+            'comment_count': (
+                Comment.objects.filter(
+                    post__author=user, post__is_deleted=False
+                ).count()
+                + ArchivedComment.objects.filter(post__author=user).count()
+            ),
+            'last_post_date': max(last_dates, default=None),
+            'next_pub_date': live['next_pub_date'],
+        },
+    )
+    return stats
+
+
+def get_author_stats(user):
+    """Возвращает статистику автора, пересчитывая её при необходимости."""
+    stats = AuthorStats.objects.filter(user=user).first()
+    if stats is None or (
+        stats.next_pub_date is not None and stats.next_pub_date <= now()
+    ):
+        stats = compute_author_stats(user)
+    return stats
+
+
+def invalidate_author_stats(user_ids=None):
+    """Сбрасывает статистику указанных авторов или всех, если None."""
+    stats = AuthorStats.objects.all()
+    if user_ids is not None:
+        stats = stats.filter(user_id__in=user_ids)
+    stats.delete()
+
+
+def change_comment_count(post_id, delta):
+    """Меняет счётчик комментариев автора поста без пересчёта."""
+    stats = AuthorStats.objects.filter(
+        user__in=Post.all_objects.filter(pk=post_id).values('author_id')
+    )
+    if delta < 0:
+        stats = stats.filter(comment_count__gte=-delta)
+    stats.update(comment_count=F('comment_count') + delta)
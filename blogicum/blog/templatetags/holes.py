@@ -0,0 +1,11 @@
+from django import template
+
+from ..holes import punch_hole
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, name, **params):
+    """Персональный фрагмент страницы, см. blog.holes."""
+    return punch_hole(context.get('request'), name, params)
@@ -0,0 +1,76 @@
+"""Миниатюры изображений постов из очереди IMAGE_TASK_QUEUE.
+
+Массовый импорт не обрабатывает картинки сам, а дописывает задачи
+`{"post_id": ..., "image": ...}` в IMAGE_TASK_QUEUE. Команда
+`process_images` забирает очередь целиком переименованием файла, чтобы
+следующий импорт писал уже в новый, делает для каждой картинки миниатюру
+не больше THUMBNAIL_SIZE в THUMBNAIL_DIR хранилища и удаляет забранный
+файл. Файл, оставшийся от прерванного запуска, обрабатывается первым.
+"""
+import json
+import logging
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = 'thumbnails'
+
+
+def thumbnail_name(image):
+    return posixpath.join(THUMBNAIL_DIR, image)
+
+
+def make_thumbnail(image):
+    """Сохраняет миниатюру изображения и возвращает её имя."""
+    with default_storage.open(image) as source:
+        picture = Image.open(source)
+        image_format = picture.format
+        picture.thumbnail(settings.THUMBNAIL_SIZE)
+        if image_format == 'JPEG' and picture.mode not in ('RGB', 'L'):
+            picture = picture.convert('RGB')
+        content = ContentFile(b'')
+        picture.save(content, format=image_format)
+    name = thumbnail_name(image)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, content)
+
+
+def take_image_tasks():
+    """Забирает очередь: возвращает путь к забранному файлу или None."""
+    queue = settings.IMAGE_TASK_QUEUE
+    taken = queue.with_name(queue.name + '.processing')
+    if not taken.exists():
+        try:
+            queue.rename(taken)
+        except FileNotFoundError:
+            return None
+    return taken
+
+
+def process_image_tasks():
+    """Делает миниатюры по очереди. Возвращает (готово, с ошибкой)."""
+    taken = take_image_tasks()
+    if taken is None:
+        return 0, 0
+    done = failed = 0
+    with open(taken, encoding='utf-8') as tasks:
+        for line in tasks:
+            if not line.strip():
+                continue
+            image = json.loads(line)['image']
+            try:
+                make_thumbnail(image)
+            except OSError as error:
+                # Файла нет или это не картинка: повторять бессмысленно.
+                logger.warning('Миниатюра для %s не создана: %s', image, error)
+                failed += 1
+            else:
+                done += 1
+    taken.unlink()
+    return done, failed
@@ -0,0 +1,81 @@
+"""Запросы к приложению из команд нагрузки и прогрева.
+
+WsgiTransport вызывает WSGI-приложение в том же процессе, HttpTransport
+ходит к запущенному серверу. У обоих один метод `request`, который
+возвращает статус, заголовки и тело ответа.
+"""
+import http.client
+import io
+import sys
+from urllib.parse import urlsplit
+
+
+def percentile(values, share):
+    """Значение, ниже которого доля share (от 0 до 1) выборки."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+class WsgiTransport:
+    """Вызывает WSGI-приложение в том же процессе."""
+
+    def __init__(self):
+        from blogicum.wsgi import application
+        self.application = application
+
+    def request(self, method, path, body=b'', headers=None):
+        path, _, query = path.partition('?')
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost',
+            'REMOTE_ADDR': '127.0.0.1',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in (headers or {}).items():
+            key = name.upper().replace('-', '_')
+            if key != 'CONTENT_TYPE':
+                key = 'HTTP_' + key
+            environ[key] = value
+        status_headers = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            status_headers['status'] = int(status.split()[0])
+            status_headers['headers'] = response_headers
+
+        result = self.application(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return status_headers['status'], status_headers['headers'], content
+
+
+class HttpTransport:
+    """Ходит к уже запущенному серверу по HTTP с keep-alive."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.connection = http.client.HTTPConnection(
+            parts.hostname, parts.port or 80, timeout=30
+        )
+
+    def request(self, method, path, body=b'', headers=None):
+        self.connection.request(method, path, body=body, headers=headers or {})
+        response = self.connection.getresponse()
+        content = response.read()
+        return response.status, response.getheaders(), content
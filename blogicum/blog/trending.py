@@ -0,0 +1,156 @@
+"""Рейтинг популярных постов с экспоненциальным затуханием.
+
+Вклад события весом w через время Δ равен w * 2 ** (-Δ / H), где H —
+период полураспада. Все вклады затухают одинаково, поэтому порядок постов
+со временем не меняется, и достаточно хранить сумму вкладов, приведённых
+к общей эпохе: value = ln Σ w * e ** ((t - EPOCH) / τ), τ = H / ln 2.
+Логарифм не даёт числу переполниться, а новое событие прибавляется
+к одной строке без пересчёта остальных.
+"""
+import math
+from datetime import datetime, timezone
+
+from django.db import transaction
+from django.utils.timezone import now
+
+from .constants import (
+    POPULAR_POSTS_COUNT,
+    TRENDING_COMMENT_WEIGHT,
+    TRENDING_HALF_LIFE_HOURS,
+    TRENDING_POST_WEIGHT,
+    TRENDING_VIEW_WEIGHT,
+)
+from .models import Comment, Post, PostScore
+from .services import annotate_posts
+
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+TAU = TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2)
+# Ограничение SQLite на число параметров запроса.
+REBUILD_BATCH_SIZE = 500
+
+
+def point(weight, moment):
+    """Вклад события весом weight в момент moment в логарифмической шкале."""
+    return math.log(weight) + (moment - EPOCH).total_seconds() / TAU
+
+
+def log_add(a, b):
+    """ln(e^a + e^b) без переполнения."""
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def log_sub(a, b):
+    """ln(e^a - e^b); None, если вычитаемое не меньше уменьшаемого."""
+    if a is None or b >= a:
+        return None
+    return a + math.log1p(-math.exp(b - a))
+
+
+def rebuild_scores(post_ids=None):
+    """Пересчитывает рейтинги постов с нуля.
+
+    Складывает публикацию, комментарии и просмотры. Время просмотров не
+    хранится, поэтому они засчитываются на момент публикации: это нижняя
+    граница их вклада.
+    """
+    if post_ids is None:
+        post_ids = Post.all_objects.order_by('pk').values_list(
+            'pk', flat=True
+        )
+    post_ids = list(post_ids)
+    for start in range(0, len(post_ids), REBUILD_BATCH_SIZE):
+        batch = post_ids[start:start + REBUILD_BATCH_SIZE]
+        values = {}
+        for pk, pub_date, views in Post.all_objects.filter(
+            pk__in=batch
+        ).values_list('pk', 'pub_date', 'views'):
+            values[pk] = point(TRENDING_POST_WEIGHT, pub_date)
+            if views:
+                values[pk] = log_add(
+                    values[pk], point(views * TRENDING_VIEW_WEIGHT, pub_date)
+                )
+        comments = Comment.objects.filter(post_id__in=batch).values_list(
+            'post_id', 'created_at'
+        )
+        for post_id, created_at in comments:
+            values[post_id] = log_add(
+                values[post_id], point(TRENDING_COMMENT_WEIGHT, created_at)
+            )
+        with transaction.atomic():
+            PostScore.objects.filter(post_id__in=batch).delete()
+            PostScore.objects.bulk_create(
+                PostScore(post_id=pk, value=value)
+                for pk, value in values.items()
+            )
+
+
+def bump_scores(weights, moment=None):
+    """Добавляет к рейтингам вклады {post_id: вес} в момент moment.
+
+    Отрицательный вес убирает вклад, добавленный ранее в тот же момент.
+    Посты без рейтинга при положительном весе пересчитываются целиком.
+    """
+    moment = moment or now()
+    with transaction.atomic():
+        scores = PostScore.objects.in_bulk(list(weights))
+        missing = []
+        changed = []
+        for post_id, weight in weights.items():
+            score = scores.get(post_id)
+            if score is None:
+                if weight > 0:
+                    missing.append(post_id)
+                continue
+            if weight > 0:
+                score.value = log_add(score.value, point(weight, moment))
+            else:
+                value = log_sub(score.value, point(-weight, moment))
+                if value is None:
+                    # Вклад уже потерян в погрешности округления.
+                    continue
+                score.value = value
+            changed.append(score)
+        PostScore.objects.bulk_update(changed, ['value'])
+    if missing:
+        rebuild_scores(missing)
+
+
+def move_publication(post_id, old_pub_date, new_pub_date):
+    """Переносит вклад публикации поста на новую дату.
+
+    Вклады комментариев и просмотров остаются как есть: пересчёт с нуля
+    сдвинул бы просмотры на дату публикации.
+    """
+    with transaction.atomic():
+        score = PostScore.objects.filter(post_id=post_id).first()
+        if score is None:
+            rebuild_scores([post_id])
+            return
+        rest = log_sub(
+            score.value, point(TRENDING_POST_WEIGHT, old_pub_date)
+        )
+        score.value = log_add(
+            rest, point(TRENDING_POST_WEIGHT, new_pub_date)
+        )
+        score.save(update_fields=['value'])
+
+
+def get_popular_posts(limit=POPULAR_POSTS_COUNT):
+    """Возвращает самые популярные опубликованные посты.
+
+    Первый запрос идёт по индексу рейтинга и останавливается на limit
+    строках, второй подгружает только найденные посты.
+    """
+    post_ids = list(
+        PostScore.objects.filter(
+            post__is_deleted=False,
+            post__is_published=True,
+            post__category__is_published=True,
+            post__pub_date__lte=now(),
+        ).order_by('-value').values_list('post_id', flat=True)[:limit]
+    )
+    posts = annotate_posts(Post.objects.filter(pk__in=post_ids)).in_bulk()
+    return [posts[pk] for pk in post_ids if pk in posts]
@@ -0,0 +1,152 @@
+"""Потоковый приём изображений постов.
+
+Стандартные обработчики сначала принимают файл целиком, и только потом
+форма проверяет его через Pillow. ImageUploadHandler проверяет файлы
+полей IMAGE_UPLOAD_FIELDS на лету: считает байты, по первым байтам
+определяет формат и обрывает загрузку сверх IMAGE_UPLOAD_MAX_SIZE
+или не-изображения. Файл пишется во временный файл на диске, а не в
+память. Обработчик включается только во view с декоратором
+`stream_images`, админка и остальные формы принимают файлы как обычно.
+Ошибки копятся в `request.upload_errors`, view переносит их в форму через
+`add_upload_errors`.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadhandler import (
+    StopUpload,
+    TemporaryFileUploadHandler,
+)
+from django.template.defaultfilters import filesizeformat
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from .constants import IMAGE_UPLOAD_FIELDS
+
+# Сигнатуры форматов: (смещение, байты) -> MIME-тип.
+IMAGE_SIGNATURES = (
+    (((0, b'\xff\xd8\xff'),), 'image/jpeg'),
+    (((0, b'\x89PNG\r\n\x1a\n'),), 'image/png'),
+    (((0, b'GIF87a'),), 'image/gif'),
+    (((0, b'GIF89a'),), 'image/gif'),
+    (((0, b'RIFF'), (8, b'WEBP')), 'image/webp'),
+)
+SNIFF_SIZE = 12
+WRONG_TYPE_ERROR = 'Загрузите изображение в формате JPEG, PNG, GIF или WebP.'
+
+
+def sniff_image_type(head):
+    """MIME-тип изображения по первым байтам файла или None."""
+    for parts, content_type in IMAGE_SIGNATURES:
+        if all(
+            head[offset:offset + len(magic)] == magic
+            for offset, magic in parts
+        ):
+            return content_type
+    return None
+
+
+def too_large_error():
+    return (
+        'Файл слишком большой: не больше '
+        f'{filesizeformat(settings.IMAGE_UPLOAD_MAX_SIZE)}.'
+    )
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """Принимает изображения потоком с лимитом размера и проверкой типа.
+
+    Готовый файл получает `content_type` по содержимому, а не со слов
+    клиента. Файлы других полей передаются следующим обработчикам без
+    изменений.
+    """
+
+    def handle_raw_input(
+            self, input_data, meta, content_length, boundary,
+            encoding=None):
+        # Тело не отклоняем целиком по Content-Length: тогда пропал бы и
+        # CSRF-токен из полей формы, а пользователь увидел бы ошибку CSRF
+        # вместо понятной ошибки размера. Файл обрывается на лимите ниже.
+        self.request.upload_errors = []
+
+    def new_file(self, field_name, *args, **kwargs):
+        self.active = field_name in IMAGE_UPLOAD_FIELDS
+        if not self.active:
+            return
+        super().new_file(field_name, *args, **kwargs)
+        if (
+            self.content_length is not None
+            and self.content_length > settings.IMAGE_UPLOAD_MAX_SIZE
+        ):
+            self.reject(field_name, too_large_error())
+            raise StopUpload(connection_reset=True)
+        self.size = 0
+        self.head = b''
+        self.sniffed_type = None
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        self.size += len(raw_data)
+        if self.size > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.reject(self.field_name, too_large_error())
+            raise StopUpload(connection_reset=True)
+        if self.sniffed_type is None:
+            self.head += raw_data[:SNIFF_SIZE - len(self.head)]
+            if len(self.head) == SNIFF_SIZE:
+                self.check_type()
+        super().receive_data_chunk(raw_data, start)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        uploaded = super().file_complete(file_size)
+        if self.sniffed_type is None:
+            # Файл короче SNIFF_SIZE байт.
+            self.sniffed_type = sniff_image_type(self.head)
+            if self.sniffed_type is None:
+                self.reject(self.field_name, WRONG_TYPE_ERROR)
+        uploaded.content_type = self.sniffed_type
+        return uploaded
+
+    def check_type(self):
+        self.sniffed_type = sniff_image_type(self.head)
+        if self.sniffed_type is None:
+            self.reject(self.field_name, WRONG_TYPE_ERROR)
+            # Остаток файла не читаем: SkipFile дочитал бы его до конца.
+            raise StopUpload(connection_reset=True)
+
+    def reject(self, field_name, message):
+        self.request.upload_errors.append((field_name, message))
+
+
+def stream_images(view):
+    """Принимает изображения для view через ImageUploadHandler.
+
+    Обработчики нельзя менять после чтения request.POST, а его читает
+    CsrfViewMiddleware. Поэтому middleware пропускает view, а CSRF
+    проверяется уже после подмены обработчиков.
+    """
+    protected_view = csrf_protect(view)
+
+    @csrf_exempt
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        request.upload_handlers.insert(0, ImageUploadHandler(request))
+        return protected_view(request, *args, **kwargs)
+    return wrapper
+
+
+def add_upload_errors(request, form):
+    """Добавляет в привязанную форму ошибки, найденные при загрузке."""
+    errors = getattr(request, 'upload_errors', None)
+    if not errors or not form.is_bound:
+        return
+    # add_error работает с уже очищенной формой. Ошибку загрузки
+    # показываем вместо ошибок поля от валидаторов: они о том же файле.
+    form.full_clean()
+    for field_name, message in errors:
+        if field_name not in form.fields:
+            field_name = None
+        form.errors.pop(field_name, None)
+        form.add_error(field_name, message)
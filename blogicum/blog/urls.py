@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 
 app_name = 'blog'
@@ -11,6 +11,11 @@ urlpatterns = [
         views.index,
         name='index'
     ),
+    path(
+        'popular/',
+        views.popular,
+        name='popular'
+    ),
     path(
         'posts/<int:post_id>/',
         views.PostDetailView.as_view(),
@@ -25,6 +30,11 @@ urlpatterns = [
         views.ProfileDetailView.as_view(),
         name='profile'
     ),
+    path(
+        'locations/autocomplete/',
+        views.location_autocomplete,
+        name='location_autocomplete'
+    ),
     path(
         'edit_profile/',
         views.edit_profile,
@@ -59,4 +69,49 @@ urlpatterns = [
         views.edit_post,
         name='edit_post'
     ),
+    path(
+        'feed/rss/',
+        feeds.LatestPostsFeed(),
+        name='feed_rss'
+    ),
+    path(
+        'feed/atom/',
+        feeds.LatestPostsAtomFeed(),
+        name='feed_atom'
+    ),
+    path(
+        'category/<slug:category_slug>/rss/',
+        feeds.CategoryPostsFeed(),
+        name='category_feed_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.CategoryPostsAtomFeed(),
+        name='category_feed_atom'
+    ),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.AuthorPostsFeed(),
+        name='profile_feed_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.AuthorPostsAtomFeed(),
+        name='profile_feed_atom'
+    ),
+    path(
+        'sitemap.xml',
+        views.sitemap_index,
+        name='sitemap'
+    ),
+    path(
+        'sitemap-<slug:section>-<int:number>.xml',
+        views.sitemap_chunk,
+        name='sitemap_chunk'
+    ),
+    path(
+        'export/<slug:model>/',
+        views.export,
+        name='export'
+    ),
 ]
@@ -1,67 +1,146 @@
+from itertools import chain
+
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.views.generic import DetailView, ListView
 
-from .constants import PAGINATION_COUNT_POST_PER_PAGE
+from .constants import (
+    LOCATION_AUTOCOMPLETE_LIMIT,
+    PAGINATION_COUNT_POST_PER_PAGE,
+)
+from .counters import view_counter
+from .deletion import schedule_post_deletion
+from .export import EXPORT_FIELDS, iter_export
 from .forms import CommentForm, PostForm, ProfileEditForm
-from .models import Category, Comment, Post, User
+from .holes import shared_page
+from .models import ArchivedPost, Category, Comment, Location, Post, User
+from .sitemaps import SECTIONS, get_chunk_path, render_index
+from .related import get_related_posts
+from .stats import get_author_stats
+from .trending import get_popular_posts
+from .uploads import add_upload_errors, stream_images
 from .services import (
+    QuerySetChain,
     annotate_posts,
+    get_template_engine,
     posts_filter_by_publish,
     paginate_queryset
 )
 
 
-class ProfileDetailView(ListView):
+class TemplateEngineMixin:
+    """Выбирает шаблонный движок по настройке JINJA2_VIEWS."""
+
+    @property
+    def template_engine(self):
+        match = self.request.resolver_match
+        return get_template_engine(match.view_name if match else None)
+
+
+class ProfileDetailView(TemplateEngineMixin, ListView):
     model = User
     template_name = 'blog/profile.html'
     paginate_by = PAGINATION_COUNT_POST_PER_PAGE
 
     def get_queryset(self):
-        author = self.get_author()
-        queryset = author.posts.all()
-        queryset = annotate_posts(queryset)
-        if self.request.user != author:
-            queryset = posts_filter_by_publish(queryset)
-        return queryset
+        author = self.author
+        is_owner = self.request.user == author
+        querysets = []
+        # Архивные посты старше живых, поэтому идут после них.
+        for posts in (author.posts.all(), author.archived_posts.all()):
+            posts = annotate_posts(posts)
+            if not is_owner:
+                posts = posts_filter_by_publish(posts)
+            querysets.append(posts)
+        if is_owner:
+            counts = [self.stats.post_count, self.stats.archived_post_count]
+        else:
+            counts = [
+                self.stats.published_post_count,
+                self.stats.published_archived_post_count,
+            ]
+        return QuerySetChain(*querysets, counts=counts)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = self.get_author()
+        context['profile'] = self.author
+        context['stats'] = self.stats
         return context
 
-    def get_author(self):
+    @cached_property
+    def author(self):
         return get_object_or_404(User, username=self.kwargs['username'])
 
+    @cached_property
+    def stats(self):
+        return get_author_stats(self.author)
+
 
-class PostDetailView(DetailView):
+@method_decorator(shared_page, name='dispatch')
+class PostDetailView(TemplateEngineMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
+    context_object_name = 'post'
+    # Неопубликованный пост видит только автор, такую страницу не кешируем.
+    is_private = False
 
     def get_object(self):
-        post = get_object_or_404(Post, pk=self.kwargs.get('post_id'))
+        post_id = self.kwargs.get('post_id')
+        model = Post
+        post = Post.objects.filter(pk=post_id).first()
+        if post is None:
+            model = ArchivedPost
+            post = get_object_or_404(ArchivedPost, pk=post_id)
         if self.request.user == post.author:
+            self.is_private = not posts_filter_by_publish(
+                model.objects.filter(pk=post.pk)
+            ).exists()
             return post
         return get_object_or_404(
-            posts_filter_by_publish(Post.objects.all()),
-            pk=self.kwargs.get('post_id')
+            posts_filter_by_publish(model.objects.all()),
+            pk=post_id
         )
 
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        response.private = self.is_private
+        if not self.object.is_archived:
+            view_counter.add(self.object.pk)
+            response.counted_post_id = self.object.pk
+        return response
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
         context['comments'] = self.object.comments.select_related(
             'author'
         )
+        context['related_posts'] = (
+            [] if self.object.is_archived
+            else get_related_posts(self.object)
+        )
         return context
 
 
+@stream_images
 @login_required
 def edit_post(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = PostForm(request.POST or None, request.FILES or None, instance=post)
     if request.user != post.author:
         return redirect('blog:post_detail', post_id=post_id)
+    add_upload_errors(request, form)
     if form.is_valid():
         post = form.save()
         return redirect('blog:post_detail', post_id=post.id)
@@ -117,18 +196,19 @@ def delete_comment(request, post_id, comment_id):
 @login_required
 def delete_post(request, post_id):
     post = get_object_or_404(Post, id=post_id)
-    form = PostForm(request.POST or None, instance=post)
     if request.user != post.author:
         return redirect('blog:post_detail', post_id=post_id)
     if request.method == 'POST':
-        post.delete()
+        schedule_post_deletion(post)
         return redirect('blog:profile', username=request.user.username)
-    return render(request, 'blog/create.html', {'form': form})
+    return render(request, 'blog/create.html', {'post': post})
 
 
+@stream_images
 @login_required
 def create_post(request):
     form = PostForm(request.POST or None, request.FILES)
+    add_upload_errors(request, form)
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
@@ -137,6 +217,7 @@ def create_post(request):
     return render(request, 'blog/create.html', {'form': form})
 
 
+@shared_page
 def index(request):
     post_list = posts_filter_by_publish(
         Post.objects.all()
@@ -148,10 +229,23 @@ def index(request):
         'blog/index.html',
         {
             'page_obj': page_obj
-        }
+        },
+        using=get_template_engine('blog:index')
+    )
+
+
+def popular(request):
+    return render(
+        request,
+        'blog/popular.html',
+        {
+            'post_list': get_popular_posts()
+        },
+        using=get_template_engine('blog:popular')
     )
 
 
+@shared_page
 def category_posts(request, category_slug: str):
     category = get_object_or_404(
         Category,
@@ -168,10 +262,25 @@ def category_posts(request, category_slug: str):
         {
             'category': category,
             'page_obj': page_obj
-        }
+        },
+        using=get_template_engine('blog:category_posts')
     )
 
 
+@login_required
+def location_autocomplete(request):
+    locations = Location.objects.filter(is_published=True)
+    term = request.GET.get('q', '').strip()
+    if term:
+        locations = locations.filter(name__icontains=term)
+    return JsonResponse({'results': [
+        {'id': pk, 'text': name}
+        for pk, name in locations.order_by('name').values_list(
+            'pk', 'name'
+        )[:LOCATION_AUTOCOMPLETE_LIMIT]
+    ]})
+
+
 @login_required
 def edit_profile(request):
     form = ProfileEditForm(request.POST or None, instance=request.user)
@@ -179,3 +288,49 @@ def edit_profile(request):
         form.save()
         return redirect('blog:profile', username=request.user)
     return render(request, 'blog/user.html', {'form': form})
+
+
+def sitemap_index(request):
+    return HttpResponse(
+        render_index(request), content_type='application/xml'
+    )
+
+
+def sitemap_chunk(request, section, number):
+    section = SECTIONS.get(section)
+    if section is None or number >= section.chunk_count():
+        raise Http404('Такой части карты сайта нет.')
+    return FileResponse(
+        open(get_chunk_path(request, section, number), 'rb'),
+        content_type='application/xml',
+    )
+
+
+@staff_member_required
+def export(request, model):
+    if model not in EXPORT_FIELDS:
+        raise Http404('Такой выгрузки нет.')
+    export_format = request.GET.get('format', 'jsonl')
+    try:
+        lines = iter_export(
+            model,
+            export_format,
+            since=request.GET.get('since'),
+            until=request.GET.get('until'),
+            category=request.GET.get('category'),
+        )
+        # Генератор проверяет аргументы при первом шаге.
+        first_line = next(lines, '')
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    content_type = (
+        'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    )
+    response = StreamingHttpResponse(
+        chain([first_line], lines),
+        content_type=f'{content_type}; charset=utf-8',
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{model}.{export_format}"'
+    )
+    return response
@@ -0,0 +1,42 @@
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    """Select для ModelChoiceField с подсказками с сервера.
+
+    В разметку попадает только выбранный вариант, остальные подгружает
+    скрипт по мере ввода из JSON-view url_name: `{"results": [{"id",
+    "text"}]}`. Поэтому форма не читает из базы весь справочник.
+    """
+
+    template_name = 'blog/widgets/autocomplete_select.html'
+
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['autocomplete_url'] = reverse(self.url_name)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        iterator = self.choices
+        choices = []
+        if iterator.field.empty_label is not None:
+            choices.append(('', iterator.field.empty_label))
+        selected = [pk for pk in value if pk]
+        try:
+            choices.extend(
+                iterator.choice(obj)
+                for obj in iterator.queryset.filter(pk__in=selected)
+            )
+        except ValueError:
+            # Некорректное значение из формы с ошибками.
+            pass
+        self.choices = choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = iterator
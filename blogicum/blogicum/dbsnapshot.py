@@ -0,0 +1,65 @@
+"""Снимки смигрированной базы SQLite.
+
+Пустая база — тестовая или новой установки — не прогоняет все миграции,
+а копирует готовый снимок через backup API SQLite. Снимок называется
+хешем файлов всех миграций и версии Django, поэтому после любой новой
+миграции он создаётся заново при первом `migrate` в пустую базу.
+"""
+import hashlib
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db.migrations.loader import MigrationLoader
+
+
+def migrations_key():
+    digest = hashlib.sha256(django.get_version().encode())
+    for app_config in apps.get_app_configs():
+        digest.update(app_config.label.encode())
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    for key, migration in sorted(loader.disk_migrations.items()):
+        digest.update(repr(key).encode())
+        module = sys.modules[type(migration).__module__]
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def snapshot_path():
+    return Path(settings.DB_SNAPSHOT_DIR) / f'{migrations_key()}.sqlite3'
+
+
+def can_use_snapshot(connection):
+    """Снимок подходит только пустой базе SQLite."""
+    return (
+        settings.DB_SNAPSHOT_DIR is not None
+        and connection.vendor == 'sqlite'
+        and not connection.introspection.table_names()
+    )
+
+
+def save_snapshot(connection, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Через временный файл, чтобы параллельный запуск не прочитал
+    # недописанный снимок.
+    temporary = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    connection.ensure_connection()
+    target = sqlite3.connect(temporary)
+    try:
+        connection.connection.backup(target)
+    finally:
+        target.close()
+    os.replace(temporary, path)
+
+
+def restore_snapshot(connection, path):
+    connection.ensure_connection()
+    source = sqlite3.connect(path)
+    try:
+        source.backup(connection.connection)
+    finally:
+        source.close()
@@ -0,0 +1,81 @@
+"""Хеширование паролей в отдельном пуле процессов.
+
+PBKDF2 занимает процессор на сотни миллисекунд. Чтобы волна логинов
+не занимала потоки, обслуживающие ленту, хеш считается в ограниченном
+пуле процессов, а число ожидающих задач ограничено: при переполнении
+запрос сразу получает 503 (см. PasswordHashingBusyMiddleware).
+"""
+import base64
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_lock = threading.Lock()
+_pool = None
+_slots = None
+
+
+class PasswordHashingBusy(Exception):
+    """Очередь на хеширование переполнена."""
+
+
+def pbkdf2_base64(password, salt, iterations, digest_name):
+    digest = hashlib.pbkdf2_hmac(
+        digest_name, password.encode(), salt.encode(), iterations
+    )
+    return base64.b64encode(digest).decode('ascii').strip()
+
+
+def get_pool():
+    global _pool, _slots
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+            _slots = threading.BoundedSemaphore(
+                settings.PASSWORD_HASHING_QUEUE_LIMIT
+            )
+    return _pool, _slots
+
+
+@receiver(setting_changed)
+def reset_pool(setting, **kwargs):
+    global _pool, _slots
+    if not setting.startswith('PASSWORD_HASHING_'):
+        return
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = _slots = None
+
+
+def run_hashing(*args):
+    """Считает хеш в пуле, если пул включён, иначе — в текущем потоке."""
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return pbkdf2_base64(*args)
+    pool, slots = get_pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT):
+        raise PasswordHashingBusy()
+    try:
+        return pool.submit(pbkdf2_base64, *args).result()
+    finally:
+        slots.release()
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256, совместимый со стандартными хешами Django."""
+
+    def encode(self, password, salt, iterations=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        iterations = iterations or self.iterations
+        hash = run_hashing(password, salt, iterations, self.digest().name)
+        return '%s$%d$%s$%s' % (self.algorithm, iterations, salt, hash)
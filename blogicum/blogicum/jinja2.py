@@ -0,0 +1,49 @@
+"""Окружение Jinja2 для «горячих» шаблонов блога.
+
+Шаблоны лежат в `jinja2/` и повторяют разметку `templates/`. Бэкенд
+используется для view из настройки JINJA2_VIEWS.
+"""
+from django.template import defaultfilters
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.timezone import template_localtime
+from django_bootstrap5.templatetags.django_bootstrap5 import (
+    bootstrap_button,
+    bootstrap_css,
+    bootstrap_form,
+)
+from jinja2 import Environment, pass_context
+
+from blog.holes import punch_hole
+
+
+def url(viewname, *args, **kwargs):
+    return reverse(viewname, args=args, kwargs=kwargs)
+
+
+def date(value, arg=None):
+    # Django-шаблоны переводят время в текущий часовой пояс до фильтра.
+    return defaultfilters.date(template_localtime(value), arg)
+
+
+@pass_context
+def hole(context, name, **params):
+    return punch_hole(context.get('request'), name, params, using='jinja2')
+
+
+def environment(**options):
+    env = Environment(**options)
+    env.globals.update({
+        'url': url,
+        'hole': hole,
+        'static': static,
+        'bootstrap_css': bootstrap_css,
+        'bootstrap_form': bootstrap_form,
+        'bootstrap_button': bootstrap_button,
+    })
+    env.filters.update({
+        'date': date,
+        'truncatewords': defaultfilters.truncatewords,
+        'linebreaksbr': defaultfilters.linebreaksbr,
+    })
+    return env
@@ -0,0 +1,168 @@
+"""Отдача пользовательских файлов из MEDIA_ROOT.
+
+В продакшене передачу файла берёт на себя фронт-прокси: view только
+проверяет путь и заголовки и возвращает `X-Accel-Redirect` (nginx) или
+`X-Sendfile` (Apache/lighttpd). Без прокси файл отдаётся через
+`FileResponse`, который WSGI-сервер может передать через `sendfile`.
+"""
+import mimetypes
+import os
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """Файловый объект, ограниченный диапазоном байтов."""
+
+    def __init__(self, path, start, length):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = length
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b''
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+def parse_range(header, size):
+    """Разбирает заголовок Range.
+
+    Возвращает пару (start, end) включительно, None — если заголовок
+    не поддерживается и нужно отдать файл целиком, и исключение
+    ValueError — если диапазон невыполним.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError(header)
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, min(end, size - 1)
+
+
+def get_etag(stat):
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def range_is_fresh(request, etag, last_modified):
+    """Проверяет If-Range: диапазон отдаётся только для той же версии."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def sendfile_response(path, relative_path):
+    """Ответ, передающий отдачу файла фронт-прокси."""
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    response = HttpResponse()
+    if backend == 'nginx':
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX + relative_path
+        )
+    elif backend == 'sendfile':
+        response['X-Sendfile'] = str(path)
+    else:
+        return None
+    # Тип и длину выставит прокси.
+    del response['Content-Type']
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Отдаёт файл из MEDIA_ROOT с поддержкой Range и условных запросов."""
+    try:
+        full_path = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404('Файл не найден.')
+    try:
+        stat = full_path.stat()
+    except OSError:
+        raise Http404('Файл не найден.')
+    if not full_path.is_file():
+        raise Http404('Файл не найден.')
+
+    etag = get_etag(stat)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is not None:
+        return response
+
+    relative_path = Path(
+        os.path.relpath(full_path, os.path.abspath(settings.MEDIA_ROOT))
+    ).as_posix()
+    response = sendfile_response(full_path, relative_path)
+    if response is None:
+        response = file_response(request, full_path, stat, etag,
+                                 last_modified)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    if settings.MEDIA_CACHE_MAX_AGE:
+        response['Cache-Control'] = (
+            f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+        )
+    return response
+
+
+def file_response(request, full_path, stat, etag, last_modified):
+    """Отдаёт файл или его диапазон силами Django."""
+    size = stat.st_size
+    content_type, _ = mimetypes.guess_type(str(full_path))
+    content_type = content_type or 'application/octet-stream'
+    header = request.META.get('HTTP_RANGE')
+    byte_range = None
+    if header and range_is_fresh(request, etag, last_modified):
+        try:
+            byte_range = parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    if byte_range is None:
+        response = FileResponse(
+            open(full_path, 'rb'), content_type=content_type
+        )
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            FileRange(full_path, start, length),
+            content_type=content_type,
+            status=206,
+        )
+        response['Content-Length'] = length
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
@@ -0,0 +1,224 @@
+import hashlib
+import re
+import zlib
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import (
+    cc_delim_re,
+    has_vary_header,
+    patch_vary_headers,
+)
+from django.utils.deprecation import MiddlewareMixin
+
+from .hashers import PasswordHashingBusy
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml',
+    'application/atom+xml',
+    'application/rss+xml',
+    'image/svg+xml',
+)
+# Бэкенды, записанные в сессии до перехода на CachedModelBackend.
+LEGACY_AUTH_BACKENDS = ('django.contrib.auth.backends.ModelBackend',)
+ACCEPT_ENCODING_RE = re.compile(r'\s*([\w*]+)\s*(?:;\s*q=([\d.]+))?\s*')
+
+
+def accepted_encodings(header):
+    """Возвращает множество кодировок из Accept-Encoding с q > 0."""
+    encodings = set()
+    for part in header.split(','):
+        match = ACCEPT_ENCODING_RE.fullmatch(part)
+        if not match:
+            continue
+        name, quality = match.groups()
+        try:
+            if quality is not None and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(name.lower())
+    return encodings
+
+
+def choose_encoding(request):
+    """Выбирает лучшую кодировку из поддерживаемых клиентом."""
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if brotli is not None and settings.COMPRESSION_BROTLI and (
+        'br' in accepted
+    ):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress_bytes(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_LEVEL)
+    compressor = zlib.compressobj(
+        settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    """Сжимает поток по частям.
+
+    Компрессор сбрасывается, когда с прошлого сброса набралось
+    COMPRESSION_STREAM_FLUSH_SIZE байт входа: клиент получает данные по
+    ходу ответа, а мелкие чанки (строки выгрузки) не портят сжатие
+    сбросом после каждого.
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(
+            quality=settings.COMPRESSION_BROTLI_LEVEL
+        )
+        compress, flush = compressor.process, compressor.flush
+        finish = compressor.finish
+    else:
+        compressor = zlib.compressobj(
+            settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED,
+            16 + zlib.MAX_WBITS
+        )
+        compress, finish = compressor.compress, compressor.flush
+
+        def flush():
+            return compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    pending = 0
+    for chunk in chunks:
+        data = compress(chunk)
+        pending += len(chunk)
+        if pending >= settings.COMPRESSION_STREAM_FLUSH_SIZE:
+            data += flush()
+            pending = 0
+        if data:
+            yield data
+    yield finish()
+
+
+def is_shareable(response):
+    """Можно ли отдать тело ответа другому пользователю.
+
+    Ответ, зависящий от cookie, ставящий cookie или закрытый Cache-Control
+    (страницы с CSRF-токеном, личные данные), не должен попадать в общий
+    кеш.
+    """
+    if response.cookies or has_vary_header(response, 'Cookie'):
+        return False
+    directives = {
+        directive.split('=')[0].strip().lower()
+        for directive in cc_delim_re.split(response.get('Cache-Control', ''))
+    }
+    return not directives & {'private', 'no-store'}
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Сжимает текстовые ответы gzip или brotli.
+
+    Сжатые тела общих ответов (см. is_shareable) кешируются по хешу
+    содержимого, поэтому одинаковый HTML (например, из кеша страниц)
+    не сжимается заново на каждый запрос.
+    """
+
+    def process_response(self, request, response):
+        if not self.is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding
+            )
+            del response['Content-Length']
+        else:
+            if is_shareable(response):
+                compressed = self.compress_cached(response.content, encoding)
+            else:
+                compressed = compress_bytes(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def is_compressible(response):
+        if response.has_header('Content-Encoding'):
+            return False
+        if response.status_code in (204, 206, 304):
+            return False
+        if response.has_header('X-Accel-Redirect') or response.has_header(
+            'X-Sendfile'
+        ):
+            return False
+        content_type = response.get('Content-Type', '').lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        if not response.streaming and (
+            len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return False
+        return True
+
+    @staticmethod
+    def compress_cached(content, encoding):
+        if settings.COMPRESSION_CACHE_ALIAS is None:
+            return compress_bytes(content, encoding)
+        cache = caches[settings.COMPRESSION_CACHE_ALIAS]
+        key = 'compressed:{}:{}'.format(
+            encoding, hashlib.blake2b(content, digest_size=16).hexdigest()
+        )
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = compress_bytes(content, encoding)
+            cache.set(key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+        return compressed
+
+
+class PasswordHashingBusyMiddleware(MiddlewareMixin):
+    """Отвечает 503, если очередь на хеширование паролей переполнена."""
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, PasswordHashingBusy):
+            return None
+        response = HttpResponse(
+            'Сервис перегружен, попробуйте войти позже.', status=503
+        )
+        response['Retry-After'] = str(settings.PASSWORD_HASHING_RETRY_AFTER)
+        return response
+
+
+class LegacySessionBackendMiddleware(MiddlewareMixin):
+    """Переводит старые сессии на первый бэкенд AUTHENTICATION_BACKENDS.
+
+    Django читает пользователя сессии только через бэкенд, записанный в
+    ней, и только если он есть в AUTHENTICATION_BACKENDS. Держать там
+    ModelBackend ради старых сессий нельзя: authenticate() перебирает все
+    бэкенды, и каждый неудачный вход хешировал бы пароль дважды.
+    """
+
+    def process_request(self, request):
+        session = request.session
+        if session.get(BACKEND_SESSION_KEY) in LEGACY_AUTH_BACKENDS:
+            session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
@@ -0,0 +1,151 @@
+"""Профилирование отдельных запросов.
+
+Профиль снимается для запросов с заголовком `X-Profile`, совпадающим с
+PROFILING_TOKEN, и для доли PROFILING_SAMPLE_RATE всех остальных запросов.
+Каждая запись — строка JSON в PROFILING_FILE с ротацией по размеру.
+"""
+import contextvars
+import cProfile
+import json
+import logging
+import pstats
+import random
+import time
+from contextlib import ExitStack
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template.base import Template
+from django.utils.crypto import constant_time_compare
+
+current_record = contextvars.ContextVar('profiling_record', default=None)
+
+logger = logging.getLogger('blogicum.profiling')
+logger.propagate = False
+
+_original_template_render = Template.render
+
+
+def _profiled_template_render(self, context):
+    record = current_record.get()
+    if record is None or record['template_depth']:
+        return _original_template_render(self, context)
+    # Учитываем только внешний шаблон: include/extends уже внутри него.
+    record['template_depth'] += 1
+    start = time.perf_counter()
+    try:
+        return _original_template_render(self, context)
+    finally:
+        record['template_time'] += time.perf_counter() - start
+        record['template_depth'] -= 1
+
+
+def get_logger():
+    if not logger.handlers:
+        path = Path(settings.PROFILING_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=settings.PROFILING_MAX_BYTES,
+            backupCount=settings.PROFILING_BACKUP_COUNT,
+            encoding='utf-8',
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+    return logger
+
+
+def top_stats(profiler, limit):
+    """Возвращает самые тяжёлые функции по накопленному времени."""
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, name), values in stats.stats.items():
+        _, ncalls, tottime, cumtime, _ = values
+        rows.append({
+            'function': f'{filename}:{line}({name})',
+            'ncalls': ncalls,
+            'tottime': round(tottime, 6),
+            'cumtime': round(cumtime, 6),
+        })
+    rows.sort(key=lambda row: row['cumtime'], reverse=True)
+    return rows[:limit]
+
+
+class ProfilingMiddleware:
+    """Снимает SQL, время шаблонов и view и cProfile для выбранных запросов."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        Template.render = _profiled_template_render
+
+    def should_profile(self, request):
+        token = settings.PROFILING_TOKEN
+        header = request.META.get('HTTP_X_PROFILE')
+        if token and header and constant_time_compare(header, token):
+            return True
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        record = {
+            'sql_count': 0,
+            'sql_time': 0.0,
+            'template_time': 0.0,
+            'template_depth': 0,
+            'view_time': 0.0,
+        }
+        token = current_record.set(record)
+
+        def sql_wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                record['sql_count'] += 1
+                record['sql_time'] += time.perf_counter() - start
+
+        profiler = cProfile.Profile()
+        request._profiling_record = record
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(sql_wrapper)
+                    )
+                profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.disable()
+        finally:
+            current_record.reset(token)
+        end = time.perf_counter()
+        if 'view_start' in record:
+            record['view_time'] = end - record.pop('view_start')
+
+        match = request.resolver_match
+        del record['template_depth']
+        record.update({
+            'view': match.view_name if match else None,
+            'path': request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'timestamp': time.time(),
+            'total_time': end - start,
+            'profile': top_stats(profiler, settings.PROFILING_STATS_LIMIT),
+        })
+        get_logger().info(json.dumps(record, ensure_ascii=False))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Middleware стоит последним, поэтому дальше вызывается только view.
+        record = getattr(request, '_profiling_record', None)
+        if record is not None:
+            record['view_start'] = time.perf_counter()
@@ -1,3 +1,5 @@
+import os
+from importlib.util import find_spec
 from pathlib import Path
 
 
@@ -12,6 +14,7 @@ ALLOWED_HOSTS = ['localhost', '127.0.0.1']
 INSTALLED_APPS = [
     'pages.apps.PagesConfig',
     'blog.apps.BlogConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -23,13 +26,16 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blogicum.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
+    'blogicum.middleware.LegacySessionBackendMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'blogicum.middleware.PasswordHashingBusyMiddleware',
+    'blogicum.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -50,7 +56,30 @@ TEMPLATES = [
     },
 ]
 
+# Jinja2 подключается, только если установлен пакет `jinja2`.
+if find_spec('jinja2') is not None:
+    TEMPLATES.append({
+        'NAME': 'jinja2',
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [BASE_DIR / 'jinja2'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'blogicum.jinja2.environment',
+            'context_processors': TEMPLATES[0]['OPTIONS']['context_processors'],
+        },
+    })
+# Имена view, страницы которых рендерятся через Jinja2.
+JINJA2_VIEWS = ()
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
+# Прогрев импортов, шаблонов и URL в wsgi.py/asgi.py (blogicum.warmup).
+# Включается только при запуске сервера переменной окружения, например
+# `gunicorn --preload -e WARMUP_ON_START=1`: runserver, команды и тесты
+# тоже импортируют wsgi.py, и им прогрев и gc.freeze() не нужны.
+WARMUP_ON_START = os.environ.get('WARMUP_ON_START') == '1'
+# Бюджет холодного старта воркера в секундах: импорт wsgi.py с прогревом.
+# import_times предупреждает, если старт его превышает.
+COLD_START_BUDGET = 3
 
 DATABASES = {
     'default': {
@@ -59,6 +88,61 @@ DATABASES = {
     }
 }
 
+# В продакшене с несколькими воркерами нужен общий кеш (memcached, redis):
+# сессии и пользователи кешируются, а локальный кеш у каждого процесса свой.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Сессии читаются из кеша и записываются в кеш и в базу.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Сессии, созданные до кеширования, переводит на кеширующий бэкенд
+# blogicum.middleware.LegacySessionBackendMiddleware.
+AUTHENTICATION_BACKENDS = ['blog.backends.CachedModelBackend']
+USER_CACHE_TIMEOUT = 60 * 15
+# Ленты RSS/Atom сбрасываются при изменении постов и комментариев,
+# а это — верхняя граница времени жизни кеша.
+FEED_CACHE_TIMEOUT = 60 * 60
+# Лента, категории и страницы постов кешируются целиком, общие для всех
+# посетителей; персональные фрагменты дорисовываются на каждый запрос.
+# Кеш сбрасывается вместе с лентами, 0 — отключить.
+SHARED_PAGE_CACHE_TIMEOUT = 60 * 5
+# Список категорий в форме поста. Изменение категории сбрасывает кеш только
+# в своём процессе, остальные воркеры увидят его не позже этого срока.
+POST_FORM_CHOICES_CACHE_TIMEOUT = 60
+# Каталог с готовыми частями карты сайта.
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+# Файл SQLite со старыми постами, подключается через ATTACH DATABASE.
+ARCHIVE_DATABASE = BASE_DIR / 'archive.sqlite3'
+# Снимки только что смигрированной базы SQLite: `migrate` в пустую базу
+# (в том числе тестовую) копирует снимок вместо прогона миграций.
+# None — всегда прогонять миграции.
+DB_SNAPSHOT_DIR = BASE_DIR / 'db_snapshots'
+
+PASSWORD_HASHERS = [
+    'blogicum.hashers.PooledPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+# Размер пула процессов для PBKDF2; 0 — хешировать в потоке запроса.
+PASSWORD_HASHING_WORKERS = 2
+# Сколько хеширований может ждать или выполняться одновременно в процессе.
+PASSWORD_HASHING_QUEUE_LIMIT = 8
+PASSWORD_HASHING_QUEUE_TIMEOUT = 2
+PASSWORD_HASHING_RETRY_AFTER = 5
+
+# Просмотры постов копятся в памяти процесса и записываются одним UPDATE,
+# когда накопится VIEW_COUNTER_MAX_PENDING просмотров или пройдёт
+# VIEW_COUNTER_FLUSH_INTERVAL секунд (проверяет фоновый поток процесса).
+# При падении процесса или недоступной базе теряется не больше
+# VIEW_COUNTER_MAX_PENDING просмотров.
+VIEW_COUNTER_MAX_PENDING = 100
+VIEW_COUNTER_FLUSH_INTERVAL = 10
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -97,6 +181,41 @@ INTERNAL_IPS = [
 ]
 
 MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_URL = '/media/'
+# Изображения постов в формах блога принимаются потоком с проверкой типа
+# и лимитом размера (blog.uploads.stream_images).
+IMAGE_UPLOAD_MAX_SIZE = 5 * 1024 * 1024
+
+# None — файлы отдаёт Django через FileResponse;
+# 'nginx' — X-Accel-Redirect на internal-location MEDIA_ACCEL_REDIRECT_PREFIX;
+# 'sendfile' — X-Sendfile с абсолютным путём (Apache, lighttpd).
+MEDIA_SENDFILE_BACKEND = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24
+# Очередь изображений, ожидающих обработки после массового импорта;
+# миниатюры по ней делает команда process_images.
+IMAGE_TASK_QUEUE = BASE_DIR / 'queue' / 'images.jsonl'
+
+# Сжатие ответов: brotli используется, если установлен пакет `brotli`.
+COMPRESSION_MIN_SIZE = 512
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI = True
+COMPRESSION_BROTLI_LEVEL = 5
+# Потоковый ответ сбрасывается клиенту после стольких байт входа.
+COMPRESSION_STREAM_FLUSH_SIZE = 32 * 1024
+# Кеш для сжатых тел; None — сжимать на каждый запрос.
+COMPRESSION_CACHE_ALIAS = 'default'
+COMPRESSION_CACHE_TIMEOUT = 60 * 10
+
+# Профилирование запросов: по заголовку `X-Profile: <PROFILING_TOKEN>`
+# или для доли PROFILING_SAMPLE_RATE всех запросов.
+PROFILING_TOKEN = ''
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_FILE = BASE_DIR / 'profiling' / 'requests.jsonl'
+PROFILING_MAX_BYTES = 10 * 1024 * 1024
+PROFILING_BACKUP_COUNT = 5
+PROFILING_STATS_LIMIT = 30
+# Наибольший размер миниатюр из process_images.
 THUMBNAIL_SIZE = (400, 400)
 BASE_DIR = Path(__file__).resolve().parent.parent
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
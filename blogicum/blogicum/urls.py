@@ -1,11 +1,12 @@
 from django.contrib import admin
 from django.urls import include, path, reverse_lazy
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib.auth import views as auth_views
 from django.contrib.auth.forms import UserCreationForm
 from django.views.generic.edit import CreateView
 
+from blogicum.media import serve_media
+
 
 handler403 = 'pages.views.error_403'
 handler404 = 'pages.views.error_404'
@@ -29,6 +30,10 @@ urlpatterns = [
         ),
         name='registration',
     ),
+    path(
+        'api/',
+        include('api.urls')
+    ),
     path(
         'pages/',
         include('pages.urls')
@@ -42,10 +47,9 @@ urlpatterns = [
         'auth/',
         include('django.contrib.auth.urls')
     ),
+    path(
+        f'{settings.MEDIA_URL.lstrip("/")}<path:path>',
+        serve_media,
+        name='media'
+    ),
 ]
-
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL,
-        document_root=settings.MEDIA_ROOT
-    )
@@ -0,0 +1,168 @@
+"""Прогрев процесса до fork'а воркеров.
+
+Без прогрева каждый воркер на первых запросах сам импортирует ленивые
+модули (Pillow, django_bootstrap5, админку), компилирует шаблоны и строит
+URL-резолвер. `warm_up()` делает это один раз в wsgi.py/asgi.py: при
+`gunicorn --preload` — в мастере, и воркеры получают готовое через
+copy-on-write. В конце `gc.freeze()` убирает прогретые объекты из
+сборщика мусора, чтобы его проходы не трогали общие страницы памяти.
+"""
+import gc
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.template import (
+    TemplateDoesNotExist,
+    TemplateSyntaxError,
+    engines,
+)
+from django.template.backends.django import get_installed_libraries
+from django.urls import URLResolver, get_resolver
+from django.utils.module_loading import module_has_submodule
+
+logger = logging.getLogger(__name__)
+
+APP_SUBMODULES = ('models', 'admin', 'forms', 'views', 'urls', 'signals')
+# Модули, которые Django импортирует только при первом обращении.
+LAZY_MODULES = ('PIL.Image', 'django_bootstrap5.renderers')
+# Файлы в DIRS движков, которые считаются шаблонами.
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+# Время шагов последнего прогрева в секундах.
+timings = {}
+
+COLD_START_SCRIPT = (
+    'import json, time\n'
+    'start = time.perf_counter()\n'
+    'import blogicum.wsgi\n'
+    'from blogicum import warmup\n'
+    'total = time.perf_counter() - start\n'
+    'start = time.perf_counter()\n'
+    'warmup.first_use()\n'
+    'print(json.dumps({"total": total, "steps": warmup.timings, '
+    '"first_use": time.perf_counter() - start}))\n'
+)
+
+
+def import_modules():
+    # __import__, а не importlib.import_module: импорты через importlib
+    # не попадают в отчёт `-X importtime`.
+    for app_config in apps.get_app_configs():
+        for name in APP_SUBMODULES:
+            if module_has_submodule(app_config.module, name):
+                __import__(f'{app_config.name}.{name}')
+    for name in LAZY_MODULES:
+        __import__(name)
+    # Заодно импортирует библиотеки тегов всех приложений.
+    get_installed_libraries()
+
+
+def compile_templates():
+    """Компилирует шаблоны из DIRS всех движков.
+
+    Возвращает число скомпилированных шаблонов; ошибки только
+    логируются, чтобы один сломанный файл не мешал старту воркера.
+    """
+    count = 0
+    for engine in engines.all():
+        for directory in engine.dirs:
+            for root, _, files in os.walk(directory):
+                for filename in files:
+                    if not filename.endswith(TEMPLATE_EXTENSIONS):
+                        continue
+                    name = os.path.relpath(
+                        os.path.join(root, filename), directory
+                    ).replace(os.sep, '/')
+                    try:
+                        engine.get_template(name)
+                    except (
+                        TemplateSyntaxError,
+                        TemplateDoesNotExist,
+                        UnicodeDecodeError,
+                    ):
+                        logger.warning(
+                            'Шаблон %s не компилируется', name, exc_info=True
+                        )
+                    else:
+                        count += 1
+    return count
+
+
+def populate_resolvers(resolver=None):
+    """Строит таблицы reverse() корневого и вложенных резолверов."""
+    resolver = resolver or get_resolver()
+    resolver.reverse_dict
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            populate_resolvers(pattern)
+
+
+def warm_up():
+    """Прогревает процесс; возвращает время шагов в секундах."""
+    if timings:
+        return timings
+    for name, step in (
+        ('imports', import_modules),
+        ('templates', compile_templates),
+        ('urls', populate_resolvers),
+    ):
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+    gc.collect()
+    gc.freeze()
+    return timings
+
+
+def first_use():
+    """Работа, которую без прогрева делают первые запросы воркера."""
+    import_modules()
+    compile_templates()
+    populate_resolvers()
+
+
+def warm_up_on_start():
+    if settings.WARMUP_ON_START:
+        warm_up()
+
+
+def parse_importtime(lines):
+    """Строки `-X importtime` -> (модуль, своё мкс, с вложенными мкс)."""
+    modules = []
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        if not own.strip().isdigit():
+            # Строка заголовка.
+            continue
+        modules.append((name.strip(), int(own), int(cumulative)))
+    return modules
+
+
+def measure_cold_start():
+    """Импортирует wsgi.py с прогревом в новом процессе, как воркер.
+
+    Возвращает время старта, время шагов прогрева, время импорта модулей
+    и `first_use` — сколько после старта занимает работа первых запросов.
+    """
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    env['WARMUP_ON_START'] = '1'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', COLD_START_SCRIPT],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['modules'] = parse_importtime(result.stderr.splitlines())
+    return report
@@ -0,0 +1,86 @@
+import base64
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_post_list_keyset_pagination(
+        client, many_posts_with_published_locations):
+    seen = []
+    url = "/api/posts/?limit=4"
+    while url:
+        data = client.get(url).json()
+        seen.extend(post["id"] for post in data["results"])
+        url = data["next"]
+    assert len(seen) == len(set(seen)) == len(
+        many_posts_with_published_locations
+    )
+
+
+@pytest.mark.django_db
+def test_post_sparse_fields(client, post_with_published_location, comment):
+    with CaptureQueriesContext(connection) as ctx:
+        data = client.get("/api/posts/?fields=id,title").json()
+    post = data["results"][0]
+    assert set(post) == {"id", "title"}
+    assert '"text"' not in ctx.captured_queries[-1]["sql"]
+
+    post = client.get(
+        f"/api/posts/{post_with_published_location.id}/"
+    ).json()
+    assert post["comment_count"] == 0
+    assert post["author"] == post_with_published_location.author.username
+    assert post["image"].startswith("/media/")
+
+    response = client.get("/api/posts/?fields=unknown")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    response = client.get("/api/posts/?cursor=broken")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_comments_categories_profiles(
+        client, mixer, user, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    data = client.get(f"/api/posts/{post.id}/comments/?limit=2").json()
+    assert len(data["results"]) == 2
+    assert data["next"]
+    assert client.get(data["next"]).json()["next"] is None
+
+    slugs = [c["slug"] for c in client.get("/api/categories/").json()[
+        "results"]]
+    assert post.category.slug in slugs
+
+    profile = client.get(f"/api/profiles/{user.username}/").json()
+    assert profile["post_count"] == 1
+    assert "email" not in profile
+    response = client.get("/api/profiles/nobody/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_api_etag(client, post_with_published_location):
+    etag = client.get("/api/posts/")["ETag"]
+    response = client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("values", [
+    ["nope", 1],
+    ["2024-01-01T00:00:00+00:00", "abc"],
+    [None, None],
+    [{"a": 1}, 2],
+    ["2024-01-01T00:00:00+00:00"],
+    {"pub_date": 1},
+])
+def test_post_list_rejects_bad_cursor_values(
+        client, post_with_published_location, values):
+    cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+    response = client.get(f"/api/posts/?cursor={cursor}")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,87 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.utils.timezone import now
+
+from blog.archive import create_archive_schema
+from blog.export import iter_export
+from blog.models import ArchivedComment, ArchivedPost, Comment, Post
+
+
+@pytest.fixture
+def old_post(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now() - timedelta(days=400),
+    )
+    mixer.cycle(2).blend("blog.Comment", post=post, author=user)
+    return post
+
+
+@pytest.mark.django_db
+def test_archive_moves_old_posts(old_post, post_with_published_location):
+    call_command("archive_blog", days=365, batch_size=1)
+    assert not Post.objects.filter(pk=old_post.pk).exists()
+    assert not Comment.objects.filter(post_id=old_post.pk).exists()
+    archived = ArchivedPost.objects.get(pk=old_post.pk)
+    assert archived.title == old_post.title
+    assert archived.author == old_post.author
+    assert ArchivedComment.objects.filter(post=archived).count() == 2
+    assert Post.objects.filter(pk=post_with_published_location.pk).exists()
+
+
+@pytest.mark.django_db
+def test_archived_post_is_still_readable(
+        client, user_client, user, old_post, post_with_published_location):
+    call_command("archive_blog")
+    response = client.get(f"/posts/{old_post.pk}/")
+    assert response.status_code == HTTPStatus.OK
+    assert old_post.title in response.content.decode()
+    assert len(response.context["comments"]) == 2
+    assert "Оставить комментарий" not in user_client.get(
+        f"/posts/{old_post.pk}/"
+    ).content.decode()
+
+    response = client.get("/")
+    assert old_post.title not in response.content.decode()
+
+    response = client.get(f"/profile/{user.username}/")
+    posts = list(response.context["page_obj"])
+    assert [post.pk for post in posts][-1] == old_post.pk
+    assert posts[-1].comment_count == 2
+    assert response.context["page_obj"].paginator.count == 2
+
+
+@pytest.mark.django_db
+def test_archived_posts_are_exported_and_in_sitemap(
+        client, tmp_path, old_post, post_with_published_location):
+    call_command("archive_blog")
+    rows = [json.loads(line) for line in iter_export("posts", "jsonl")]
+    assert [row["id"] for row in rows] == [
+        old_post.pk, post_with_published_location.pk
+    ]
+    assert len(list(iter_export("comments", "jsonl"))) == 2
+
+    with override_settings(SITEMAP_ROOT=tmp_path):
+        assert "/sitemap-archived_posts-0.xml" in client.get(
+            "/sitemap.xml"
+        ).content.decode()
+        content = b"".join(client.get(
+            "/sitemap-archived_posts-0.xml"
+        ).streaming_content).decode()
+    assert f"/posts/{old_post.pk}/" in content
+    assert f"/posts/{post_with_published_location.pk}/" not in content
+
+
+@pytest.mark.django_db
+def test_archive_schema_picks_up_new_fields():
+    with connection.cursor() as cursor:
+        cursor.execute('ALTER TABLE "archive"."blog_post" DROP COLUMN "text"')
+        create_archive_schema(connection)
+        cursor.execute('PRAGMA "archive".table_info("blog_post")')
+        assert "text" in {row[1] for row in cursor.fetchall()}
@@ -0,0 +1,69 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth.backends import ModelBackend
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+AUTH_TABLES = ('"django_session"', 'FROM "auth_user"')
+
+
+def auth_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    return [
+        q["sql"] for q in ctx.captured_queries
+        if any(table in q["sql"] for table in AUTH_TABLES)
+    ]
+
+
+@pytest.mark.django_db
+def test_feed_has_no_auth_queries_in_steady_state(user_client):
+    user_client.get("/")
+    assert auth_queries(user_client, "/") == []
+
+
+@pytest.mark.django_db
+def test_cached_user_is_reset_on_profile_edit(user, user_client):
+    user_client.get("/")
+    user.first_name = "Новое"
+    user.save()
+    assert auth_queries(user_client, "/")
+    response = user_client.get("/")
+    assert response.wsgi_request.user.first_name == "Новое"
+
+
+@pytest.mark.django_db
+def test_logout_ends_cached_session(user_client):
+    user_client.get("/")
+    user_client.get("/auth/logout/")
+    response = user_client.get("/")
+    assert not response.wsgi_request.user.is_authenticated
+
+
+@pytest.mark.django_db
+def test_session_of_model_backend_survives(user, client):
+    client.force_login(
+        user, backend="django.contrib.auth.backends.ModelBackend"
+    )
+    client.get("/")
+    assert auth_queries(client, "/") == []
+    response = client.get("/")
+    assert response.wsgi_request.user == user
+    assert client.session[BACKEND_SESSION_KEY] == (
+        "blog.backends.CachedModelBackend"
+    )
+
+
+@pytest.mark.django_db
+def test_failed_login_checks_password_once(user, client):
+    # Каждая попытка authenticate() хеширует пароль, даже для
+    # несуществующего пользователя.
+    with mock.patch.object(
+        ModelBackend, "authenticate", autospec=True, return_value=None
+    ) as authenticate:
+        client.post("/auth/login/", {
+            "username": user.username, "password": "wrong"
+        })
+    assert authenticate.call_count == 1
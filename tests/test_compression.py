@@ -0,0 +1,74 @@
+import gzip
+
+from django.core.cache import caches
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from blogicum.middleware import CompressionMiddleware, accepted_encodings
+
+HTML = "<p>Блогикум</p>" * 200
+
+
+def run(response, accept="gzip, deflate"):
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept)
+    return CompressionMiddleware(lambda r: response)(request)
+
+
+def test_html_is_gzipped():
+    response = run(HttpResponse(HTML))
+    assert response["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response["Vary"]
+    assert gzip.decompress(response.content).decode() == HTML
+
+
+def test_gzip_refused_by_client():
+    response = run(HttpResponse(HTML), accept="gzip;q=0, identity")
+    assert not response.has_header("Content-Encoding")
+
+
+def test_small_and_binary_responses_are_skipped():
+    response = run(HttpResponse("<p>short</p>"))
+    assert not response.has_header("Content-Encoding")
+    response = run(HttpResponse(b"\xff" * 4096, content_type="image/jpeg"))
+    assert not response.has_header("Content-Encoding")
+
+
+@override_settings(COMPRESSION_STREAM_FLUSH_SIZE=16 * 1024)
+def test_streaming_is_flushed_in_blocks():
+    rows = [f'{{"id": {number}, "title": "Пост"}}\n'.encode()
+            for number in range(2000)]
+    response = run(StreamingHttpResponse(iter(rows)))
+    assert response["Content-Encoding"] == "gzip"
+    parts = list(response.streaming_content)
+    assert 2 < len(parts) < 10
+    assert gzip.decompress(b"".join(parts)) == b"".join(rows)
+
+
+@override_settings(CACHES={"default": {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "compression-tests",
+}})
+def test_only_shareable_bodies_are_cached():
+    def cached_bodies():
+        return len(caches["default"]._cache)
+
+    caches["default"].clear()
+    personal = HttpResponse(HTML)
+    personal["Vary"] = "Cookie"
+    run(personal)
+    with_cookie = HttpResponse(HTML)
+    with_cookie.set_cookie("csrftoken", "secret")
+    run(with_cookie)
+    private = HttpResponse(HTML)
+    private["Cache-Control"] = "max-age=0, private"
+    run(private)
+    assert cached_bodies() == 0
+    response = run(personal)
+    assert gzip.decompress(response.content).decode() == HTML
+
+    run(HttpResponse(HTML))
+    assert cached_bodies() == 1
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("br;q=1.0, gzip;q=0") == {"br"}
@@ -0,0 +1,103 @@
+import time
+from unittest import mock
+
+import pytest
+from django.db import DatabaseError, connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.counters import ViewCounter, view_counter
+from blog.models import Post
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    return mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+
+
+@pytest.mark.django_db
+def test_views_are_flushed_in_one_update(posts):
+    counter = ViewCounter()
+    with override_settings(VIEW_COUNTER_MAX_PENDING=100):
+        for post, views in zip(posts, (1, 2, 4)):
+            for _ in range(views):
+                counter.add(post.pk)
+    assert counter.pending() == 7
+    assert Post.objects.filter(views__gt=0).count() == 0
+
+    with CaptureQueriesContext(connection) as queries:
+        assert counter.flush() == 7
+    updates = [
+        query["sql"] for query in queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 1 and "CASE" in updates[0]
+    assert [
+        Post.objects.get(pk=post.pk).views for post in posts
+    ] == [1, 2, 4]
+    assert counter.pending() == 0
+
+
+@pytest.mark.django_db
+def test_failed_flush_keeps_views(posts):
+    counter = ViewCounter()
+    with override_settings(VIEW_COUNTER_MAX_PENDING=100):
+        counter.add(posts[0].pk)
+    with mock.patch("blog.counters.write_views", side_effect=DatabaseError):
+        assert counter.flush() == 0
+    assert counter.pending() == 1
+    counter.flush()
+    assert Post.objects.get(pk=posts[0].pk).views == 1
+
+
+@pytest.mark.django_db
+def test_detail_view_counts(client, posts):
+    post = posts[0]
+    view_counter.flush()
+    with override_settings(VIEW_COUNTER_MAX_PENDING=2):
+        client.get(f"/posts/{post.pk}/")
+        assert Post.objects.get(pk=post.pk).views == 0
+        client.get(f"/posts/{post.pk}/")
+    post.refresh_from_db()
+    assert post.views == 2
+    # Сохранение устаревшего объекта не затирает счётчик.
+    stale = Post.objects.get(pk=post.pk)
+    Post.objects.filter(pk=post.pk).update(views=10)
+    stale.title = "Новый заголовок"
+    stale.save()
+    post.refresh_from_db()
+    assert (post.title, post.views) == ("Новый заголовок", 10)
+
+
+@pytest.mark.django_db
+def test_failed_flush_keeps_at_most_max_pending(posts, caplog):
+    counter = ViewCounter()
+    with override_settings(VIEW_COUNTER_MAX_PENDING=100):
+        for post in posts:
+            counter.add(post.pk)
+            counter.add(post.pk)
+    with override_settings(VIEW_COUNTER_MAX_PENDING=4), mock.patch(
+        "blog.counters.write_views", side_effect=DatabaseError
+    ):
+        assert counter.flush() == 0
+    assert counter.pending() == 4
+    assert "потеряно просмотров: 2" in caplog.text
+
+
+def test_idle_counter_is_flushed_by_timer():
+    counter = ViewCounter()
+    with override_settings(
+        VIEW_COUNTER_MAX_PENDING=100, VIEW_COUNTER_FLUSH_INTERVAL=0.05
+    ), mock.patch("blog.counters.write_views") as write_views, mock.patch(
+        "blog.counters.bump_scores"
+    ):
+        counter.add(1)
+        for _ in range(100):
+            if write_views.called:
+                break
+            time.sleep(0.05)
+    write_views.assert_called_once_with({1: 1})
+    assert counter.pending() == 0
@@ -0,0 +1,39 @@
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from blogicum.dbsnapshot import (
+    can_use_snapshot,
+    restore_snapshot,
+    snapshot_path,
+)
+
+
+@pytest.fixture
+def empty_database():
+    database = DatabaseWrapper(
+        {
+            **connection.settings_dict,
+            "NAME": "file:snapshot_test?mode=memory&cache=shared",
+        },
+        alias="snapshot_test",
+    )
+    yield database
+    database.close()
+
+
+@pytest.mark.django_db
+def test_test_database_is_restored_from_snapshot(empty_database):
+    # Снимок создала (или уже использовала) тестовая база этой сессии.
+    path = snapshot_path()
+    assert path.exists()
+    assert can_use_snapshot(empty_database)
+
+    restore_snapshot(empty_database, path)
+    assert not can_use_snapshot(empty_database)
+    assert "blog_post" in empty_database.introspection.table_names()
+    with empty_database.cursor() as cursor:
+        cursor.execute("SELECT app, name FROM django_migrations")
+        applied = set(cursor.fetchall())
+    assert ("blog", "0001_initial_squashed") in applied
+    assert ("blog", "0030_related_posts") in applied
@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from blog.deletion import schedule_user_deletion
+from blog.models import Comment, DeletionTask, Post, User
+
+
+@pytest.mark.django_db
+def test_post_is_hidden_then_deleted_in_batches(
+        user, user_client, post_with_published_location, mixer):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post, author=user)
+    response = user_client.post(f"/posts/{post.pk}/delete/")
+    assert response.status_code == HTTPStatus.FOUND
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert Post.all_objects.filter(pk=post.pk).exists()
+    assert user_client.get(f"/posts/{post.pk}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    task = DeletionTask.objects.get()
+    assert (task.kind, task.total, task.deleted) == (DeletionTask.POST, 6, 0)
+
+    call_command("process_deletions", batch_size=2, pause=0)
+    task.refresh_from_db()
+    assert task.finished_at is not None
+    assert task.deleted == task.total
+    assert not Post.all_objects.filter(pk=post.pk).exists()
+    assert not Comment.objects.filter(post_id=post.pk).exists()
+
+
+@pytest.mark.django_db
+def test_user_deletion(user, another_user, mixer, published_category):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    mixer.cycle(2).blend("blog.Comment", post=posts[0], author=another_user)
+    other_post = mixer.blend("blog.Post", author=another_user)
+    mixer.blend("blog.Comment", post=other_post, author=user)
+
+    schedule_user_deletion(user)
+    user.refresh_from_db()
+    assert not user.is_active
+    assert not Post.objects.filter(author=user).exists()
+
+    call_command("process_deletions", batch_size=1, pause=0)
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert not Post.all_objects.filter(author_id=user.pk).exists()
+    assert Comment.objects.filter(author=another_user).count() == 0
+    assert list(Post.objects.all()) == [other_post]
+    assert DeletionTask.objects.get().finished_at is not None
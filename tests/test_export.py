@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+def read(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.fixture
+def staff_client(client, mixer):
+    client.force_login(mixer.blend("auth.User", is_staff=True))
+    return client
+
+
+@pytest.mark.django_db
+def test_export_endpoint_is_staff_only(user_client):
+    response = user_client.get("/export/posts/")
+    assert response.status_code == HTTPStatus.FOUND
+
+
+@pytest.mark.django_db
+def test_export_posts_jsonl(staff_client, post_with_published_location):
+    post = post_with_published_location
+    response = staff_client.get("/export/posts/")
+    rows = [json.loads(line) for line in read(response).splitlines()]
+    assert [row["id"] for row in rows] == [post.id]
+    assert rows[0]["author"] == post.author.username
+    assert rows[0]["category"] == post.category.slug
+
+    response = staff_client.get("/export/posts/?category=missing")
+    assert read(response) == ""
+    response = staff_client.get("/export/posts/?since=bad")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_export_comments_csv_command(
+        tmp_path, mixer, user, post_with_published_location):
+    mixer.cycle(3).blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    output = tmp_path / "comments.csv"
+    call_command(
+        "export_blog", "comments", format="csv", output=str(output),
+        chunk_size=2,
+    )
+    rows = list(csv.DictReader(io.StringIO(output.read_text())))
+    assert len(rows) == 3
+    assert rows[0]["author"] == user.username
+
+
+@pytest.mark.django_db
+def test_export_command_writes_to_stdout(post_with_published_location):
+    stdout = io.StringIO()
+    call_command("export_blog", "posts", stdout=stdout)
+    rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [row["id"] for row in rows] == [post_with_published_location.id]
@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_feeds_list_published_posts(
+        client, mixer, post_with_published_location):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", is_published=False, category=post.category,
+        author=post.author,
+    )
+    urls = (
+        "/feed/rss/",
+        "/feed/atom/",
+        f"/category/{post.category.slug}/rss/",
+        f"/category/{post.category.slug}/atom/",
+        f"/profile/{post.author.username}/rss/",
+        f"/profile/{post.author.username}/atom/",
+    )
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, url
+        content = response.content.decode()
+        assert post.title in content, url
+        assert hidden.title not in content, url
+
+
+@pytest.mark.django_db
+def test_feed_conditional_get(client, post_with_published_location):
+    etag = client.get("/feed/rss/")["ETag"]
+    response = client.get("/feed/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_feed_cache_reset_on_new_post(
+        client, mixer, user, published_category):
+    client.get("/feed/rss/")
+    post = mixer.blend(
+        "blog.Post", is_published=True, category=published_category,
+        author=user,
+    )
+    assert post.title in client.get("/feed/rss/").content.decode()
+
+
+@pytest.mark.django_db
+def test_unknown_category_feed_is_404(client):
+    response = client.get("/category/unknown/rss/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
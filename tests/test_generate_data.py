@@ -0,0 +1,42 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+
+from blog.models import Category, Comment, Location, Post, User
+
+OPTIONS = dict(
+    users=20, categories=5, locations=10, posts=300, comments=1500,
+    seed=42, batch_size=100, stdout=io.StringIO(),
+)
+
+
+def snapshot():
+    return (
+        list(Post.objects.order_by("id").values_list(
+            "title", "author__username", "is_published", "category__slug"
+        )),
+        list(Comment.objects.order_by("id").values_list("post_id", "text")),
+    )
+
+
+@pytest.mark.django_db
+def test_generated_data_is_shaped_and_reproducible():
+    call_command("generate_blog_data", **OPTIONS)
+    assert Post.objects.count() == 300
+    assert Comment.objects.count() == 1500
+    assert Post.objects.filter(is_published=False).exists()
+    counts = sorted(
+        Post.objects.annotate(n=Count("comments")).values_list("n", flat=True)
+    )
+    assert counts[-1] > 10 * counts[len(counts) // 2]
+    first = snapshot()
+
+    User.objects.all().delete()
+    Category.objects.all().delete()
+    Location.objects.all().delete()
+    call_command("generate_blog_data", **OPTIONS)
+    second = snapshot()
+    assert [row[0] for row in first[0]] == [row[0] for row in second[0]]
+    assert [row[1] for row in first[1]] == [row[1] for row in second[1]]
@@ -0,0 +1,26 @@
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    check_password,
+    make_password,
+)
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blogicum.hashers import PasswordHashingBusy
+from blogicum.middleware import PasswordHashingBusyMiddleware
+
+
+def test_pooled_hasher_is_compatible_with_django():
+    encoded = make_password("пароль-123", salt="somesalt")
+    assert encoded.startswith("pbkdf2_sha256$")
+    assert encoded == PBKDF2PasswordHasher().encode("пароль-123", "somesalt")
+    assert check_password("пароль-123", encoded)
+    assert not check_password("другой", encoded)
+
+
+def test_busy_hashing_returns_503():
+    middleware = PasswordHashingBusyMiddleware(lambda r: HttpResponse())
+    request = RequestFactory().post("/login/")
+    response = middleware.process_exception(request, PasswordHashingBusy())
+    assert response.status_code == 503
+    assert response.has_header("Retry-After")
@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.template.loader import get_template
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, location=None,
+    )
+    mixer.blend("blog.Comment", post=post, author=user)
+    return post
+
+
+@pytest.mark.django_db
+def test_shared_page_is_filled_per_user(
+        post, user, user_client, another_user, another_user_client, client):
+    url = f"/posts/{post.pk}/"
+    html = client.get(url).content.decode()
+    assert "<!--hole:" not in html
+    assert "Войти" in html and "Оставить комментарий" not in html
+
+    with CaptureQueriesContext(connection) as queries:
+        html = user_client.get(url).content.decode()
+    assert not any("blog_post" in query["sql"] for query in queries)
+    assert user.username in html
+    assert "Отредактировать публикацию" in html
+    assert "Отредактировать комментарий" in html
+    assert 'name="csrfmiddlewaretoken"' in html
+
+    html = another_user_client.get(url).content.decode()
+    assert another_user.username in html
+    assert "Оставить комментарий" in html
+    assert "Отредактировать публикацию" not in html
+    assert "Отредактировать комментарий" not in html
+
+
+@pytest.mark.django_db
+def test_unpublished_post_is_not_shared(post, user_client, client):
+    post.is_published = False
+    post.save()
+    url = f"/posts/{post.pk}/"
+    assert "Отредактировать публикацию" in user_client.get(
+        url
+    ).content.decode()
+    assert client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_shared_page_is_reset_on_change(post, client):
+    assert post.title in client.get("/").content.decode()
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in client.get("/").content.decode()
+
+
+@pytest.mark.django_db
+def test_holes_are_filled_with_page_engine(post, client, user_client):
+    pytest.importorskip("jinja2")
+    with override_settings(JINJA2_VIEWS=("blog:index",)):
+        client.get("/")
+        with mock.patch(
+            "blog.holes.get_template", wraps=get_template
+        ) as loader:
+            html = user_client.get("/").content.decode()
+    assert "<!--hole:" not in html
+    assert {call.kwargs["using"] for call in loader.call_args_list} == {
+        "jinja2"
+    }
+
+
+@pytest.mark.django_db
+def test_unknown_query_params_share_cache_entry(post, client):
+    client.get("/?page=1")
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/?utm_source=feed")
+        client.get("/?page=abc")
+    assert not any("blog_post" in query["sql"] for query in queries)
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.export import iter_export
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_import_roundtrip(
+        tmp_path, mixer, user, many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    mixer.cycle(5).blend("blog.Comment", post=posts[0], author=user)
+    source = tmp_path / "blog.jsonl"
+    with open(source, "w", encoding="utf-8") as file:
+        file.writelines(iter_export("posts", "jsonl"))
+        file.writelines(iter_export("comments", "jsonl"))
+    exported = [json.loads(line) for line in source.read_text().splitlines()]
+    Post.objects.all().delete()
+
+    queue = tmp_path / "images.jsonl"
+    with override_settings(IMAGE_TASK_QUEUE=queue):
+        call_command(
+            "import_blog", str(source), batch_size=3, transaction_size=4
+        )
+
+    assert Post.objects.count() == len(posts)
+    assert Comment.objects.count() == 5
+    imported = Post.objects.get(title=exported[0]["title"])
+    assert imported.author.username == exported[0]["author"]
+    assert imported.category.slug == exported[0]["category"]
+    assert imported.created_at.isoformat()[:19] == (
+        exported[0]["created_at"][:19]
+    )
+    with_comments = Post.objects.get(title=posts[0].title)
+    assert with_comments.comments.count() == 5
+    assert not queue.exists() or all(
+        json.loads(line)["post_id"] for line in queue.read_text().splitlines()
+    )
+
+
+@pytest.mark.django_db
+def test_import_does_not_reuse_ids(tmp_path, mixer, user):
+    deleted_id = mixer.blend("blog.Post", author=user).id
+    Post.all_objects.filter(pk=deleted_id).delete()
+    source = tmp_path / "blog.jsonl"
+    source.write_text(json.dumps({
+        "title": "Импорт", "author": user.username,
+        "created_at": "2020-01-01T00:00:00+00:00",
+    }) + "\n")
+    call_command("import_blog", str(source))
+    imported = Post.objects.get()
+    assert imported.id > deleted_id
+    assert imported.created_at.year == 2020
+    assert Post._meta.get_field("created_at").auto_now_add
+
+
+@pytest.mark.django_db
+def test_import_writes_created_at_in_insert(tmp_path, user):
+    source = tmp_path / "blog.jsonl"
+    source.write_text("\n".join(json.dumps(record) for record in (
+        {"id": 1, "title": "Импорт", "author": user.username,
+         "created_at": "2020-01-01T00:00:00+00:00"},
+        {"post_id": 1, "text": "Комментарий", "author": user.username,
+         "created_at": "2020-01-02T00:00:00+00:00"},
+    )) + "\n")
+    with CaptureQueriesContext(connection) as queries:
+        call_command("import_blog", str(source))
+    assert Comment.objects.get().created_at.day == 2
+    assert not [
+        query for query in queries.captured_queries
+        if query["sql"].startswith(("UPDATE \"blog_post\"",
+                                    "UPDATE \"blog_comment\""))
+    ]
@@ -0,0 +1,42 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.test import override_settings
+
+pytest.importorskip("jinja2")
+
+JINJA2_VIEWS = (
+    "blog:index",
+    "blog:category_posts",
+    "blog:profile",
+    "blog:post_detail",
+)
+
+
+@pytest.mark.django_db
+def test_jinja2_pages_match_django(
+        mixer, user, user_client, post_with_published_location):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, author=user)
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    )
+    for url in urls:
+        django_html = user_client.get(url).content.decode()
+        with override_settings(JINJA2_VIEWS=JINJA2_VIEWS):
+            response = user_client.get(url)
+        assert response.status_code == 200, url
+        jinja2_html = response.content.decode()
+        assert text_of(jinja2_html) == text_of(django_html), url
+        assert links_of(jinja2_html) == links_of(django_html), url
+
+
+def text_of(html):
+    return BeautifulSoup(html, "html.parser").get_text(" ", strip=True).split()
+
+
+def links_of(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [a.get("href") for a in soup.find_all("a")]
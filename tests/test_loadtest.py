@@ -0,0 +1,23 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+def test_loadtest_reports_percentiles_per_url():
+    call_command(
+        "generate_blog_data", users=5, categories=3, locations=3, posts=30,
+        comments=30, stdout=io.StringIO(),
+    )
+    output = io.StringIO()
+    call_command(
+        "loadtest", threads=1, duration=1, mix="index=3,detail=1",
+        stdout=output,
+    )
+    report = output.getvalue()
+    assert "RPS" in report
+    for line in report.splitlines()[2:]:
+        name, *_, errors = line.split()
+        assert name in ("blog:index", "blog:post_detail")
+        assert errors == "0.0%"
@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media_file(tmp_path):
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "pic.jpg").write_bytes(CONTENT)
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield "/media/images/pic.jpg"
+
+
+def read(response):
+    return b"".join(response.streaming_content)
+
+
+def test_media_full_file(client, media_file):
+    response = client.get(media_file)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что файлы из MEDIA_ROOT отдаются при `DEBUG = False`."
+    )
+    assert read(response) == CONTENT
+    assert response["Content-Type"] == "image/jpeg"
+    assert response["Accept-Ranges"] == "bytes"
+
+
+def test_media_range(client, media_file):
+    response = client.get(media_file, HTTP_RANGE="bytes=10-19")
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert read(response) == CONTENT[10:20]
+    assert response["Content-Range"] == f"bytes 10-19/{len(CONTENT)}"
+    assert response["Content-Length"] == "10"
+
+    response = client.get(media_file, HTTP_RANGE="bytes=-5")
+    assert read(response) == CONTENT[-5:]
+
+    response = client.get(media_file, HTTP_RANGE="bytes=5000-")
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+
+
+def test_media_conditional(client, media_file):
+    etag = client.get(media_file)["ETag"]
+    response = client.get(media_file, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = client.get(
+        media_file, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_media_accel_redirect(client, media_file):
+    with override_settings(MEDIA_SENDFILE_BACKEND="nginx"):
+        response = client.get(media_file)
+    assert response["X-Accel-Redirect"] == "/protected-media/images/pic.jpg"
+    assert response.content == b""
+
+
+def test_media_outside_root(client, media_file):
+    response = client.get("/media/../settings.py")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    response = client.get("/media/images/missing.jpg")
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Category
+
+
+@pytest.fixture
+def locations(mixer):
+    return mixer.cycle(3).blend(
+        "blog.Location",
+        name=(name for name in ("Москва", "Мурманск", "Казань")),
+        is_published=(flag for flag in (True, False, True)),
+    )
+
+
+def table_queries(queries, table):
+    return [query for query in queries if f'"{table}"' in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_create_form_reads_no_choice_tables(
+        user_client, published_category, mixer, locations):
+    hidden = mixer.blend("blog.Category", is_published=False)
+    user_client.get("/posts/create/")
+    with CaptureQueriesContext(connection) as queries:
+        html = user_client.get("/posts/create/").content.decode()
+    assert not table_queries(queries, "blog_category")
+    assert not table_queries(queries, "blog_location")
+    assert published_category.title in html
+    assert hidden.title not in html
+    assert "Москва" not in html
+
+    published_category.title = "Новое название"
+    published_category.save()
+    assert "Новое название" in user_client.get(
+        "/posts/create/"
+    ).content.decode()
+
+
+@pytest.mark.django_db
+def test_edit_form_renders_only_selected_location(
+        user, user_client, published_category, mixer, locations):
+    moscow, _, kazan = locations
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=kazan,
+    )
+    html = user_client.get(f"/posts/{post.pk}/edit/").content.decode()
+    assert "Казань" in html and "Москва" not in html
+    assert "/locations/autocomplete/" in html
+
+
+@pytest.mark.django_db
+def test_location_autocomplete(user_client, client, locations):
+    response = user_client.get("/locations/autocomplete/", {"q": "М"})
+    assert [item["text"] for item in response.json()["results"]] == [
+        "Москва"
+    ]
+    assert client.get("/locations/autocomplete/").status_code == 302
+
+
+@pytest.mark.django_db
+@override_settings(POST_FORM_CHOICES_CACHE_TIMEOUT=0)
+def test_category_choices_expire(user_client, published_category):
+    user_client.get("/posts/create/")
+    # Изменение, о котором этот процесс не узнал (сигнал в другом воркере).
+    Category.objects.filter(pk=published_category.pk).update(
+        title="Из другого процесса"
+    )
+    assert "Из другого процесса" in user_client.get(
+        "/posts/create/"
+    ).content.decode()
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+from django.test import override_settings
+
+from blogicum import profiling
+
+
+@pytest.fixture
+def profiling_file(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    profiling.logger.handlers.clear()
+    with override_settings(PROFILING_TOKEN="secret", PROFILING_FILE=path):
+        yield path
+    for handler in profiling.logger.handlers:
+        handler.close()
+    profiling.logger.handlers.clear()
+
+
+@pytest.mark.django_db
+def test_profiled_request_is_logged(
+        client, profiling_file, post_with_published_location):
+    client.get("/", HTTP_X_PROFILE="secret")
+    record = json.loads(profiling_file.read_text().splitlines()[-1])
+    assert record["view"] == "blog:index"
+    assert record["status"] == 200
+    assert record["sql_count"] > 0
+    assert 0 < record["template_time"] <= record["view_time"]
+    assert record["view_time"] <= record["total_time"]
+    assert record["profile"]
+
+
+@pytest.mark.django_db
+def test_unprofiled_request_is_not_logged(client, profiling_file):
+    client.get("/", HTTP_X_PROFILE="wrong")
+    assert not profiling_file.exists()
@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils.timezone import now
+
+from blog.models import RelatedPost, RelatedPostsTask, RelatedTerm
+from blog.related import (
+    RelatedIndex,
+    changed_index,
+    get_related_posts,
+    queue_related,
+)
+
+TEXTS = (
+    ("Поход в горы", "Маршрут через перевал, палатка и горные озёра."),
+    ("Горы зимой", "Перевал в снегу, палатка и горные лыжи."),
+    ("Рецепт пирога", "Тесто, яблоки и корица для осеннего пирога."),
+    ("Пирог с вишней", "Тесто и вишня, немного корицы."),
+    ("Новости города", "Открылся новый парк и библиотека."),
+)
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    return [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, pub_date=now() - timedelta(days=1),
+            title=title, text=text, location=None,
+        )
+        for title, text in TEXTS
+    ]
+
+
+def test_index_similarity():
+    rows = [(pk, title, text, None, None)
+            for pk, (title, text) in enumerate(TEXTS)]
+    index = RelatedIndex.from_rows(rows)
+    assert index.top(0)[0][0] == 1
+    assert index.top(2)[0][0] == 3
+    assert all(score <= 1 + 1e-9 for _, score in index.top(0))
+
+
+@pytest.mark.django_db
+def test_related_posts_are_refreshed_incrementally(client, posts):
+    assert RelatedPostsTask.objects.count() == len(posts)
+    call_command("refresh_related")
+    assert not RelatedPostsTask.objects.exists()
+    mountains, winter, pie, cherry_pie, _ = posts
+    assert list(get_related_posts(mountains))[0] == winter
+
+    response = client.get(f"/posts/{pie.pk}/")
+    assert list(response.context["related_posts"])[0] == cherry_pie
+    assert "Похожие публикации" in response.content.decode()
+
+    cherry_pie.title = "Маршрут"
+    cherry_pie.text = "Маршрут вдоль озёра."
+    cherry_pie.save()
+    assert list(
+        RelatedPostsTask.objects.values_list("post_id", flat=True)
+    ) == [cherry_pie.pk]
+    call_command("refresh_related")
+    assert list(get_related_posts(pie)) == []
+    assert cherry_pie in get_related_posts(mountains)
+
+    cherry_pie.is_published = False
+    cherry_pie.save()
+    call_command("refresh_related")
+    assert not RelatedPost.objects.filter(related=cherry_pie).exists()
+
+
+@pytest.mark.django_db
+def test_refresh_reads_only_posts_with_shared_terms(posts):
+    call_command("refresh_related")
+    mountains, winter, pie, cherry_pie, news = posts
+    assert RelatedTerm.objects.filter(post=news).exists()
+    cherry_pie.text = "Тесто, яблоки и корица."
+    cherry_pie.save()
+    index = changed_index([cherry_pie.pk])
+    assert pie.pk in index.documents
+    assert news.pk not in index.documents
+    call_command("refresh_related")
+    assert list(get_related_posts(pie))[0] == cherry_pie
+
+
+@pytest.mark.django_db
+def test_task_queued_during_refresh_is_kept(posts):
+    call_command("refresh_related")
+    post = posts[0]
+    queue_related([post.pk])
+    RelatedPostsTask.objects.filter(post=post).update(
+        created_at=now() + timedelta(minutes=1)
+    )
+    call_command("refresh_related")
+    assert RelatedPostsTask.objects.filter(post=post).exists()
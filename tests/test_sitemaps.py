@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+
+@pytest.fixture
+def sitemap_root(tmp_path):
+    with override_settings(SITEMAP_ROOT=tmp_path):
+        yield tmp_path
+
+
+def read(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_sitemap_index_and_chunks(
+        client, mixer, sitemap_root, post_with_published_location):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", is_published=False, category=post.category,
+        author=post.author,
+    )
+    index = client.get("/sitemap.xml").content.decode()
+    for chunk in ("posts-0", "categories-0", "profiles-0"):
+        assert f"/sitemap-{chunk}.xml" in index
+
+    content = read(client.get("/sitemap-posts-0.xml"))
+    assert f"http://testserver/posts/{post.id}/" in content
+    assert f"/posts/{hidden.id}/" not in content
+    assert f"/category/{post.category.slug}/" in read(
+        client.get("/sitemap-categories-0.xml")
+    )
+    assert f"/profile/{post.author.username}/" in read(
+        client.get("/sitemap-profiles-0.xml")
+    )
+    assert client.get("/sitemap-posts-1.xml").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+@pytest.mark.django_db
+def test_sitemap_chunk_is_cached_until_changed(
+        client, sitemap_root, post_with_published_location):
+    client.get("/sitemap-posts-0.xml")
+    first = list(sitemap_root.rglob("posts-0-*.xml"))
+    client.get("/sitemap-posts-0.xml")
+    assert list(sitemap_root.rglob("posts-0-*.xml")) == first
+    mtime = first[0].stat().st_mtime_ns
+
+    category = post_with_published_location.category
+    category.slug = "new-slug"
+    category.save()
+    post_with_published_location.save()
+    content = read(client.get("/sitemap-categories-0.xml"))
+    assert "/category/new-slug/" in content
+    client.get("/sitemap-posts-0.xml")
+    rebuilt = list(sitemap_root.rglob("posts-0-*.xml"))
+    assert len(rebuilt) == 1
+    assert rebuilt[0].stat().st_mtime_ns != mtime
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from blog.models import AuthorStats
+from blog.stats import get_author_stats
+
+
+@pytest.mark.django_db
+def test_stats_follow_posts_and_comments(
+        user, another_user, mixer, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now() - timedelta(days=1),
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False,
+    )
+    stats = get_author_stats(user)
+    assert (stats.post_count, stats.published_post_count) == (2, 1)
+    assert stats.last_post_date == post.pub_date
+
+    mixer.cycle(3).blend("blog.Comment", post=post, author=another_user)
+    assert AuthorStats.objects.get(user=user).comment_count == 3
+    post.comments.first().delete()
+    assert AuthorStats.objects.get(user=user).comment_count == 2
+
+    post.is_published = False
+    post.save()
+    assert not AuthorStats.objects.filter(user=user).exists()
+    assert get_author_stats(user).published_post_count == 0
+
+
+@pytest.mark.django_db
+def test_deferred_post_refreshes_stats(user, mixer, published_category):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now() + timedelta(days=1),
+    )
+    stats = get_author_stats(user)
+    assert stats.published_post_count == 0
+    AuthorStats.objects.filter(user=user).update(
+        next_pub_date=now() - timedelta(seconds=1)
+    )
+    AuthorStats.objects.filter(user=user).update(published_post_count=5)
+    assert get_author_stats(user).published_post_count == 0
+
+
+@pytest.mark.django_db
+def test_profile_uses_stats(
+        client, user, mixer, published_category):
+    mixer.cycle(12).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now() - timedelta(days=1),
+    )
+    client.get(f"/profile/{user.username}/")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/profile/{user.username}/?page=2")
+    assert not any("COUNT(*)" in query["sql"] for query in queries)
+    assert sum(
+        '"auth_user"."username" =' in query["sql"] for query in queries
+    ) == 1
+    assert response.context["page_obj"].paginator.count == 12
+    assert len(response.context["page_obj"]) == 2
+    assert "Публикаций: 12" in response.content.decode()
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+
+from blog.thumbnails import thumbnail_name
+
+
+@pytest.fixture
+def media(tmp_path):
+    (tmp_path / "images").mkdir()
+    Image.new("RGB", (1200, 600), "red").save(tmp_path / "images" / "a.jpg")
+    queue = tmp_path / "queue" / "images.jsonl"
+    queue.parent.mkdir()
+    queue.write_text(
+        json.dumps({"post_id": 1, "image": "images/a.jpg"}) + "\n"
+        + json.dumps({"post_id": 2, "image": "images/missing.jpg"}) + "\n"
+    )
+    with override_settings(MEDIA_ROOT=tmp_path, IMAGE_TASK_QUEUE=queue):
+        yield tmp_path, queue
+
+
+def test_process_images_makes_thumbnails(media, capsys):
+    media_root, queue = media
+    call_command("process_images")
+    assert "Миниатюр создано: 1, с ошибкой: 1." in capsys.readouterr().out
+    with Image.open(media_root / thumbnail_name("images/a.jpg")) as picture:
+        assert picture.size == (400, 200)
+        assert picture.format == "JPEG"
+    assert not queue.exists()
+    assert not list(queue.parent.iterdir())
+
+    call_command("process_images")
+    assert "Миниатюр создано: 0" in capsys.readouterr().out
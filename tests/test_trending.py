@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from blog.constants import TRENDING_VIEW_WEIGHT
+from blog.models import Post, PostScore
+from blog.trending import (
+    TAU,
+    bump_scores,
+    get_popular_posts,
+    log_add,
+    log_sub,
+    point,
+    rebuild_scores,
+)
+
+
+def test_log_arithmetic():
+    a, b = point(2, now()), point(3, now())
+    assert log_sub(log_add(a, b), b) == pytest.approx(a)
+    assert log_sub(a, a) is None
+    # Через период полураспада вклад весит вдвое меньше.
+    half_life = timedelta(seconds=TAU * 0.6931471805599453)
+    moment = now()
+    assert point(1, moment + half_life) == pytest.approx(
+        point(2, moment), abs=1e-6
+    )
+
+
+@pytest.mark.django_db
+def test_comments_raise_post_in_popular(
+        client, user, mixer, published_category):
+    old, new = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+        pub_date=(date for date in (
+            now() - timedelta(days=2), now() - timedelta(hours=1)
+        )),
+    )
+    assert [post.pk for post in get_popular_posts()] == [new.pk, old.pk]
+
+    comments = mixer.cycle(3).blend("blog.Comment", post=old, author=user)
+    assert [post.pk for post in get_popular_posts()] == [old.pk, new.pk]
+    value = PostScore.objects.get(post=old).value
+    rebuild_scores()
+    assert PostScore.objects.get(post=old).value == pytest.approx(value)
+
+    for comment in comments:
+        comment.delete()
+    assert [post.pk for post in get_popular_posts()] == [new.pk, old.pk]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/popular/")
+    assert len(queries) <= 3
+    assert [post.pk for post in response.context["post_list"]] == [
+        new.pk, old.pk
+    ]
+    assert response.context["post_list"][0].comment_count == 0
+
+
+@pytest.mark.django_db
+def test_unpublished_posts_are_not_popular(
+        user, mixer, published_category):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False,
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now() + timedelta(days=1),
+    )
+    assert get_popular_posts() == []
+
+
+@pytest.mark.django_db
+def test_views_survive_post_edits_and_rebuild(
+        user, mixer, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now() - timedelta(days=1),
+    )
+    without_views = PostScore.objects.get(post=post).value
+    Post.objects.filter(pk=post.pk).update(views=50)
+    bump_scores({post.pk: 50 * TRENDING_VIEW_WEIGHT})
+    with_views = PostScore.objects.get(post=post).value
+
+    post.title = "Новый заголовок"
+    post.save()
+    assert PostScore.objects.get(post=post).value == pytest.approx(with_views)
+
+    post.pub_date -= timedelta(hours=1)
+    post.save()
+    moved = PostScore.objects.get(post=post).value
+    assert without_views < moved < with_views
+
+    rebuild_scores([post.pk])
+    assert PostScore.objects.get(post=post).value > without_views
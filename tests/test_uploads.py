@@ -0,0 +1,86 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import Post
+from blog.uploads import ImageUploadHandler
+
+
+def jpeg_bytes():
+    data = BytesIO()
+    Image.new("RGB", (50, 50)).save(data, "JPEG")
+    return data.getvalue()
+
+
+def test_image_is_sniffed_while_streaming(rf):
+    data = jpeg_bytes()
+    request = rf.post("/posts/create/", {
+        "title": "Заголовок",
+        "image": SimpleUploadedFile(
+            "photo.png", data, content_type="application/octet-stream"
+        ),
+    })
+    request.upload_handlers.insert(0, ImageUploadHandler(request))
+    image = request.FILES["image"]
+    assert request.upload_errors == []
+    assert image.content_type == "image/jpeg"
+    assert image.read() == data
+    assert request.POST["title"] == "Заголовок"
+
+
+@pytest.fixture
+def post_data(published_category):
+    return {
+        "title": "Заголовок",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+        "category": published_category.pk,
+    }
+
+
+@pytest.mark.django_db
+def test_non_image_is_rejected(user_client, post_data):
+    response = user_client.post("/posts/create/", {
+        **post_data,
+        "image": SimpleUploadedFile("photo.jpg", b"<?php echo 1; ?>" * 10),
+    })
+    assert response.status_code == 200
+    assert "Загрузите изображение" in response.content.decode()
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_large_image_is_cut_off(user_client, post_data):
+    data = jpeg_bytes() + b"\0" * 200_000
+    with override_settings(IMAGE_UPLOAD_MAX_SIZE=100_000):
+        response = user_client.post("/posts/create/", {
+            **post_data,
+            "image": SimpleUploadedFile("photo.jpg", data),
+        })
+    assert response.status_code == 200
+    assert "Файл слишком большой" in response.content.decode()
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_csrf_is_still_checked(user, post_data):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = client.post("/posts/create/", post_data)
+    assert response.status_code == 403
+    assert not Post.objects.exists()
+
+
+def test_handler_is_off_outside_blog_forms(rf):
+    request = rf.post("/admin/blog/post/add/", {
+        "image": SimpleUploadedFile("photo.jpg", b"<?php echo 1; ?>"),
+    })
+    assert not any(
+        isinstance(handler, ImageUploadHandler)
+        for handler in request.upload_handlers
+    )
+    assert request.FILES["image"].read() == b"<?php echo 1; ?>"
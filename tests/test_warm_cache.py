@@ -0,0 +1,39 @@
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
+
+from blog.counters import view_counter
+from blog.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+def test_warm_cache_fills_shared_pages(client):
+    view_counter.flush()
+    call_command(
+        "generate_blog_data", users=5, categories=3, locations=3, posts=30,
+        comments=30, stdout=io.StringIO(),
+    )
+    output = io.StringIO()
+    call_command(
+        "warm_cache", threads=2, posts=5, allow_local_cache=True,
+        stdout=output,
+    )
+    report = output.getvalue().splitlines()
+    assert report[0].startswith("Прогрето")
+    names = [line.split()[0] for line in report[2:]]
+    assert names == ["blog:category_posts", "blog:index", "blog:post_detail"]
+    assert all(line.split()[-1] == "0" for line in report[2:])
+
+    # Страница уже в кеше: рендерится только шапка, без ленты.
+    response = client.get("/")
+    assert response.status_code == 200
+    assert "page_obj" not in response.context
+    view_counter.flush()
+    assert not Post.objects.aggregate(views=Sum("views"))["views"]
+
+
+def test_warm_cache_refuses_process_local_cache():
+    with pytest.raises(CommandError, match="LocMemCache"):
+        call_command("warm_cache")
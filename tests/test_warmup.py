@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+from blogicum import warmup
+from blogicum.warmup import (
+    TEMPLATE_EXTENSIONS,
+    compile_templates,
+    measure_cold_start,
+    populate_resolvers,
+)
+
+
+def test_all_project_templates_compile():
+    expected = sum(
+        1
+        for engine in settings.TEMPLATES
+        for directory in engine["DIRS"]
+        for path in Path(directory).rglob("*")
+        if path.is_file() and path.suffix in TEMPLATE_EXTENSIONS
+    )
+    assert compile_templates() == expected
+    populate_resolvers()
+    assert reverse("blog:index") == "/"
+
+
+def test_worker_cold_start_fits_budget():
+    report = measure_cold_start()
+    assert set(report["steps"]) == {"imports", "templates", "urls"}
+    modules = {name for name, _, _ in report["modules"]}
+    assert {"PIL.Image", "django_bootstrap5.renderers"} <= modules
+    # Запас на медленные машины CI можно поднять переменной окружения.
+    budget = settings.COLD_START_BUDGET * float(
+        os.environ.get("COLD_START_BUDGET_MARGIN", "1.5")
+    )
+    assert report["total"] + report["first_use"] <= budget
+
+
+def test_broken_template_does_not_stop_warmup(tmp_path, caplog):
+    (tmp_path / "broken.html").write_text("{% if %}")
+    (tmp_path / "binary.html").write_bytes(b"\xff\xfe")
+    (tmp_path / "ok.html").write_text("ok")
+    (tmp_path / "notes.md").write_text("{% if %}")
+    templates = [{**settings.TEMPLATES[0], "DIRS": [tmp_path]}]
+    with override_settings(TEMPLATES=templates):
+        assert compile_templates() == 1
+    assert "broken.html" in caplog.text and "binary.html" in caplog.text
+
+
+def test_plain_wsgi_import_does_not_warm_up():
+    import blogicum.wsgi  # noqa: F401
+    assert warmup.timings == {}